@@ -0,0 +1,110 @@
+"""
+Sends the cursor position of this computer to zoom_and_follow_mouse.py
+running in OBS on another computer, for streaming from a second PC.
+
+Run it on the computer whose cursor is shown, with the address of the OBS
+computer, and enable "Receive cursor from network" in the script settings:
+
+    python cursor_sender.py 192.168.1.20
+
+Every sample is a UDP datagram with a sequence number and the time it was
+taken. A sample is sent when the cursor moved, and at least every
+`--keepalive` ms while it stands still, so the script can tell a still
+cursor from a sender that stopped. Only PyMonCtl is required.
+"""
+from time import monotonic, sleep
+import argparse
+import random
+import socket
+import struct
+
+# Must match CURSOR_PACKET in zoom_and_follow_mouse.py
+CURSOR_PACKET_MAGIC = b"ZFC1"
+CURSOR_PACKET = struct.Struct("<4sIIddd")
+CURSOR_PORT = 45654
+
+
+class CursorSender:
+    """
+    :param host: Address of the OBS computer
+    :param port: Port the script listens on
+    :param session: Identifies this sender run, random by default; the
+        receiver restarts its sequence tracking when it changes
+    """
+    def __init__(self, host, port=CURSOR_PORT, session=None):
+        self.address = (host, port)
+        self.session = random.getrandbits(32) if session is None else session
+        self.sequence = 0
+        self.sent = 0
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def pack(self, x, y, timestamp=None):
+        """
+        :return: Datagram of the next sample
+        """
+        self.sequence += 1
+        return CURSOR_PACKET.pack(CURSOR_PACKET_MAGIC, self.session,
+                                  self.sequence,
+                                  monotonic() if timestamp is None else timestamp,
+                                  x, y)
+
+    def send(self, x, y, timestamp=None):
+        self.socket.sendto(self.pack(x, y, timestamp), self.address)
+        self.sent += 1
+
+    def close(self):
+        self.socket.close()
+
+    def run(self, rate=250, keepalive=0.2):
+        """
+        Sends the cursor position until interrupted
+
+        :param rate: Maximum samples per second
+        :param keepalive: Longest time between samples of a still cursor (s)
+        """
+        import pymonctl
+        period = 1 / rate
+        last = None
+        last_sent = 0.0
+        next_time = monotonic()
+        while True:
+            position = pymonctl.getMousePos()
+            now = monotonic()
+            if position != last or now - last_sent >= keepalive:
+                self.send(position[0], position[1], now)
+                last = position
+                last_sent = now
+            next_time += period
+            delay = next_time - monotonic()
+            if delay > 0:
+                sleep(delay)
+            else:
+                next_time = monotonic()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Send the cursor position to zoom_and_follow_mouse.py")
+    parser.add_argument("host", help="address of the computer running OBS")
+    parser.add_argument("--port", type=int, default=CURSOR_PORT)
+    parser.add_argument("--rate", type=int, default=250,
+                        help="maximum samples per second")
+    parser.add_argument("--keepalive", type=int, default=200,
+                        help="longest time between samples of a still "
+                             "cursor (ms)")
+    args = parser.parse_args(argv)
+
+    sender = CursorSender(args.host, args.port)
+    print(f"Sending cursor to {args.host}:{args.port} at up to "
+          f"{args.rate} Hz, Ctrl+C to stop")
+    try:
+        sender.run(args.rate, args.keepalive / 1000)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sender.close()
+        print(f"Sent {sender.sent} samples")
+
+
+if __name__ == "__main__":
+    main()
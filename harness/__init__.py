@@ -0,0 +1,9 @@
+"""
+Headless harness for zoom_and_follow_mouse.py
+
+Loads the script against stand-in obspython, pymonctl and pywinctl modules
+and drives it from a scripted timeline, reporting per-tick wall time, OBS
+API call counts and the resulting crop sequence. Run `python -m harness
+--help` from the repository root.
+"""
+from .simulation import Simulation, format_report
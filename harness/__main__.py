@@ -0,0 +1,193 @@
+"""
+Command line entry point of the headless harness
+"""
+from time import perf_counter
+import argparse
+import json
+
+from .simulation import Simulation, format_report
+from .replay import replay, write_synthetic_trace
+
+
+def size(value):
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+RENDER_MODES = ("filter", "scene_item")
+
+
+def failures(simulation):
+    """
+    :return: Why the run failed: references leaked after unload or errors
+        logged by the script; empty when it passed
+    """
+    failed = []
+    leaked = simulation.leaked_refs()
+    if leaked:
+        failed.append(f"references leaked after unload: {leaked}")
+    script_leaks = simulation.script.refs.leaks()
+    if script_leaks:
+        failed.append(f"script reference counters not zero: {script_leaks}")
+    if simulation.errors:
+        failed.append(f"{len(simulation.errors)} script errors")
+    return failed
+
+
+def compare_render_modes(args, settings, timeline):
+    """
+    Runs the same timeline in every render mode and picks the cheaper one.
+    The stand-in cannot measure rendering, so every frame a crop filter is
+    attached is charged an estimated `--filter-pass-us` on top of the
+    measured script time.
+    """
+    results = {}
+    for mode in RENDER_MODES:
+        simulation = Simulation(fps=args.fps, canvas=args.canvas,
+                                monitors=args.monitors, windows=args.windows,
+                                source=args.source, enum_ms=args.enum_ms,
+                                settings=dict(settings, **{"Render Mode": mode}))
+        simulation.load()
+        simulation.run(timeline or simulation.synthetic_timeline(args.seconds))
+        simulation.unload()
+        report = simulation.report()
+        script_ms = sum(simulation.tick_times) * 1000
+        results[mode] = {
+            "tick_us_mean": report["tick_us"]["mean"],
+            "script_ms": round(script_ms, 3),
+            "obs_calls": report["obs_calls"],
+            "crop_updates": report["crop_updates"],
+            "filter_frames": report["filter_frames"],
+            "estimated_ms": round(script_ms + report["filter_frames"]
+                                  * args.filter_pass_us / 1000, 3),
+            "errors": report["errors"],
+            "failures": failures(simulation),
+        }
+    cheapest = min(results, key=lambda mode: results[mode]["estimated_ms"])
+    return {"modes": results, "cheapest": cheapest}
+
+
+def format_comparison(comparison):
+    columns = ("tick_us_mean", "script_ms", "obs_calls", "crop_updates",
+               "filter_frames", "estimated_ms", "errors")
+    lines = [f"{'mode':12}" + "".join(f"{column:>15}" for column in columns)]
+    for mode, result in comparison["modes"].items():
+        lines.append(f"{mode:12}" + "".join(f"{result[column]:>15}"
+                                             for column in columns))
+    lines.append(f"cheapest      {comparison['cheapest']}")
+    for mode, result in comparison["modes"].items():
+        if result["failures"]:
+            lines.append(f"FAIL {mode}: " + "; ".join(result["failures"]))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m harness",
+        description="Run zoom_and_follow_mouse.py headless")
+    parser.add_argument("timeline", nargs="?",
+                        help="JSON timeline; a synthetic zoom/follow session "
+                             "is used if omitted")
+    parser.add_argument("--fps", type=float, default=60)
+    parser.add_argument("--canvas", type=size, default=(1920, 1080),
+                        help="canvas and monitor size, e.g. 7680x4320")
+    parser.add_argument("--monitors", type=int, default=1)
+    parser.add_argument("--windows", type=int, default=0,
+                        help="number of synthetic open windows")
+    parser.add_argument("--source", choices=("monitor", "window"),
+                        default="monitor")
+    parser.add_argument("--seconds", type=float, default=10,
+                        help="length of the synthetic timeline")
+    parser.add_argument("--set", action="append", default=[],
+                        metavar="NAME=JSON", help="script setting override")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="replay a recorded cursor trace instead of a "
+                             "timeline")
+    parser.add_argument("--make-trace", metavar="FILE",
+                        help="write a synthetic cursor trace of --seconds "
+                             "length and exit")
+    parser.add_argument("--crops", metavar="FILE",
+                        help="write the crop sequence as JSON")
+    parser.add_argument("--compare-render-modes", action="store_true",
+                        help="run the timeline with the crop filter and the "
+                             "scene item render mode and pick the cheaper")
+    parser.add_argument("--filter-pass-us", type=float, default=50,
+                        help="estimated cost of one crop filter render pass "
+                             "for --compare-render-modes")
+    parser.add_argument("--enum-ms", type=float, default=0,
+                        help="simulated cost of every monitor and window "
+                             "enumeration, to make enumerations at script "
+                             "load show in the load time")
+    parser.add_argument("--lag", action="store_true",
+                        help="measure the cursor-to-crop lag")
+    parser.add_argument("--json", action="store_true",
+                        help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    settings = {}
+    for item in args.set:
+        name, value = item.split("=", 1)
+        settings[name] = json.loads(value)
+
+    if args.compare_render_modes:
+        timeline = None
+        if args.timeline:
+            with open(args.timeline) as f:
+                timeline = json.load(f)
+        comparison = compare_render_modes(args, settings, timeline)
+        print(json.dumps(comparison, indent=4) if args.json
+              else format_comparison(comparison))
+        return 1 if any(result["failures"]
+                        for result in comparison["modes"].values()) else 0
+
+    simulation = Simulation(fps=args.fps, canvas=args.canvas,
+                            monitors=args.monitors, windows=args.windows,
+                            source=args.source, settings=settings,
+                            enum_ms=args.enum_ms).load()
+    replay_report = None
+    if args.make_trace:
+        records = write_synthetic_trace(simulation.script, args.make_trace,
+                                        seconds=args.seconds,
+                                        canvas=args.canvas)
+        simulation.unload()
+        print(f"Wrote {records} records to {args.make_trace}")
+        failed = failures(simulation)
+        if failed:
+            print("FAIL: " + "; ".join(failed))
+        return 1 if failed else 0
+    elif args.trace:
+        start = perf_counter()
+        trace = simulation.script.CursorTrace(args.trace)
+        open_ms = (perf_counter() - start) * 1000
+        replay_report = replay(simulation, trace)
+        replay_report["open_ms"] = round(open_ms, 3)
+        trace.close()
+    else:
+        if args.timeline:
+            with open(args.timeline) as f:
+                timeline = json.load(f)
+        else:
+            timeline = simulation.synthetic_timeline(args.seconds)
+        simulation.run(timeline)
+    simulation.unload()
+
+    report = simulation.report()
+    if replay_report is not None:
+        report["replay"] = replay_report
+    if args.lag:
+        report["lag"] = simulation.lag()
+    failed = failures(simulation)
+    report["failures"] = failed
+    print(json.dumps(report, indent=4) if args.json else format_report(report))
+    for frame, error in simulation.errors[:5]:
+        print(f"\nError at frame {frame}:\n{error}")
+    if args.crops:
+        with open(args.crops, "w") as f:
+            json.dump([list(crop) for crop in simulation.crops], f)
+    if failed and not args.json:
+        print("FAIL: " + "; ".join(failed))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,200 @@
+"""
+Loopback test of the network cursor: cursor_sender.py sends samples over
+UDP on 127.0.0.1 to the script loaded in a headless Simulation.
+
+The first part runs on the real clock. It drops, duplicates and reorders
+packets on purpose, sends a malformed one, restarts the sender and then
+stops it, and checks that the receiver counts every case, keeps the newest
+sample and goes stale. The second part runs on the simulated video clock,
+stamps every sample with it and checks that the zoom follows the network
+cursor and not the local one.
+
+    python -m harness.network
+"""
+from time import monotonic, sleep
+import argparse
+import importlib.util
+import json
+import os
+
+from .simulation import SCRIPT, Simulation
+
+SENDER = os.path.join(os.path.dirname(SCRIPT), "cursor_sender.py")
+
+
+def load_sender():
+    spec = importlib.util.spec_from_file_location("cursor_sender", SENDER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def wait_for(condition, timeout=2.0):
+    """
+    :return: Whether `condition()` became true within `timeout` seconds
+    """
+    end = monotonic() + timeout
+    while not condition():
+        if monotonic() > end:
+            return False
+        sleep(0.0005)
+    return True
+
+
+def exercise_receiver(script, sender_module, port, samples=2000, rate=1000,
+                      drop_every=50, duplicate_every=97, reorder_every=131,
+                      read_every=16):
+    """
+    Sends `samples` samples at `rate` per second from two sender sessions,
+    dropping, duplicating and reordering some of them
+
+    :return: Tuple of the receiver stats and a dictionary of checks
+    """
+    receiver = script.network_cursor
+    expected = {"lost": 0, "late": 0, "invalid": 1}
+    last_sent = None
+    sender = sender_module.CursorSender("127.0.0.1", port)
+    held = None
+    period = 1 / rate
+    next_time = monotonic()
+    restart = samples // 2
+    for i in range(1, samples + 1):
+        if i == restart:
+            # Restart the sender: a new session with its own sequence.
+            # Samples the old session still held back are never counted.
+            sender.close()
+            sender = sender_module.CursorSender("127.0.0.1", port)
+            held = None
+        x, y = 100 + i % 1700, 100 + (i * 7) % 900
+        packet = sender.pack(x, y)
+        if i % drop_every == 0 and i not in (restart, samples):
+            # A loss only shows once a later sample of the session arrives,
+            # and a lost first sample cannot be told from a receiver started
+            # late, so the first and last samples always arrive
+            expected["lost"] += 1
+        elif i % reorder_every == 0 and held is None:
+            # Sent after the next packet: counted lost, then late
+            held = packet
+        else:
+            sender.socket.sendto(packet, sender.address)
+            last_sent = (x, y, sender.session, sender.sequence)
+            if held is not None:
+                sender.socket.sendto(held, sender.address)
+                expected["lost"] += 1
+                expected["late"] += 1
+                held = None
+            if i % duplicate_every == 0:
+                sender.socket.sendto(packet, sender.address)
+                expected["late"] += 1
+        if i % read_every == 0:
+            script.get_cursor_position()
+        next_time += period
+        delay = next_time - monotonic()
+        if delay > 0:
+            sleep(delay)
+    sender.socket.sendto(b"not a cursor sample", sender.address)
+    delivered = wait_for(lambda: receiver.invalid == 1
+                         and receiver.session == last_sent[2]
+                         and receiver.last_sequence == last_sent[3])
+    sender.close()
+
+    newest = script.get_cursor_position()
+    # The sender stopped: the position goes stale and is held
+    sleep(receiver.stale_after + 0.1)
+    held_position = script.get_cursor_position()
+    stats = receiver.stats()
+    checks = {
+        "delivered": delivered,
+        "newest sample kept": newest == last_sent[:2],
+        "lost counted": stats["lost"] == expected["lost"],
+        "late dropped": stats["late"] == expected["late"],
+        "invalid dropped": stats["invalid"] == expected["invalid"],
+        "sender restart": stats["senders"] == 2,
+        "stale detected": receiver.stale and stats["stale_periods"] == 1,
+        "stale position held": held_position == last_sent[:2],
+    }
+    return stats, checks
+
+
+def follow_network_cursor(simulation, sender_module, port, seconds=3.0):
+    """
+    Zooms in and moves the network cursor in a small circle far from the
+    local cursor, stamping samples with the simulated clock
+
+    :return: Dictionary of checks
+    """
+    receiver = simulation.script.network_cursor
+    sender = sender_module.CursorSender("127.0.0.1", port)
+    width, height = simulation.canvas
+    target = (width * 3 // 4, height * 3 // 4)
+    simulation.move_cursor(50, 50)
+    simulation.hotkey("zoom")
+    frames = int(seconds * simulation.fps)
+    delivered = True
+    for i in range(frames):
+        x = target[0] + 20 * (i % 3 - 1)
+        y = target[1] + 20 * (i % 2)
+        sender.send(x, y, simulation.clock.now)
+        delivered &= wait_for(lambda: receiver.last_sequence == sender.sequence
+                              and receiver.session == sender.session)
+        simulation.frame()
+    sender.close()
+    frame, left, top, cx, cy = simulation.crops[-1]
+    return {
+        "zoom follows network cursor":
+            delivered and left <= target[0] < left + cx
+            and top <= target[1] < top + cy,
+        "local cursor ignored": not (left <= 50 < left + cx
+                                     and top <= 50 < top + cy),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.network",
+        description="Loopback test of the network cursor")
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--rate", type=int, default=1000,
+                        help="samples per second")
+    parser.add_argument("--drop-every", type=int, default=50,
+                        help="drop every n-th sample")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    sender_module = load_sender()
+    simulation = Simulation(settings={"Network Cursor": True,
+                                      "Network Cursor Host": "127.0.0.1",
+                                      "Network Cursor Port": 0,
+                                      "Border": 0.5})
+    simulation.load()
+    script = simulation.script
+    port = script.network_cursor.address[1]
+
+    # The receiver stamps real packets, so it needs the real clock
+    script.monotonic = monotonic
+    stats, checks = exercise_receiver(script, sender_module, port,
+                                      args.samples, args.rate,
+                                      args.drop_every)
+    script.monotonic = simulation.clock.monotonic
+    checks.update(follow_network_cursor(simulation, sender_module, port))
+    simulation.unload()
+    checks["stopped at unload"] = not script.network_cursor.running
+    checks["no script errors"] = not simulation.errors
+
+    failed = [name for name, passed in checks.items() if not passed]
+    if args.json:
+        print(json.dumps({"stats": stats, "checks": checks}, indent=4))
+    else:
+        for name, value in stats.items():
+            print(f"{name:18}{value}")
+        print()
+        for name, passed in checks.items():
+            print(f"{name:30}{'ok' if passed else 'FAILED'}")
+        for frame, error in simulation.errors[:3]:
+            print(f"\nError at frame {frame}:\n{error}")
+        print("FAIL" if failed else "PASS")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
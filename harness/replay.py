@@ -0,0 +1,84 @@
+"""
+Replays recorded cursor traces through a headless Simulation.
+
+Traces are the memory mapped CursorTrace files the script records with
+"Record cursor trace". Frames advance on the simulated video clock; before
+each frame the cursor is set to the last sample at or before the frame
+time and hotkey events fire at their recorded time, so a replay is
+deterministic.
+"""
+from math import cos, pi, sin
+from time import perf_counter
+import random
+
+import obspython as obs
+
+HOTKEYS = {1: "zoom", 2: "follow"}
+
+
+def replay(simulation, trace, tail_frames=None):
+    """
+    :param simulation: Loaded Simulation
+    :param trace: CursorTrace of the loaded script
+    :param tail_frames: Frames to run after the last record so animations
+        finish; defaults to one second
+    :return: Dictionary with the replayed records, frames and rates
+    """
+    interval = obs.frame_interval_ns / 1e9
+    frame_time = 0.0
+    records = 0
+    start = perf_counter()
+    for kind, t, a, b in trace:
+        while frame_time + interval <= t:
+            simulation.frame()
+            frame_time += interval
+        if kind == 0:
+            simulation.move_cursor(a, b)
+        elif kind in HOTKEYS:
+            # a holds the pressed state in bit 0 and the target index above
+            name = HOTKEYS[kind] if a < 2 else f"{HOTKEYS[kind]}.{(a >> 1) + 1}"
+            simulation.hotkey(name, bool(a & 1))
+        records += 1
+    if tail_frames is None:
+        tail_frames = int(round(1 / interval))
+    for _ in range(tail_frames):
+        simulation.frame()
+    elapsed = perf_counter() - start
+    return {
+        "records": records,
+        "frames": simulation.frame_index,
+        "replay_s": round(elapsed, 3),
+        "frames_per_s": round(simulation.frame_index / elapsed) if elapsed else 0,
+    }
+
+
+def write_synthetic_trace(script, file_path, seconds=3600, rate=240,
+                          canvas=(1920, 1080), toggle_every=30, seed=1):
+    """
+    Writes a synthetic session trace: a wandering cursor sampled at `rate`
+    with the zoom toggled every `toggle_every` seconds
+
+    :param script: Loaded script module, providing CursorTraceWriter
+    :return: Number of records written
+    """
+    rng = random.Random(seed)
+    width, height = canvas
+    writer = script.CursorTraceWriter()
+    writer.begin()
+    x, y = width / 2, height / 2
+    heading = 0.0
+    toggles = 0
+    for i in range(int(seconds * rate)):
+        t = i / rate
+        heading += rng.uniform(-0.3, 0.3)
+        speed = 600 * (1 + sin(2 * pi * t / 7)) / rate
+        x = min(width - 1, max(0, x + cos(heading) * speed))
+        y = min(height - 1, max(0, y + sin(heading) * speed))
+        writer.add_sample(x, y, t)
+        if t >= (toggles + 1) * toggle_every - 1e-9:
+            toggles += 1
+            writer.add_event(script.TRACE_EVENT_ZOOM, True, t)
+            writer.add_event(script.TRACE_EVENT_ZOOM, False, t)
+    records = len(writer.records) // 3
+    writer.end(file_path)
+    return records
@@ -0,0 +1,527 @@
+"""
+Runs zoom_and_follow_mouse.py headless against the stand-in obspython,
+pymonctl and pywinctl modules.
+
+A Simulation sets up a synthetic OBS (canvas, monitors, windows, a capture
+source in the current scene), loads the script the way OBS does and
+drives it frame by frame from a timeline. The script's monotonic clock is
+replaced by the simulated video clock, so runs are deterministic.
+"""
+from math import cos, hypot, pi, sin
+from time import perf_counter
+import atexit
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import tempfile
+import traceback
+
+HARNESS_DIR = os.path.dirname(os.path.abspath(__file__))
+STANDINS_DIR = os.path.join(HARNESS_DIR, "standins")
+SCRIPT = os.path.join(os.path.dirname(HARNESS_DIR), "zoom_and_follow_mouse.py")
+
+if STANDINS_DIR not in sys.path:
+    sys.path.insert(0, STANDINS_DIR)
+
+import obspython as obs
+import pymonctl
+import pywinctl
+
+SOURCE_NAME = "Capture"
+SCENE_NAME = "Scene"
+
+
+def percentile(values, p):
+    """
+    :param values: Sorted list of numbers
+    :param p: Percentile from 0 to 100
+    """
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+imported_scripts = {}
+
+
+def import_script(script=SCRIPT):
+    """
+    Imports a copy of the script in a temporary directory as a plain
+    module, without loading it into the stand-in OBS, for its constants and
+    helpers. Like Simulation.load(), the copy keeps the settings folder and
+    the compiled code out of the repository. Imported once per path.
+    """
+    module = imported_scripts.get(script)
+    if module is None:
+        workdir = tempfile.mkdtemp(prefix="zoom_import_")
+        atexit.register(shutil.rmtree, workdir, ignore_errors=True)
+        path = os.path.join(workdir, os.path.basename(script))
+        shutil.copy(script, path)
+        name = os.path.splitext(os.path.basename(script))[0]
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        exec(spec.loader.get_code(name), module.__dict__)
+        imported_scripts[script] = module
+    return module
+
+
+class VirtualClock:
+    """
+    Replacement for time.monotonic() in the script, following the video
+    clock of the stand-in OBS
+    """
+    def __init__(self, start=1000.0):
+        self.now = start
+
+    def monotonic(self):
+        return self.now
+
+
+class Simulation:
+    """
+    :param fps: Video frame rate
+    :param canvas: (width, height) of the OBS canvas and of every monitor
+    :param monitors: Number of monitors, placed side by side
+    :param windows: Number of open windows
+    :param source: "monitor" or "window", type of the zoomed capture source
+    :param settings: Script settings overriding the defaults
+    :param script: Path of the script to load
+    :param enum_ms: Simulated cost of every monitor and window enumeration
+    :param record: Keep per-frame tick times, crops and cursor path; off
+        for runs too long to keep them in memory
+    """
+    def __init__(self, fps=60, canvas=(1920, 1080), monitors=1, windows=0,
+                 source="monitor", settings=None, script=SCRIPT, enum_ms=0.0,
+                 record=True):
+        self.fps = fps
+        self.canvas = tuple(canvas)
+        self.monitor_count = max(1, monitors)
+        self.window_count = windows
+        self.source_kind = source
+        self.initial_settings = dict(settings or {})
+        self.script_path = script
+        self.enum_ms = enum_ms
+        self.record = record
+        self.crop_updates = 0
+        self.clock = VirtualClock()
+        self.script = None
+        self.settings = None
+        self.workdir = None
+        self.frame_index = 0
+        self.tick_times = []
+        self.crops = []
+        self.path = []
+        self.filter_frames = 0
+        self.frame_ticks = 0
+        self.schedule = {"frames": 0, "missed": 0, "doubled": 0}
+        self.errors = []
+        self.load_time = 0.0
+        self.startup = {}
+        self.baseline_refs = {}
+
+    # ---------------------------------------------------------------
+    def setup(self):
+        """
+        Resets the stand-ins and creates monitors, windows, the capture
+        source and a scene showing it
+        """
+        width, height = self.canvas
+        obs.reset(canvas=self.canvas, fps=self.fps)
+        pymonctl.reset()
+        pywinctl.reset()
+        pymonctl.enum_delay = pywinctl.enum_delay = self.enum_ms / 1000
+
+        pymonctl.set_monitors([(i * width, 0, width, height)
+                               for i in range(self.monitor_count)])
+        for i in range(self.window_count):
+            left = (i * 37) % max(1, width - 640)
+            top = (i * 23) % max(1, height - 480)
+            pywinctl.add_window(1000 + i, f"Window {i}",
+                                (left, top, left + 1600, top + 900),
+                                app=f"app{i}.exe")
+
+        if self.source_kind == "window":
+            if self.window_count == 0:
+                pywinctl.add_window(1000, "Window 0", (0, 0, 1600, 900),
+                                    app="app0.exe")
+            source = obs.create_source("window_capture", SOURCE_NAME,
+                                       {"window": "Window 0:Class:app0.exe"},
+                                       size=(1600, 900))
+        else:
+            source = obs.create_source("monitor_capture", SOURCE_NAME,
+                                       {"monitor": 0}, size=self.canvas)
+        scene = obs.create_scene(SCENE_NAME, [source])
+        obs.current_scene = scene
+        obs.update_hook = self.on_update
+
+    def on_update(self, target):
+        self.crop_updates += 1
+        if not self.record:
+            return
+        if getattr(target, "id", None) == "crop_filter":
+            values = target.settings.values
+            self.crops.append((self.frame_index, values.get("left", 0),
+                               values.get("top", 0), values.get("cx", 0),
+                               values.get("cy", 0)))
+        elif isinstance(target, obs.SceneItem):
+            crop = target.crop
+            self.crops.append((self.frame_index, crop.left, crop.top,
+                               target.source.width - crop.left - crop.right,
+                               target.source.height - crop.top - crop.bottom))
+
+    def call(self, function, *args):
+        """
+        Calls into the script, recording exceptions the way OBS logs them
+        instead of aborting the simulation
+        """
+        try:
+            return function(*args)
+        except Exception:
+            self.errors.append((self.frame_index, traceback.format_exc()))
+            return None
+
+    def load(self):
+        """
+        Loads a copy of the script in a temporary directory, so its settings
+        file does not end up next to the real script, and runs the OBS load
+        sequence
+        """
+        self.setup()
+        # References held by the harness itself, before the script runs
+        self.baseline_refs = dict(obs.refs)
+        self.workdir = tempfile.mkdtemp(prefix="zoom_harness_")
+        path = os.path.join(self.workdir, os.path.basename(self.script_path))
+        shutil.copy(self.script_path, path)
+
+        start = perf_counter()
+        name = f"zoom_and_follow_harness_{id(self)}"
+        spec = importlib.util.spec_from_file_location(name, path)
+        self.script = importlib.util.module_from_spec(spec)
+        # OBS keeps the compiled script in __pycache__, the temporary copy
+        # is compiled on every load
+        code = spec.loader.get_code(name)
+        compiled = perf_counter()
+        exec(code, self.script.__dict__)
+        self.script.monotonic = self.clock.monotonic
+        # Only PyMonCtl is stood in, other cursor backends would read the
+        # real cursor
+        cursors = getattr(self.script, "cursors", None)
+        if cursors is not None:
+            cursors.providers = [self.script.PyMonCtlCursor()]
+        imported = perf_counter()
+
+        self.settings = obs.obs_data_create()
+        self.script.script_defaults(self.settings)
+        self.call(self.script.script_load, self.settings)
+        self.load_time = perf_counter() - start
+        self.count_scheduler_ticks()
+        obs.script_tick = getattr(self.script, "script_tick", None)
+        # OS enumerations before the first frame are paid by every OBS
+        # startup and script reload
+        self.startup = {
+            "compile_ms": round((compiled - start) * 1000, 3),
+            "import_ms": round((imported - compiled) * 1000, 3),
+            "script_load_ms": round((self.load_time - (imported - start))
+                                    * 1000, 3),
+            "enumerations": {name: count for name, count
+                             in (pymonctl.calls + pywinctl.calls).items()
+                             if name in ("getAllMonitorsDict",
+                                         "getAllWindows")},
+        }
+
+        values = {"source": f"{SOURCE_NAME}||{obs.sources[SOURCE_NAME].id}"}
+        values.update(self.initial_settings)
+        self.settings.values.update(values)
+        self.call(self.script.script_properties)
+        self.call(self.script.script_update, self.settings)
+        return self
+
+    def count_scheduler_ticks(self):
+        """
+        Counts the zoom updates of every frame, whether the timer or the
+        render tick drives them
+        """
+        scheduler = getattr(self.script, "scheduler", None)
+        if scheduler is None:
+            return
+        tick = scheduler.tick
+
+        def counted():
+            self.frame_ticks += 1
+            return tick()
+        # The timer is registered with scheduler.callback
+        scheduler.tick = scheduler.callback = counted
+
+    def unload(self):
+        if self.script is not None:
+            self.call(self.script.script_save, self.settings)
+            self.call(self.script.script_unload)
+            obs.obs_data_release(self.settings)
+        if self.workdir is not None:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+            self.workdir = None
+
+    # ---------------------------------------------------------------
+    def update_settings(self, values):
+        self.settings.values.update(values)
+        self.call(self.script.script_update, self.settings)
+
+    def hotkey(self, name, pressed=True):
+        """
+        :param name: "zoom" or "follow", followed by ".<n>" for the zoom
+            target n other than the first, e.g. "zoom.2"
+        """
+        hotkey = obs.find_hotkey(f".{name}.toggle")
+        if hotkey is None:
+            raise KeyError(f"Hotkey {name} not registered")
+        self.call(hotkey["callback"], pressed)
+
+    def move_cursor(self, x, y):
+        pymonctl.cursor = pymonctl.Point(int(x), int(y))
+
+    def stall(self, ms):
+        """
+        Simulates the graphics thread stalling; the video and script clocks
+        jump ahead without running the timers
+        """
+        obs.video_time_ns += int(ms * 1e6)
+        self.clock.now += ms / 1000
+
+    def frame(self):
+        """
+        Advances one video frame and runs the due script timers
+        """
+        self.frame_index += 1
+        self.clock.now += obs.frame_interval_ns / 1e9
+        scheduler = getattr(self.script, "scheduler", None)
+        # Frames the zoom should update in: ticking and not parked
+        updating = scheduler is not None and scheduler.ticking \
+            and not scheduler.parked
+        self.frame_ticks = 0
+        start = perf_counter()
+        try:
+            fired = obs.advance_frame()
+        except Exception:
+            self.errors.append((self.frame_index, traceback.format_exc()))
+            fired = 1
+        if self.frame_ticks and self.record:
+            self.tick_times.append(perf_counter() - start)
+        if updating:
+            self.schedule["frames"] += 1
+            if self.frame_ticks == 0:
+                self.schedule["missed"] += 1
+            elif self.frame_ticks > 1:
+                self.schedule["doubled"] += 1
+        if self.record:
+            self.path.append((pymonctl.cursor,
+                              self.crops[-1] if self.crops else None))
+        # Every filter on a source is an extra render pass per frame
+        self.filter_frames += sum(len(source.filters)
+                                  for source in obs.sources.values())
+        return fired
+
+    # ---------------------------------------------------------------
+    def run(self, timeline):
+        """
+        Plays a timeline. Events are dictionaries with a "frame" and one of:
+            "cursor": [x, y]
+            "move": {"to": [x, y], "frames": n}, a linear cursor path
+            "hotkey": "zoom" | "follow" | "zoom.<n>" | "follow.<n>"
+            "settings": {name: value}
+            "frontend_event": OBS_FRONTEND_EVENT_* name
+            "monitors": [[x, y, width, height], ...]
+            "window": {"handle": h, "rect": [left, top, right, bottom],
+                       "title": title, "closed": true}, any of them
+            "stall_ms": milliseconds
+            "fps": new video frame rate, like changing it in the OBS settings
+
+        :param timeline: Dictionary with "frames" and "events", or a list of
+            events
+        """
+        if isinstance(timeline, list):
+            timeline = {"events": timeline}
+        events = sorted(timeline.get("events", []), key=lambda e: e["frame"])
+        frames = timeline.get("frames",
+                              max([e["frame"] for e in events] or [0]) + 1)
+        moves = []
+        event_index = 0
+        for frame in range(frames):
+            while event_index < len(events) \
+                    and events[event_index]["frame"] <= frame:
+                self.apply(events[event_index], moves)
+                event_index += 1
+            for move in list(moves):
+                done = move["frame"] + move["frames"] - frame
+                fraction = 1 - done / move["frames"]
+                x = move["from"][0] + (move["to"][0] - move["from"][0]) * fraction
+                y = move["from"][1] + (move["to"][1] - move["from"][1]) * fraction
+                self.move_cursor(x, y)
+                if done <= 0:
+                    moves.remove(move)
+            self.frame()
+        return self
+
+    def apply(self, event, moves):
+        if "cursor" in event:
+            self.move_cursor(*event["cursor"])
+        if "move" in event:
+            moves.append({"frame": event["frame"],
+                          "frames": max(1, event["move"]["frames"]),
+                          "from": tuple(pymonctl.cursor),
+                          "to": tuple(event["move"]["to"])})
+        if "hotkey" in event:
+            self.hotkey(event["hotkey"])
+        if "settings" in event:
+            self.update_settings(event["settings"])
+        if "frontend_event" in event:
+            obs.emit_frontend_event(getattr(obs, event["frontend_event"]))
+        if "monitors" in event:
+            pymonctl.set_monitors([tuple(m) for m in event["monitors"]])
+        if "window" in event:
+            window = event["window"]
+            handle = window.get("handle", 1000)
+            if "rect" in window:
+                pywinctl.move_window(handle, window["rect"])
+            if "title" in window:
+                pywinctl.set_window_title(handle, window["title"])
+            if window.get("closed"):
+                pywinctl.close_window(handle)
+        if "stall_ms" in event:
+            self.stall(event["stall_ms"])
+        if "fps" in event:
+            self.fps = event["fps"]
+            obs.frame_interval_ns = int(round(1e9 / self.fps))
+
+    def synthetic_timeline(self, seconds=10.0):
+        """
+        Zooms in, circles the cursor around the canvas center and zooms
+        out again near the end
+        """
+        frames = int(seconds * self.fps)
+        width, height = self.canvas
+        radius = height * 0.35
+        events = [{"frame": 0, "cursor": [width // 2, height // 2]},
+                  {"frame": 1, "hotkey": "zoom"},
+                  {"frame": int(frames * 0.8), "hotkey": "zoom"}]
+        for frame in range(2, int(frames * 0.8), 2):
+            angle = 2 * pi * frame / (4 * self.fps)
+            events.append({"frame": frame,
+                           "cursor": [int(width / 2 + radius * cos(angle)),
+                                      int(height / 2 + radius * sin(angle))]})
+        return {"frames": frames, "events": events}
+
+    def lag(self, max_frames=30):
+        """
+        Cursor-to-crop lag over the frames fully zoomed in: the delay at
+        which the zoom window center best matches the cursor path, and the
+        mean distance between the two without and with that delay. The
+        center is in source coordinates, so this assumes a source at the
+        origin, like the monitor source of the harness.
+
+        :param max_frames: Longest delay tried
+        """
+        zoomed = [crop[3] for _, crop in self.path if crop is not None]
+        if not zoomed:
+            return None
+        width = min(zoomed)
+        centers = [(crop[1] + crop[3] / 2, crop[2] + crop[4] / 2)
+                   if crop is not None and crop[3] <= width + 0.5 else None
+                   for _, crop in self.path]
+        cursors = [cursor for cursor, _ in self.path]
+        errors = []
+        for delay in range(max_frames + 1):
+            total = count = 0
+            for frame in range(delay, len(centers)):
+                center = centers[frame]
+                if center is not None:
+                    x, y = cursors[frame - delay]
+                    total += hypot(center[0] - x, center[1] - y)
+                    count += 1
+            errors.append(total / count if count else 0.0)
+        delay = min(range(len(errors)), key=errors.__getitem__)
+        interval_ms = obs.frame_interval_ns / 1e6
+        return {
+            "frames": delay,
+            "ms": round(delay * interval_ms, 2),
+            "error_px": round(errors[0], 2),
+            "error_at_lag_px": round(errors[delay], 2),
+        }
+
+    def leaked_refs(self):
+        """
+        :return: References the script took and did not release, per type;
+            after unload() this must be empty
+        """
+        leaked = {}
+        for kind in set(obs.refs) | set(self.baseline_refs):
+            count = obs.refs.get(kind, 0) - self.baseline_refs.get(kind, 0)
+            if count:
+                leaked[kind] = count
+        return leaked
+
+    # ---------------------------------------------------------------
+    def report(self):
+        times = sorted(self.tick_times)
+        ticks = len(times)
+        api_calls = sum(obs.calls.values())
+        return {
+            "frames": self.frame_index,
+            "ticks": ticks,
+            "load_ms": round(self.load_time * 1000, 3),
+            "startup": self.startup,
+            "tick_us": {
+                "mean": round(sum(times) / ticks * 1e6, 2) if ticks else 0.0,
+                "p50": round(percentile(times, 50) * 1e6, 2),
+                "p95": round(percentile(times, 95) * 1e6, 2),
+                "p99": round(percentile(times, 99) * 1e6, 2),
+                "max": round(times[-1] * 1e6, 2) if ticks else 0.0,
+            },
+            "obs_calls": api_calls,
+            "obs_calls_per_tick": round(api_calls / ticks, 2) if ticks else 0.0,
+            "obs_calls_top": dict(obs.calls.most_common(10)),
+            "os_calls": dict(pymonctl.calls + pywinctl.calls),
+            "crop_updates": self.crop_updates,
+            "filter_frames": self.filter_frames,
+            "schedule": dict(self.schedule),
+            "live_refs": {k: v for k, v in obs.refs.items() if v},
+            "leaked_refs": self.leaked_refs(),
+            "script_refs": self.script.refs.leaks()
+            if hasattr(self.script, "refs") else {},
+            "errors": len(self.errors),
+        }
+
+
+def format_report(report):
+    lines = [
+        f"frames        {report['frames']}",
+        f"ticks         {report['ticks']}",
+        f"load          {report['load_ms']} ms"
+        f" (compile {report['startup'].get('compile_ms', 0)} ms,"
+        f" import {report['startup'].get('import_ms', 0)} ms,"
+        f" script_load {report['startup'].get('script_load_ms', 0)} ms,"
+        f" enumerations {json.dumps(report['startup'].get('enumerations', {}))})",
+        "tick wall     " + "  ".join(f"{k} {v}us"
+                                     for k, v in report["tick_us"].items()),
+        f"obs calls     {report['obs_calls']}"
+        f" ({report['obs_calls_per_tick']} per tick)",
+    ]
+    for name, count in report["obs_calls_top"].items():
+        lines.append(f"    {name:40} {count}")
+    lines.append("os calls      " + json.dumps(report["os_calls"]))
+    lines.append(f"crop updates  {report['crop_updates']}")
+    lines.append(f"filter frames {report['filter_frames']}")
+    lines.append(f"zoom frames   {report['schedule']['frames']}"
+                 f" (missed {report['schedule']['missed']},"
+                 f" doubled {report['schedule']['doubled']})")
+    lines.append("live refs     " + json.dumps(report["live_refs"]))
+    lines.append("leaked refs   " + json.dumps(report["leaked_refs"])
+                 + "  script counters " + json.dumps(report["script_refs"]))
+    lines.append(f"errors        {report['errors']}")
+    if "lag" in report:
+        lines.append("lag           " + json.dumps(report["lag"]))
+    if "replay" in report:
+        lines.append("replay        " + json.dumps(report["replay"]))
+    return "\n".join(lines)
@@ -0,0 +1,309 @@
+"""
+Long-session soak test: runs the script for hours of simulated video on
+the stand-in OBS and fails when memory or OBS handles keep growing.
+
+The session zooms in and out, toggles follow, changes settings, opens the
+properties, removes, re-adds and renames the capture source and changes
+the monitor layout on a fixed schedule, while the cursor keeps moving.
+Every sample interval the resident set size, the memory traced by
+tracemalloc and the live OBS handles (references, signal connections,
+timers, hotkeys) are recorded. Growth is measured from the end of the
+warm-up to the end of the run, so caches filled once do not count.
+
+    python -m harness.soak --hours 24
+"""
+from math import cos, pi, sin
+from time import perf_counter
+import argparse
+import json
+import random
+import sys
+import tracemalloc
+
+from .simulation import SCENE_NAME, SOURCE_NAME, SCRIPT, Simulation
+
+import obspython as obs
+import pymonctl
+import pywinctl
+
+
+def rss_bytes():
+    """
+    :return: Resident set size of this process, or 0 where it cannot be read
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        import resource
+        return pages * resource.getpagesize()
+    except (OSError, ImportError, IndexError, ValueError):
+        pass
+    try:
+        import resource
+        # Peak rather than current size, but still catches growth
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    except ImportError:
+        return 0
+
+
+def handles(simulation):
+    """
+    :return: Dictionary of the OBS handles alive in the stand-in
+    """
+    connections = obs.global_signals.count() + sum(
+        source.signals.count() for source in obs.sources.values())
+    return {
+        "refs": sum(obs.refs.values()),
+        "script_refs": sum(simulation.script.refs.live.values()),
+        "signals": connections,
+        "timers": len(obs.timers),
+        "hotkeys": len(obs.hotkeys),
+    }
+
+
+class Soak:
+    """
+    :param hours: Simulated session length
+    :param fps: Video frame rate
+    :param source: "monitor" or "window"
+    :param sample_minutes: Simulated time between samples
+    :param warmup: Fraction of the session before growth is measured
+    :param seed: Seed of the cursor path
+    """
+    # Simulated seconds between the churn events
+    ZOOM_EVERY = 90
+    ZOOM_LENGTH = 30
+    FOLLOW_EVERY = 300
+    SETTINGS_EVERY = 600
+    PROPERTIES_EVERY = 900
+    MONITORS_EVERY = 1200
+    SOURCE_EVERY = 1800
+
+    def __init__(self, hours=24.0, fps=60, source="monitor",
+                 sample_minutes=30.0, warmup=0.1, seed=1, script=SCRIPT):
+        self.hours = hours
+        self.fps = fps
+        self.source = source
+        self.sample_minutes = sample_minutes
+        self.warmup = warmup
+        self.rng = random.Random(seed)
+        self.simulation = Simulation(fps=fps, source=source,
+                                     windows=1 if source == "window" else 0,
+                                     script=script, record=False)
+        self.samples = []
+        self.events = 0
+        self.baseline_snapshot = None
+        self.final_snapshot = None
+
+    def every(self, frame, seconds, offset=0):
+        period = int(seconds * self.fps)
+        return frame >= offset and (frame - offset) % period == 0
+
+    def churn(self, frame):
+        """
+        Applies the events due at this frame
+        """
+        simulation = self.simulation
+        width, height = simulation.canvas
+        if self.every(frame, self.ZOOM_EVERY, self.fps):
+            simulation.hotkey("zoom")
+        elif self.every(frame, self.ZOOM_EVERY,
+                        self.fps + self.ZOOM_LENGTH * self.fps):
+            simulation.hotkey("zoom")
+        elif self.every(frame, self.FOLLOW_EVERY, 45 * self.fps):
+            simulation.hotkey("follow")
+        elif self.every(frame, self.FOLLOW_EVERY, 50 * self.fps):
+            simulation.hotkey("follow")
+        elif self.every(frame, self.SETTINGS_EVERY, 60 * self.fps):
+            count = frame // int(self.SETTINGS_EVERY * self.fps)
+            simulation.update_settings({"Width": 1280 - 320 * (count % 2),
+                                        "Height": 720 - 180 * (count % 2),
+                                        "Smooth": 1.0 + count % 3})
+        elif self.every(frame, self.PROPERTIES_EVERY, 70 * self.fps):
+            simulation.call(simulation.script.script_properties)
+        elif self.every(frame, self.MONITORS_EVERY, 80 * self.fps):
+            count = frame // int(self.MONITORS_EVERY * self.fps)
+            monitors = [(0, 0, width, height)]
+            if count % 2 == 0:
+                monitors.append((width, 0, width, height))
+            pymonctl.set_monitors(monitors)
+        elif self.every(frame, self.SOURCE_EVERY, 100 * self.fps):
+            self.replace_source(frame // int(self.SOURCE_EVERY * self.fps))
+        else:
+            return
+        self.events += 1
+
+    def replace_source(self, count):
+        """
+        Renames the capture source and back, or removes it and adds a new
+        one with the same name to the scene
+        """
+        if count % 2:
+            obs.rename_source(SOURCE_NAME, f"{SOURCE_NAME} renamed")
+            obs.rename_source(f"{SOURCE_NAME} renamed", SOURCE_NAME)
+            return
+        old = obs.sources[SOURCE_NAME]
+        settings = dict(old.settings.values)
+        size = (old.width, old.height)
+        obs.remove_source(SOURCE_NAME)
+        source = obs.create_source(old.id, SOURCE_NAME, settings, size=size)
+        obs.add_scene_item(obs.sources[SCENE_NAME], source)
+        if self.source == "window":
+            left = self.rng.randrange(0, 300)
+            top = self.rng.randrange(0, 150)
+            pywinctl.move_window(1000, (left, top, left + 1600, top + 900))
+
+    def move_cursor(self, frame):
+        width, height = self.simulation.canvas
+        t = frame / self.fps
+        # Circles of changing size with some noise, so following never stops
+        radius = height * (0.2 + 0.15 * sin(2 * pi * t / 37))
+        angle = 2 * pi * t / 5
+        self.simulation.move_cursor(
+            width / 2 + radius * cos(angle) + self.rng.uniform(-3, 3),
+            height / 2 + radius * sin(angle) + self.rng.uniform(-3, 3))
+
+    def sample(self, frame, started):
+        current, peak = tracemalloc.get_traced_memory()
+        sample = {
+            "hours": round(frame / self.fps / 3600, 3),
+            "rss_mb": round(rss_bytes() / 1e6, 2),
+            "traced_kb": round(current / 1e3, 1),
+            "wall_s": round(perf_counter() - started, 1),
+        }
+        sample.update(handles(self.simulation))
+        self.samples.append(sample)
+        return sample
+
+    def run(self, progress=None):
+        """
+        :param progress: Called with every sample
+        :return: self
+        """
+        frames = int(self.hours * 3600 * self.fps)
+        sample_every = max(1, int(self.sample_minutes * 60 * self.fps))
+        warmup_frame = int(frames * self.warmup)
+        tracemalloc.start()
+        started = perf_counter()
+        simulation = self.simulation.load()
+        for frame in range(frames):
+            self.move_cursor(frame)
+            self.churn(frame)
+            simulation.frame()
+            if frame == warmup_frame:
+                self.baseline_snapshot = tracemalloc.take_snapshot()
+                sample = self.sample(frame, started)
+                sample["warmup"] = True
+                if progress:
+                    progress(sample)
+            elif frame % sample_every == 0 or frame == frames - 1:
+                sample = self.sample(frame, started)
+                if progress:
+                    progress(sample)
+        self.final_snapshot = tracemalloc.take_snapshot()
+        simulation.unload()
+        tracemalloc.stop()
+        return self
+
+    def growth(self):
+        """
+        :return: Growth of every sampled value from the end of the warm-up
+            to the last sample
+        """
+        baseline = next((s for s in self.samples if s.get("warmup")),
+                        self.samples[0])
+        last = self.samples[-1]
+        return {key: round(last[key] - baseline[key], 2)
+                for key in last if key not in ("hours", "wall_s", "warmup")}
+
+    def top_growth(self, limit=10):
+        """
+        :return: Source lines that allocated the most memory since the end
+            of the warm-up
+        """
+        if self.baseline_snapshot is None or self.final_snapshot is None:
+            return []
+        # Leave out the samples and tracemalloc's own bookkeeping
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__),
+                  tracemalloc.Filter(False, __file__)]
+        stats = self.final_snapshot.filter_traces(ignore).compare_to(
+            self.baseline_snapshot.filter_traces(ignore), "lineno")
+        return [f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}"
+                f" {stat.size_diff / 1e3:+.1f} kB ({stat.count_diff:+d})"
+                for stat in stats[:limit] if stat.size_diff > 0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.soak",
+        description="Soak test zoom_and_follow_mouse.py for memory and "
+                    "OBS handle growth")
+    parser.add_argument("--hours", type=float, default=24,
+                        help="simulated session length")
+    parser.add_argument("--fps", type=float, default=60)
+    parser.add_argument("--source", choices=("monitor", "window"),
+                        default="monitor")
+    parser.add_argument("--sample-minutes", type=float, default=30,
+                        help="simulated time between samples")
+    parser.add_argument("--warmup", type=float, default=0.1,
+                        help="fraction of the session before growth counts")
+    parser.add_argument("--max-traced-kb", type=float, default=256,
+                        help="allowed growth of the memory traced by "
+                             "tracemalloc")
+    parser.add_argument("--max-rss-mb", type=float, default=32,
+                        help="allowed growth of the resident set size")
+    parser.add_argument("--max-handles", type=int, default=0,
+                        help="allowed growth of every OBS handle count")
+    parser.add_argument("--json", action="store_true",
+                        help="print the samples and the verdict as JSON")
+    args = parser.parse_args(argv)
+
+    soak = Soak(hours=args.hours, fps=args.fps, source=args.source,
+                sample_minutes=args.sample_minutes, warmup=args.warmup)
+    columns = ("hours", "rss_mb", "traced_kb", "refs", "script_refs",
+               "signals", "timers", "hotkeys", "wall_s")
+
+    def progress(sample):
+        if not args.json:
+            print("".join(f"{sample[column]:>12}" for column in columns),
+                  flush=True)
+
+    if not args.json:
+        print("".join(f"{column:>12}" for column in columns))
+    soak.run(progress)
+
+    growth = soak.growth()
+    failures = []
+    if growth["traced_kb"] > args.max_traced_kb:
+        failures.append(f"traced memory grew {growth['traced_kb']} kB")
+    if growth["rss_mb"] > args.max_rss_mb:
+        failures.append(f"RSS grew {growth['rss_mb']} MB")
+    for key in ("refs", "script_refs", "signals", "timers", "hotkeys"):
+        if growth[key] > args.max_handles:
+            failures.append(f"{key} grew by {growth[key]}")
+    leaked = soak.simulation.leaked_refs()
+    if leaked:
+        failures.append(f"references leaked after unload: {leaked}")
+    errors = len(soak.simulation.errors)
+    if errors:
+        failures.append(f"{errors} script errors")
+
+    result = {"samples": soak.samples, "events": soak.events,
+              "growth": growth, "top_growth": soak.top_growth(),
+              "leaked_refs": leaked, "failures": failures}
+    if args.json:
+        print(json.dumps(result, indent=4))
+    else:
+        print(f"events        {soak.events}")
+        print("growth        " + json.dumps(growth))
+        for line in result["top_growth"]:
+            print(f"    {line}")
+        for frame, error in soak.simulation.errors[:3]:
+            print(f"\nError at frame {frame}:\n{error}")
+        print("FAIL: " + "; ".join(failures) if failures else "PASS")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
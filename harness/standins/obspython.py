@@ -0,0 +1,788 @@
+"""
+Stand-in for the obspython module OBS Studio provides to scripts.
+
+Implements the part of the OBS scripting API used by
+zoom_and_follow_mouse.py on plain Python objects: sources, filters,
+obs_data, scenes and scene items, signals, timers, hotkeys, frontend
+events and properties. Every API call is counted in `calls` and every
+reference taken or released is tracked per type in `refs`, so the harness
+can report API usage and reference leaks.
+
+State is module global, like in OBS; call reset() before setting up a new
+simulation.
+"""
+from collections import Counter
+import json
+
+OBS_COMBO_TYPE_LIST = 2
+OBS_COMBO_FORMAT_INT = 1
+OBS_COMBO_FORMAT_FLOAT = 2
+OBS_COMBO_FORMAT_STRING = 3
+OBS_TEXT_DEFAULT = 0
+OBS_TEXT_INFO = 3
+OBS_GROUP_NORMAL = 1
+
+OBS_BOUNDS_NONE = 0
+OBS_BOUNDS_SCALE_INNER = 2
+OBS_ALIGN_LEFT = 1
+OBS_ALIGN_TOP = 4
+
+OBS_FRONTEND_EVENT_SCENE_CHANGED = 8
+OBS_FRONTEND_EVENT_SCENE_LIST_CHANGED = 9
+OBS_FRONTEND_EVENT_SCENE_COLLECTION_CHANGED = 16
+OBS_FRONTEND_EVENT_PROFILE_CHANGED = 18
+OBS_FRONTEND_EVENT_EXIT = 20
+OBS_FRONTEND_EVENT_SCENE_COLLECTION_CLEANUP = 27
+OBS_FRONTEND_EVENT_FINISHED_LOADING = 28
+
+calls = Counter()
+refs = Counter()
+
+
+def reset(canvas=(1920, 1080), fps=60):
+    """
+    Clears all state and configures the video settings
+    """
+    global sources, current_scene, timers, current_timer, hotkeys, \
+        frontend_callbacks, global_signals, video_time_ns, frame_interval_ns, \
+        base_size, update_hook, next_hotkey_id, script_tick, last_tick_ns
+    calls.clear()
+    refs.clear()
+    sources = {}
+    current_scene = None
+    timers = []
+    current_timer = None
+    hotkeys = {}
+    next_hotkey_id = 1
+    frontend_callbacks = []
+    global_signals = SignalHandler()
+    video_time_ns = 0
+    frame_interval_ns = int(round(1e9 / fps))
+    base_size = canvas
+    update_hook = None
+    script_tick = None
+    last_tick_ns = 0
+
+
+# -------------------------------------------------------------------
+# Plain Python objects behind the OBS handles
+
+class Referenced:
+    """
+    Base of all reference counted handles. The creator holds the first
+    reference.
+    """
+    def __init__(self):
+        self.refcount = 0
+        self.addref()
+
+    def addref(self):
+        self.refcount += 1
+        refs[type(self).__name__] += 1
+        return self
+
+    def release(self):
+        if self.refcount <= 0:
+            raise RuntimeError(f"{type(self).__name__} released too often")
+        self.refcount -= 1
+        refs[type(self).__name__] -= 1
+
+
+class Data(Referenced):
+    def __init__(self, values=None):
+        super().__init__()
+        self.values = dict(values or {})
+        self.defaults = {}
+
+    def get(self, name, fallback):
+        if name in self.values:
+            return self.values[name]
+        return self.defaults.get(name, fallback)
+
+
+class DataArray(Referenced):
+    def __init__(self, items=None):
+        super().__init__()
+        self.items = list(items or [])
+
+
+class SignalHandler:
+    def __init__(self):
+        self.callbacks = {}
+
+    def connect(self, signal, callback):
+        self.callbacks.setdefault(signal, []).append(callback)
+
+    def disconnect(self, signal, callback):
+        # OBS matches Python callbacks by object identity
+        callbacks = self.callbacks.get(signal, [])
+        for i, registered in enumerate(callbacks):
+            if registered is callback:
+                del callbacks[i]
+                return
+
+    def emit(self, signal, **calldata):
+        for callback in list(self.callbacks.get(signal, [])):
+            callback(calldata)
+
+    def count(self):
+        return sum(len(callbacks) for callbacks in self.callbacks.values())
+
+
+class Source(Referenced):
+    def __init__(self, source_id, name, settings=None, private=False):
+        super().__init__()
+        self.id = source_id
+        self.name = name
+        self.settings = Data(settings)
+        self.filters = []
+        self.private = private
+        self.removed = False
+        self.signals = SignalHandler()
+        self.width = self.height = 0
+
+    def release(self):
+        super().release()
+        if self.refcount == 0:
+            # A destroyed source drops its settings and filters
+            self.settings.release()
+            for source_filter in self.filters:
+                source_filter.release()
+            self.filters = []
+
+
+class Scene:
+    def __init__(self, source):
+        self.source = source
+        self.items = []
+
+
+class vec2:
+    def __init__(self):
+        self.x = 0.0
+        self.y = 0.0
+
+
+class obs_sceneitem_crop:
+    def __init__(self):
+        self.left = self.top = self.right = self.bottom = 0
+
+
+class obs_video_info:
+    def __init__(self):
+        self.base_width = self.base_height = 0
+        self.output_width = self.output_height = 0
+        self.fps_num = self.fps_den = 0
+
+
+class SceneItem(Referenced):
+    def __init__(self, scene, source):
+        super().__init__()
+        self.scene = scene
+        self.source = source
+        self.bounds_type = OBS_BOUNDS_NONE
+        self.bounds_alignment = 0
+        self.alignment = OBS_ALIGN_LEFT | OBS_ALIGN_TOP
+        self.bounds = vec2()
+        self.pos = vec2()
+        self.scale = vec2()
+        self.scale.x = self.scale.y = 1.0
+        self.crop = obs_sceneitem_crop()
+
+
+class Property:
+    def __init__(self, name, description, kind):
+        self.name = name
+        self.description = description
+        self.kind = kind
+        self.visible = True
+        self.items = []
+        self.callback = None
+        self.group = None
+
+
+class Properties:
+    def __init__(self):
+        self.properties = {}
+
+    def add(self, prop):
+        self.properties[prop.name] = prop
+        return prop
+
+
+# -------------------------------------------------------------------
+# Harness side helpers, not part of the OBS API
+
+def create_source(source_id, name, settings=None, size=(0, 0)):
+    """
+    Creates a source owned by OBS, like one added by the user
+    """
+    source = Source(source_id, name, settings)
+    source.width, source.height = size
+    sources[name] = source
+    global_signals.emit("source_create", source=source)
+    return source
+
+
+def remove_source(name):
+    """
+    Removes a source the way deleting it in the OBS UI does
+    """
+    source = sources.pop(name)
+    source.removed = True
+    source.signals.emit("remove", source=source)
+    global_signals.emit("source_remove", source=source)
+    for scene_source in list(sources.values()):
+        scene = getattr(scene_source, "scene", None)
+        if scene is not None:
+            for item in [i for i in scene.items if i.source is source]:
+                scene.items.remove(item)
+                item.release()
+                source.release()
+    source.release()
+    if source.refcount == 0:
+        source.signals.emit("destroy", source=source)
+        global_signals.emit("source_destroy", source=source)
+
+
+def rename_source(name, new_name):
+    source = sources.pop(name)
+    source.name = new_name
+    sources[new_name] = source
+    source.signals.emit("rename", source=source, new_name=new_name,
+                        prev_name=name)
+    global_signals.emit("source_rename", source=source, new_name=new_name,
+                        prev_name=name)
+
+
+def create_scene(name, item_sources=()):
+    source = create_source("scene", name)
+    source.scene = Scene(source)
+    for item_source in item_sources:
+        add_scene_item(source, item_source)
+    return source
+
+
+def add_scene_item(scene_source, source):
+    """
+    Adds a source to a scene, like dragging it into the scene in OBS
+    """
+    scene_source.scene.items.append(SceneItem(scene_source.scene, source))
+    source.addref()
+
+
+def set_current_scene(scene_source):
+    global current_scene
+    current_scene = scene_source
+    emit_frontend_event(OBS_FRONTEND_EVENT_SCENE_CHANGED)
+
+
+def emit_frontend_event(event):
+    for callback in list(frontend_callbacks):
+        callback(event)
+
+
+def advance_frame():
+    """
+    Advances the video clock by one frame, calls script_tick() with the
+    time since the previous frame and runs the script timers that are due,
+    like the OBS Python tick does: each timer fires at most once per frame
+    and keeps its own schedule.
+
+    :return: Number of script_tick and timer callbacks run
+    """
+    global video_time_ns, current_timer, last_tick_ns
+    video_time_ns += frame_interval_ns
+    fired = 0
+    if script_tick is not None:
+        script_tick((video_time_ns - last_tick_ns) / 1e9)
+        fired += 1
+    last_tick_ns = video_time_ns
+    for timer in list(timers):
+        if timer not in timers:
+            continue
+        if video_time_ns - timer["last_ts"] >= timer["interval"]:
+            current_timer = timer
+            try:
+                timer["callback"]()
+            finally:
+                current_timer = None
+            timer["last_ts"] += timer["interval"]
+            fired += 1
+    return fired
+
+
+def find_hotkey(suffix):
+    for hotkey in hotkeys.values():
+        if hotkey["name"].endswith(suffix):
+            return hotkey
+    return None
+
+
+# -------------------------------------------------------------------
+# OBS API
+
+def obs_get_frame_interval_ns():
+    return frame_interval_ns
+
+
+def obs_get_video_frame_time():
+    return video_time_ns
+
+
+def obs_get_video_info(video):
+    video.base_width, video.base_height = base_size
+    video.output_width, video.output_height = base_size
+    video.fps_num, video.fps_den = int(round(1e9 / frame_interval_ns)), 1
+    return True
+
+
+def obs_get_signal_handler():
+    return global_signals
+
+
+# obs_data
+
+def obs_data_create():
+    return Data()
+
+
+def obs_data_create_from_json(text):
+    return Data(json.loads(text))
+
+
+def obs_data_release(data):
+    if data is not None:
+        data.release()
+
+
+def obs_data_get_json(data):
+    return json.dumps(data.values)
+
+
+def obs_data_set_default_string(data, name, value):
+    data.defaults[name] = value
+
+
+def obs_data_set_default_bool(data, name, value):
+    data.defaults[name] = bool(value)
+
+
+def obs_data_set_default_int(data, name, value):
+    data.defaults[name] = int(value)
+
+
+def obs_data_set_default_double(data, name, value):
+    data.defaults[name] = float(value)
+
+
+def obs_data_set_string(data, name, value):
+    data.values[name] = value
+
+
+def obs_data_set_bool(data, name, value):
+    data.values[name] = bool(value)
+
+
+def obs_data_set_int(data, name, value):
+    data.values[name] = int(value)
+
+
+def obs_data_set_double(data, name, value):
+    data.values[name] = float(value)
+
+
+def obs_data_get_string(data, name):
+    return data.get(name, "")
+
+
+def obs_data_get_bool(data, name):
+    return bool(data.get(name, False))
+
+
+def obs_data_get_int(data, name):
+    return int(data.get(name, 0))
+
+
+def obs_data_get_double(data, name):
+    return float(data.get(name, 0.0))
+
+
+def obs_data_set_array(data, name, array):
+    data.values[name] = array
+
+
+def obs_data_get_array(data, name):
+    array = data.values.get(name)
+    if isinstance(array, DataArray):
+        return array.addref()
+    return None
+
+
+def obs_data_array_release(array):
+    if array is not None:
+        array.release()
+
+
+# Sources
+
+def obs_get_source_by_name(name):
+    source = sources.get(name)
+    return source.addref() if source is not None else None
+
+
+def obs_source_release(source):
+    if source is not None:
+        source.release()
+
+
+def obs_source_get_name(source):
+    return source.name
+
+
+def obs_source_get_id(source):
+    return source.id
+
+
+def obs_source_get_width(source):
+    return source.width
+
+
+def obs_source_get_height(source):
+    return source.height
+
+
+def obs_source_get_settings(source):
+    return source.settings.addref()
+
+
+def obs_source_update(source, settings):
+    if settings is not source.settings:
+        source.settings.values.update(settings.values)
+    if update_hook is not None:
+        update_hook(source)
+
+
+def obs_source_get_signal_handler(source):
+    return source.signals
+
+
+def obs_source_create_private(source_id, name, settings):
+    return Source(source_id, name,
+                  settings.values if settings is not None else None,
+                  private=True)
+
+
+def obs_source_get_filter_by_name(source, name):
+    if source is None:
+        return None
+    for source_filter in source.filters:
+        if source_filter.name == name:
+            return source_filter.addref()
+    return None
+
+
+def obs_source_filter_add(source, source_filter):
+    source_filter.addref()
+    source_filter.parent = source
+    source.filters.append(source_filter)
+    source.signals.emit("filter_add", source=source, filter=source_filter)
+
+
+def obs_source_filter_remove(source, source_filter):
+    if source_filter in source.filters:
+        source.filters.remove(source_filter)
+        source.signals.emit("filter_remove", source=source,
+                            filter=source_filter)
+        source_filter.release()
+
+
+def obs_enum_sources():
+    return [source.addref() for source in sources.values()
+            if source.id != "scene"]
+
+
+def source_list_release(source_list):
+    for source in source_list:
+        if not isinstance(source, Source):
+            raise TypeError(
+                f"in method 'source_list_release', expected obs_source_t, "
+                f"got {type(source).__name__}")
+        source.release()
+
+
+# Signals
+
+def signal_handler_connect(handler, signal, callback):
+    handler.connect(signal, callback)
+
+
+def signal_handler_disconnect(handler, signal, callback):
+    handler.disconnect(signal, callback)
+
+
+def calldata_source(calldata, name):
+    return calldata.get(name)
+
+
+def calldata_string(calldata, name):
+    return calldata.get(name)
+
+
+# Scenes
+
+def obs_frontend_get_current_scene():
+    return current_scene.addref() if current_scene is not None else None
+
+
+def obs_scene_from_source(source):
+    return getattr(source, "scene", None) if source is not None else None
+
+
+def obs_scene_get_source(scene):
+    return scene.source
+
+
+def obs_scene_release(scene):
+    if scene is not None:
+        scene.source.release()
+
+
+def obs_scene_sceneitem_from_source(scene, source):
+    for item in scene.items:
+        if item.source is source:
+            return item.addref()
+    return None
+
+
+def obs_sceneitem_release(item):
+    if item is not None:
+        item.release()
+
+
+def sceneitem_list_release(items):
+    for item in items:
+        obs_sceneitem_release(item)
+
+
+def obs_sceneitem_get_bounds_type(item):
+    return item.bounds_type
+
+
+def obs_sceneitem_set_bounds_type(item, bounds_type):
+    item.bounds_type = bounds_type
+
+
+def obs_sceneitem_set_bounds_alignment(item, alignment):
+    item.bounds_alignment = alignment
+
+
+def obs_sceneitem_set_bounds(item, bounds):
+    item.bounds.x, item.bounds.y = bounds.x, bounds.y
+
+
+def obs_sceneitem_get_bounds(item, bounds):
+    bounds.x, bounds.y = item.bounds.x, item.bounds.y
+
+
+def obs_sceneitem_set_crop(item, crop):
+    item.crop.left, item.crop.top = crop.left, crop.top
+    item.crop.right, item.crop.bottom = crop.right, crop.bottom
+    if update_hook is not None:
+        update_hook(item)
+
+
+def obs_sceneitem_get_crop(item, crop):
+    crop.left, crop.top = item.crop.left, item.crop.top
+    crop.right, crop.bottom = item.crop.right, item.crop.bottom
+
+
+def obs_sceneitem_set_pos(item, pos):
+    item.pos.x, item.pos.y = pos.x, pos.y
+
+
+def obs_sceneitem_get_pos(item, pos):
+    pos.x, pos.y = item.pos.x, item.pos.y
+
+
+def obs_sceneitem_get_alignment(item):
+    return item.alignment
+
+
+def obs_sceneitem_defer_update_begin(item):
+    pass
+
+
+def obs_sceneitem_defer_update_end(item):
+    pass
+
+
+# Frontend
+
+def obs_frontend_add_event_callback(callback):
+    frontend_callbacks.append(callback)
+
+
+def obs_frontend_remove_event_callback(callback):
+    if callback in frontend_callbacks:
+        frontend_callbacks.remove(callback)
+
+
+# Timers
+
+def timer_add(callback, interval_ms):
+    timers.append({"callback": callback,
+                   "interval": int(interval_ms) * 1000000,
+                   "last_ts": video_time_ns})
+
+
+def timer_remove(callback):
+    for timer in list(timers):
+        if timer["callback"] == callback:
+            timers.remove(timer)
+
+
+def remove_current_callback():
+    if current_timer is not None and current_timer in timers:
+        timers.remove(current_timer)
+
+
+# Hotkeys
+
+def obs_hotkey_register_frontend(name, description, callback):
+    global next_hotkey_id
+    hotkey_id = next_hotkey_id
+    next_hotkey_id += 1
+    hotkeys[hotkey_id] = {"name": name, "description": description,
+                          "callback": callback}
+    return hotkey_id
+
+
+def obs_hotkey_unregister(hotkey):
+    for hotkey_id, registered in list(hotkeys.items()):
+        if hotkey_id == hotkey or registered["callback"] == hotkey:
+            del hotkeys[hotkey_id]
+
+
+def obs_hotkey_load(hotkey_id, array):
+    pass
+
+
+def obs_hotkey_save(hotkey_id):
+    return DataArray()
+
+
+# Properties
+
+def obs_properties_create():
+    return Properties()
+
+
+def obs_properties_add_list(props, name, description, combo_type, combo_format):
+    return props.add(Property(name, description, "list"))
+
+
+def obs_properties_add_button(props, name, description, callback):
+    prop = props.add(Property(name, description, "button"))
+    prop.callback = callback
+    return prop
+
+
+def obs_properties_add_bool(props, name, description):
+    return props.add(Property(name, description, "bool"))
+
+
+def obs_properties_add_int(props, name, description, minimum, maximum, step):
+    return props.add(Property(name, description, "int"))
+
+
+def obs_properties_add_int_slider(props, name, description, minimum, maximum,
+                                  step):
+    return props.add(Property(name, description, "int"))
+
+
+def obs_properties_add_float_slider(props, name, description, minimum,
+                                    maximum, step):
+    return props.add(Property(name, description, "float"))
+
+
+def obs_properties_add_text(props, name, description, text_type):
+    return props.add(Property(name, description, "text"))
+
+
+def obs_properties_add_group(props, name, description, group_type, group):
+    prop = props.add(Property(name, description, "group"))
+    prop.group = group
+    return prop
+
+
+def obs_properties_remove_by_name(props, name):
+    props.properties.pop(name, None)
+
+
+def obs_properties_get(props, name):
+    """
+    Like OBS, also finds properties inside groups
+    """
+    prop = props.properties.get(name)
+    if prop is None:
+        for group in props.properties.values():
+            if group.group is not None:
+                prop = obs_properties_get(group.group, name)
+                if prop is not None:
+                    break
+    return prop
+
+
+def obs_property_name(prop):
+    return prop.name
+
+
+def obs_property_set_visible(prop, visible):
+    if prop is not None:
+        prop.visible = bool(visible)
+
+
+def obs_property_visible(prop):
+    return prop.visible if prop is not None else False
+
+
+def obs_property_set_description(prop, description):
+    prop.description = description
+
+
+def obs_property_set_modified_callback(prop, callback):
+    prop.callback = callback
+
+
+def obs_property_list_clear(prop):
+    prop.items.clear()
+
+
+def obs_property_list_add_string(prop, name, value):
+    prop.items.append((name, value))
+
+
+def obs_property_list_add_int(prop, name, value):
+    prop.items.append((name, value))
+
+
+# -------------------------------------------------------------------
+# Count every OBS API call made by the script
+
+def _counted(name, function):
+    def call(*args, **kwargs):
+        calls[name] += 1
+        return function(*args, **kwargs)
+    call.__name__ = name
+    return call
+
+
+for _name, _value in list(globals().items()):
+    if callable(_value) and not isinstance(_value, type) \
+            and _name.startswith(("obs_", "timer_", "remove_current",
+                                  "signal_", "calldata_", "source_list",
+                                  "sceneitem_list")):
+        globals()[_name] = _counted(_name, _value)
+
+reset()
@@ -0,0 +1,110 @@
+"""
+Stand-in for PyMonCtl.
+
+Monitors and the cursor position are set by the harness. Plug and change
+listeners are called synchronously from set_monitors(), where PyMonCtl
+would call them from its watchdog thread.
+"""
+from collections import Counter, namedtuple
+from time import sleep
+
+Point = namedtuple("Point", "x y")
+Size = namedtuple("Size", "width height")
+Rect = namedtuple("Rect", "left top right bottom")
+
+calls = Counter()
+cursor = Point(0, 0)
+monitors = {}
+plug_listeners = []
+change_listeners = []
+update_info = False
+# Simulated cost of enumerating the monitors (s)
+enum_delay = 0.0
+
+
+def reset():
+    global cursor, monitors, update_info, enum_delay
+    calls.clear()
+    cursor = Point(0, 0)
+    monitors = {}
+    update_info = False
+    enum_delay = 0.0
+    plug_listeners.clear()
+    change_listeners.clear()
+
+
+def monitor_info(monitor_id, x, y, width, height, scale=100, dpi=(96, 96)):
+    return {
+        "system_name": f"Monitor {monitor_id}",
+        "id": monitor_id,
+        "is_primary": monitor_id == 0,
+        "position": Point(x, y),
+        "size": Size(width, height),
+        "workarea": Rect(x, y, x + width, y + height),
+        "scale": (scale, scale),
+        "dpi": dpi,
+        "orientation": 0,
+        "frequency": 60.0,
+        "colordepth": 32,
+    }
+
+
+def set_monitors(geometries):
+    """
+    Replaces the connected monitors and notifies the listeners
+
+    :param geometries: List of (x, y, width, height)
+    """
+    global monitors
+    old_names = set(monitors)
+    monitors = {f"Monitor {i}": monitor_info(i, *geometry)
+                for i, geometry in enumerate(geometries)}
+    if not update_info:
+        return
+    names = sorted(old_names ^ set(monitors))
+    if names:
+        for listener in list(plug_listeners):
+            listener(names, dict(monitors))
+    else:
+        for listener in list(change_listeners):
+            listener(list(monitors), dict(monitors))
+
+
+def getMousePos():
+    calls["getMousePos"] += 1
+    return cursor
+
+
+def getAllMonitorsDict():
+    calls["getAllMonitorsDict"] += 1
+    if enum_delay:
+        sleep(enum_delay)
+    return dict(monitors)
+
+
+def enableUpdateInfo():
+    global update_info
+    update_info = True
+
+
+def disableUpdateInfo():
+    global update_info
+    update_info = False
+
+
+def plugListenerRegister(callback):
+    plug_listeners.append(callback)
+
+
+def plugListenerUnregister(callback):
+    if callback in plug_listeners:
+        plug_listeners.remove(callback)
+
+
+def changeListenerRegister(callback):
+    change_listeners.append(callback)
+
+
+def changeListenerUnregister(callback):
+    if callback in change_listeners:
+        change_listeners.remove(callback)
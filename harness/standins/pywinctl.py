@@ -0,0 +1,132 @@
+"""
+Stand-in for PyWinCtl.
+
+Windows are plain records registered by the harness and keyed by handle.
+Watchdog callbacks are called synchronously from move_window(),
+set_window_title() and close_window(), where PyWinCtl would call them from
+the watchdog thread of the window.
+"""
+from collections import Counter, namedtuple
+from time import sleep
+
+Rect = namedtuple("Rect", "left top right bottom")
+Point = namedtuple("Point", "x y")
+Size = namedtuple("Size", "width height")
+
+calls = Counter()
+windows = {}
+watchdogs = []
+# Simulated cost of enumerating the windows (s)
+enum_delay = 0.0
+
+
+def reset():
+    global enum_delay
+    calls.clear()
+    windows.clear()
+    watchdogs.clear()
+    enum_delay = 0.0
+
+
+def add_window(handle, title, rect, app="app.exe"):
+    """
+    :param rect: (left, top, right, bottom) of the client area
+    """
+    windows[handle] = {"title": title, "rect": Rect(*rect), "app": app}
+
+
+def move_window(handle, rect):
+    """
+    :param rect: New (left, top, right, bottom) of the client area
+    """
+    old = windows[handle]["rect"]
+    rect = windows[handle]["rect"] = Rect(*rect)
+    for watchdog in [w for w in watchdogs if w.handle == handle]:
+        if (rect.left, rect.top) != (old.left, old.top) and watchdog.moved:
+            watchdog.moved(Point(rect.left, rect.top))
+        if (rect.right - rect.left, rect.bottom - rect.top) \
+                != (old.right - old.left, old.bottom - old.top) \
+                and watchdog.resized:
+            watchdog.resized(Size(rect.right - rect.left,
+                                  rect.bottom - rect.top))
+
+
+def set_window_title(handle, title):
+    windows[handle]["title"] = title
+    for watchdog in [w for w in watchdogs if w.handle == handle]:
+        if watchdog.title_changed:
+            watchdog.title_changed(title)
+
+
+def close_window(handle):
+    windows.pop(handle, None)
+    for watchdog in [w for w in watchdogs if w.handle == handle]:
+        watchdog.stop()
+        if watchdog.alive:
+            watchdog.alive(False)
+
+
+class Watchdog:
+    def __init__(self, handle):
+        self.handle = handle
+        self.alive = self.moved = self.resized = self.title_changed = None
+
+    def start(self, isAliveCB=None, isActiveCB=None, isVisibleCB=None,
+              isMinimizedCB=None, isMaximizedCB=None, resizedCB=None,
+              movedCB=None, changedTitleCB=None, changedDisplayCB=None,
+              interval=0.3):
+        calls["watchdog.start"] += 1
+        self.alive, self.moved = isAliveCB, movedCB
+        self.resized, self.title_changed = resizedCB, changedTitleCB
+        if self not in watchdogs:
+            watchdogs.append(self)
+
+    def stop(self):
+        if self in watchdogs:
+            watchdogs.remove(self)
+
+    def isAlive(self):
+        return self in watchdogs
+
+
+class Window:
+    def __init__(self, handle):
+        calls["Window"] += 1
+        if handle not in windows:
+            raise ValueError(f"Invalid window handle {handle}")
+        self._handle = handle
+        self.watchdog = Watchdog(handle)
+
+    def getHandle(self):
+        return self._handle
+
+    @property
+    def title(self):
+        calls["title"] += 1
+        record = windows.get(self._handle)
+        return record["title"] if record else ""
+
+    @property
+    def isAlive(self):
+        return self._handle in windows
+
+    def getAppName(self):
+        calls["getAppName"] += 1
+        return windows[self._handle]["app"]
+
+    def getClientFrame(self):
+        calls["getClientFrame"] += 1
+        return windows[self._handle]["rect"]
+
+
+def getAllWindows():
+    calls["getAllWindows"] += 1
+    if enum_delay:
+        sleep(enum_delay)
+    return [Window(handle) for handle in windows]
+
+
+def getWindowsWithTitle(title):
+    calls["getWindowsWithTitle"] += 1
+    return [Window(handle) for handle, record in windows.items()
+            if record["title"] == title]
@@ -0,0 +1,654 @@
+"""
+Offline zoom/follow trajectory engine for recorded cursor traces.
+
+Computes the crop rectangles CursorWindow.follow() and set_crop() produce
+for a recorded session, frame by frame and without OBS, for post
+production or to try many parameter sets. The result matches a harness
+replay of the trace with "Idle Suspend" off, with a monitor source at the
+canvas origin and a monitor scale of 1; `--verify` checks that.
+
+The per-frame state is a recurrence in time, so frames cannot be computed
+independently. The work is split by what depends on what:
+
+- The zoom/follow state machine (hotkeys, zoom progress, easing, when the
+  target ticks) only depends on the events and zoom_time. It is run per
+  event, and the steady stretches between events are filled as slices.
+- The zoom window target only moves when the cursor leaves the active
+  zone, and is then clamped to the source. Each frame is a clamp of the
+  previous target, and clamps compose into clamps, so the targets of all
+  frames come from a parallel prefix scan over NumPy arrays.
+- Smoothing, the max speed clamp and the dead band are truly sequential.
+  They run in a tight loop over the ticking frames: scalar for a single
+  parameter set, or over arrays of parameter sets when there are many.
+
+NumPy is only needed here, not by the script.
+"""
+from itertools import product
+from math import sqrt
+from time import perf_counter
+import argparse
+import csv
+import json
+
+try:
+    import numpy as np
+except ImportError:  # Optional, only the engine needs it
+    np = None
+
+from .simulation import import_script
+
+# The trace format and the easing come from the script itself, so they
+# cannot drift apart from what it records and applies
+script = import_script()
+TRACE_MAGIC = script.TRACE_MAGIC
+TRACE_VERSION = script.TRACE_VERSION
+TRACE_HEADER = script.TRACE_HEADER
+TRACE_EVENT_ZOOM = script.TRACE_EVENT_ZOOM
+TRACE_EVENT_FOLLOW = script.TRACE_EVENT_FOLLOW
+TRACE_EVENT_GAP = script.TRACE_EVENT_GAP
+cubic_in_out = script.CursorWindow.cubic_in_out
+
+# Setting names as used by the script and the harness --set option
+PARAMETERS = {
+    "Width": ("zoom_w", 1280),
+    "Height": ("zoom_h", 720),
+    "Border": ("active_border", 0.15),
+    "Speed": ("max_speed", 160),
+    "Smooth": ("smooth", 1.0),
+    "Zoom": ("zoom_time", 300.0),
+    "Dead Band": ("dead_band", 0.0),
+}
+
+MODE_NONE = 0   # no tick, crop unchanged
+MODE_FULL = 1   # zoomed out, full source
+MODE_IN = 2     # zooming in
+MODE_OUT = 3    # zooming out
+MODE_STEADY = 4 # zoomed in
+
+# Vectorize the smoothing loop over parameter sets from this many on. The
+# batch loop still steps frame by frame, and below about a hundred sets the
+# per-frame NumPy call overhead costs more than the scalar loops it replaces
+BATCH_MIN = 128
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("The trajectory engine requires NumPy: "
+                           "pip install numpy")
+
+
+class Session:
+    """
+    A cursor trace resampled to video frames the way harness.replay() plays
+    it: records apply after every frame whose time is at or before theirs,
+    and a second of frames follows the last record.
+
+    :param file_path: Cursor trace written by the script
+    :param fps: Video frame rate
+    :param tail_frames: Frames after the last record, defaults to a second
+    """
+    def __init__(self, file_path, fps=60, tail_frames=None):
+        require_numpy()
+        with open(file_path, "rb") as f:
+            data = f.read()
+        magic, version, width, start, x0, y0 = TRACE_HEADER.unpack_from(data)
+        if magic != TRACE_MAGIC or version != TRACE_VERSION or width != 3:
+            raise ValueError(f"{file_path} is not a cursor trace")
+        records = np.frombuffer(data, dtype="<i4",
+                                offset=TRACE_HEADER.size).reshape(-1, 3)
+
+        event = records[:, 0] < 0
+        dt = np.where(event, records[:, 1], records[:, 0]).astype(np.int64)
+        t = np.cumsum(dt) / 1000000
+        x = x0 + np.cumsum(np.where(event, 0, records[:, 1]).astype(np.int64))
+        y = y0 + np.cumsum(np.where(event, 0, records[:, 2]).astype(np.int64))
+
+        frame_interval_ns = int(round(1e9 / fps))
+        interval = frame_interval_ns / 1e9
+        self.fps = fps
+        self.refresh_rate = frame_interval_ns / 1000000
+        if tail_frames is None:
+            tail_frames = int(round(1 / interval))
+        last = float(t[-1]) if len(t) else 0.0
+        # Frame times accumulated like the replay loop does
+        count = int(last / interval) + 2
+        frame_times = np.cumsum(np.full(count, interval))
+        # Number of frames run before each record is applied
+        before = np.searchsorted(frame_times, t, side="right")
+        self.frames = int(before[-1]) + tail_frames if len(t) else tail_frames
+        self.frame_times = np.cumsum(np.full(self.frames, interval))
+        # Script clock, advanced like the harness VirtualClock
+        self.clock = np.cumsum(np.concatenate(([1000.0],
+                                               np.full(self.frames, interval))))[1:]
+
+        # Cursor at every frame: the last sample applied before it
+        samples = np.flatnonzero(~event)
+        sample_before = before[samples]
+        index = np.searchsorted(sample_before, np.arange(self.frames),
+                                side="right") - 1
+        self.cursor_x = np.where(index >= 0, x[samples][np.maximum(index, 0)], 0)
+        self.cursor_y = np.where(index >= 0, y[samples][np.maximum(index, 0)], 0)
+
+        # Pressed hotkeys of the first target, with the cursor at the time
+        self.events = []
+        for i in np.flatnonzero(event):
+            code, value = -int(records[i, 0]), int(records[i, 2])
+            # Gap records only advance the time
+            if code == TRACE_EVENT_GAP or not value & 1 or value >> 1:
+                continue
+            sample = np.searchsorted(samples, i) - 1
+            cursor = (int(x[samples[sample]]), int(y[samples[sample]])) \
+                if sample >= 0 else (0, 0)
+            self.events.append((int(before[i]), code, cursor))
+        self.records = len(records)
+
+
+def control(session, params, source):
+    """
+    Runs the zoom/follow state machine of toggle_zoom(), toggle_follow(),
+    tracking() and set_crop() for one parameter set
+
+    :return: Dictionary of per-frame arrays: tick, follow, update (the flag
+        follow() sees), mode, ease, and the center-on-cursor events
+    """
+    n = session.frames
+    source_w, source_h = source
+    tick = np.zeros(n, bool)
+    follow = np.zeros(n, bool)
+    update_seen = np.zeros(n, bool)
+    mode = np.zeros(n, np.int8)
+    ease = np.zeros(n)
+    centers = {}
+
+    lock, track, update = False, True, True
+    progress, ticking, last = 0.0, False, None
+    x_max = source_w - params["zoom_w"]
+    y_max = source_h - params["zoom_h"]
+    zoom_time = params["zoom_time"]
+    events = session.events
+    event = 0
+    i = 0
+    while i < n:
+        while event < len(events) and events[event][0] <= i:
+            _, code, (mouse_x, mouse_y) = events[event]
+            event += 1
+            enable = False
+            if code == TRACE_EVENT_ZOOM:
+                if not lock:
+                    target_x = max(0, min(mouse_x - params["zoom_w"] * 0.5,
+                                          x_max))
+                    target_y = max(0, min(mouse_y - params["zoom_h"] * 0.5,
+                                          y_max))
+                    centers[i] = (target_x, target_y, progress == 0)
+                    lock = enable = True
+                else:
+                    lock, enable = False, True
+            elif code == TRACE_EVENT_FOLLOW:
+                track = not track
+                enable = track and lock
+            if enable and not ticking:
+                ticking, last = True, None
+        following = lock and (track or update)
+        next_event = events[event][0] if event < len(events) else n
+        if not ticking:
+            i = max(i + 1, next_event)
+            continue
+        if lock and track and progress >= 1 and not update:
+            # Zoomed in and following: nothing but the cursor changes
+            # until the next event
+            end = max(i + 1, min(next_event, n))
+            tick[i:end] = follow[i:end] = True
+            mode[i:end] = MODE_STEADY
+            last = end - 1
+            i = end
+            continue
+
+        tick[i] = True
+        follow[i] = following
+        update_seen[i] = update
+        elapsed = session.refresh_rate if last is None \
+            else (session.clock[i] - session.clock[last]) * 1000
+        last = i
+        step = elapsed / zoom_time if zoom_time > 0 else 1.0
+        if not lock:
+            if progress > 0:
+                progress = max(0.0, progress - step)
+                ease[i] = cubic_in_out(1 - progress)
+                mode[i] = MODE_OUT
+                update = True
+            else:
+                mode[i] = MODE_FULL
+                update = False
+        else:
+            if progress < 1:
+                progress = min(1.0, progress + step)
+                ease[i] = time = cubic_in_out(progress)
+                mode[i] = MODE_IN
+                update = True if time < 0.8 else False
+            else:
+                mode[i] = MODE_STEADY
+                update = False
+        if ((not lock) and (progress <= 0)) \
+                or (lock and (not track) and (progress >= 1)):
+            ticking = False
+        i += 1
+    return {"tick": tick, "follow": follow, "update": update_seen,
+            "mode": mode, "ease": ease, "centers": centers}
+
+
+def scan_clamps(low, high):
+    """
+    Inclusive prefix composition of the clamps x -> max(low, min(x, high))
+    along axis 0, in place, by recursive doubling
+
+    Composing clamp f and then clamp g gives the clamp with the bounds
+    g(low_f) and g(high_f), so the composition is again a clamp.
+    """
+    shift = 1
+    while shift < len(low):
+        earlier_low, earlier_high = low[:-shift], high[:-shift]
+        later_low, later_high = low[shift:], high[shift:]
+        new_low = np.maximum(later_low, np.minimum(earlier_low, later_high))
+        new_high = np.maximum(later_low, np.minimum(earlier_high, later_high))
+        low[shift:] = new_low
+        high[shift:] = new_high
+        shift *= 2
+    return low, high
+
+
+def targets(session, states, params_list, source):
+    """
+    Zoom window target of every frame and parameter set, from the clamps
+    follow(), check_pos() and center_on_cursor() apply to it
+
+    :return: Arrays of shape (frames, sets) of the x and y target, and of
+        whether follow() moved the zoom window in that frame
+    """
+    n, sets = session.frames, len(params_list)
+    source_w, source_h = source
+    mouse_x = session.cursor_x[:, None].astype(float)
+    mouse_y = session.cursor_y[:, None].astype(float)
+    outside = (((session.cursor_x > source_w) | (session.cursor_x < 0))
+               & ((session.cursor_y > source_h) | (session.cursor_y < 0)))
+
+    follows = np.stack([state["follow"] for state in states], axis=1) \
+        & ~outside[:, None]
+    zoom_w = np.array([p["zoom_w"] for p in params_list], float)
+    zoom_h = np.array([p["zoom_h"] for p in params_list], float)
+    border = np.array([p["active_border"] for p in params_list])
+    lazy = border < 0.5
+    border_size = np.array([int(min(p["zoom_w"], p["zoom_h"])
+                                * p["active_border"]) for p in params_list], float)
+
+    result = []
+    for mouse, zoom_size, source_size in ((mouse_x, zoom_w, source_w),
+                                          (mouse_y, zoom_h, source_h)):
+        low = np.full((n, sets), -np.inf)
+        high = np.full((n, sets), np.inf)
+        for column, state in enumerate(states):
+            for frame, center in state["centers"].items():
+                value = center[0] if zoom_size is zoom_w else center[1]
+                low[frame, column] = high[frame, column] = value
+        # Keep the cursor inside the active zone: clamp to
+        # [mouse - size + border, mouse - border], then to the source
+        zone_low = np.where(lazy, mouse - zoom_size + border_size,
+                            mouse - np.trunc(zoom_size * 0.5))
+        zone_high = np.where(lazy, mouse - border_size,
+                             mouse - np.trunc(zoom_size * 0.5))
+        limit = source_size - zoom_size
+        zone_low = np.where(lazy, np.maximum(0, np.minimum(zone_low, limit)),
+                            zone_low)
+        zone_high = np.where(lazy, np.maximum(0, np.minimum(zone_high, limit)),
+                             zone_high)
+        follow_low = np.maximum(zone_low, np.minimum(low, zone_high))
+        follow_high = np.maximum(zone_low, np.minimum(high, zone_high))
+        low = np.where(follows, follow_low, low)
+        high = np.where(follows, follow_high, high)
+        low, high = scan_clamps(low, high)
+        # The zoom window target starts at 0
+        result.append(np.maximum(low, np.minimum(0.0, high)))
+    return result[0], result[1], follows
+
+
+def smooth_scalar(session, state, params, target_x, target_y, follows):
+    """
+    Smoothing, max speed clamp and dead band of follow() and set_crop() for
+    a single parameter set
+
+    :return: Arrays of the zoom window position and of the applied crop
+        position per frame
+    """
+    n = session.frames
+    zoom_x = np.zeros(n)
+    zoom_y = np.zeros(n)
+    crop_x = np.zeros(n)
+    crop_y = np.zeros(n)
+    frames = np.flatnonzero(state["tick"]).tolist()
+    tx, ty = target_x.tolist(), target_y.tolist()
+    following = follows.tolist()
+    update = state["update"].tolist()
+    mode = state["mode"].tolist()
+    centers = state["centers"]
+    lazy = params["active_border"] < 0.5
+    smooth_factor = max(1.0, params["smooth"] * 40 / session.refresh_rate)
+    max_speed = params["max_speed"]
+    max_speed_squared = max_speed * max_speed
+    dead_band = params["dead_band"]
+    x = y = cx = cy = 0.0
+    out_x, out_y, out_cx, out_cy = [], [], [], []
+    for i in frames:
+        center = centers.get(i)
+        if center is not None and center[2]:
+            x, y = center[0], center[1]
+        if following[i]:
+            updating = update[i]
+            factor = 1.0 if updating else smooth_factor
+            offset_x = (tx[i] - x) / factor
+            offset_y = (ty[i] - y) / factor
+            if (not updating) or lazy:
+                speed_squared = (offset_x * offset_x) + (offset_y * offset_y)
+                if speed_squared > max_speed_squared:
+                    speed_factor = max_speed / sqrt(speed_squared)
+                    offset_x *= speed_factor
+                    offset_y *= speed_factor
+            x += offset_x
+            y += offset_y
+        frame_mode = mode[i]
+        if frame_mode == MODE_STEADY:
+            if abs(x - cx) > dead_band:
+                cx = x
+            if abs(y - cy) > dead_band:
+                cy = y
+        elif frame_mode != MODE_FULL:
+            cx, cy = x, y
+        out_x.append(x)
+        out_y.append(y)
+        out_cx.append(cx)
+        out_cy.append(cy)
+    zoom_x[frames], zoom_y[frames] = out_x, out_y
+    crop_x[frames], crop_y[frames] = out_cx, out_cy
+    return zoom_x, zoom_y, crop_x, crop_y
+
+
+def smooth_batch(session, states, params_list, target_x, target_y, follows):
+    """
+    smooth_scalar() for many parameter sets at once: the loop runs over the
+    frames, with the parameter sets as NumPy arrays
+
+    :return: Arrays of shape (frames, sets)
+    """
+    n, sets = session.frames, len(params_list)
+    tick = np.stack([state["tick"] for state in states], axis=1)
+    update = np.stack([state["update"] for state in states], axis=1)
+    mode = np.stack([state["mode"] for state in states], axis=1)
+    snap = np.zeros((n, sets), bool)
+    snap_x = np.zeros((n, sets))
+    snap_y = np.zeros((n, sets))
+    for column, state in enumerate(states):
+        for frame, (x, y, snapped) in state["centers"].items():
+            if snapped:
+                snap[frame, column] = True
+                snap_x[frame, column], snap_y[frame, column] = x, y
+    lazy = np.array([p["active_border"] < 0.5 for p in params_list])
+    smooth_factor = np.array([max(1.0, p["smooth"] * 40 / session.refresh_rate)
+                              for p in params_list])
+    max_speed = np.array([p["max_speed"] for p in params_list], float)
+    max_speed_squared = max_speed * max_speed
+    dead_band = np.array([p["dead_band"] for p in params_list], float)
+
+    zoom_x = np.zeros((n, sets))
+    zoom_y = np.zeros((n, sets))
+    crop_x = np.zeros((n, sets))
+    crop_y = np.zeros((n, sets))
+    x = np.zeros(sets)
+    y = np.zeros(sets)
+    cx = np.zeros(sets)
+    cy = np.zeros(sets)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i in np.flatnonzero(tick.any(axis=1)):
+            x = np.where(snap[i], snap_x[i], x)
+            y = np.where(snap[i], snap_y[i], y)
+            updating = update[i]
+            factor = np.where(updating, 1.0, smooth_factor)
+            offset_x = (target_x[i] - x) / factor
+            offset_y = (target_y[i] - y) / factor
+            speed_squared = (offset_x * offset_x) + (offset_y * offset_y)
+            clamp = (~updating | lazy) & (speed_squared > max_speed_squared)
+            speed_factor = np.where(clamp, max_speed / np.sqrt(speed_squared), 1.0)
+            moving = follows[i]
+            x = np.where(moving, x + offset_x * speed_factor, x)
+            y = np.where(moving, y + offset_y * speed_factor, y)
+            steady = mode[i] == MODE_STEADY
+            animating = tick[i] & ~steady & (mode[i] != MODE_FULL)
+            cx = np.where(animating | (steady & (np.abs(x - cx) > dead_band)), x, cx)
+            cy = np.where(animating | (steady & (np.abs(y - cy) > dead_band)), y, cy)
+            zoom_x[i], zoom_y[i], crop_x[i], crop_y[i] = x, y, cx, cy
+    return zoom_x, zoom_y, crop_x, crop_y
+
+
+def crops(session, state, params, source, crop_x, crop_y):
+    """
+    Crop rectangles set_crop() passes on, and the keyframes where the
+    applied (whole pixel) crop changes
+
+    :return: Tuple of the float left/top array, the integer rectangle array
+        of shape (frames, 4) and the keyframe indices
+    """
+    source_w, source_h = source
+    zoom_w, zoom_h = params["zoom_w"], params["zoom_h"]
+    mode, ease = state["mode"], state["ease"]
+    zooming_in = mode == MODE_IN
+    zooming_out = mode == MODE_OUT
+    steady = mode == MODE_STEADY
+    left = np.select([zooming_in, zooming_out, steady],
+                     [ease * crop_x, (1 - ease) * crop_x, crop_x], 0.0)
+    top = np.select([zooming_in, zooming_out, steady],
+                    [ease * crop_y, (1 - ease) * crop_y, crop_y], 0.0)
+    width = np.select(
+        [zooming_in, zooming_out, steady],
+        [source_w - np.trunc(ease * (source_w - zoom_w)),
+         zoom_w + np.trunc(ease * (source_w - zoom_w)),
+         np.full_like(ease, int(zoom_w))], source_w)
+    height = np.select(
+        [zooming_in, zooming_out, steady],
+        [source_h - np.trunc(ease * (source_h - zoom_h)),
+         zoom_h + np.trunc(ease * (source_h - zoom_h)),
+         np.full_like(ease, int(zoom_h))], source_h)
+    rect = np.trunc(np.stack([left, top, width, height], axis=1)).astype(np.int64)
+
+    # Frames without a tick keep the last applied crop
+    ticks = np.flatnonzero(state["tick"])
+    if len(ticks) == 0:
+        return np.stack([left, top], axis=1), rect, ticks
+    changed = np.ones(len(ticks), bool)
+    changed[1:] = np.any(rect[ticks[1:]] != rect[ticks[:-1]], axis=1)
+    return np.stack([left, top], axis=1), rect, ticks[changed]
+
+
+def run(session, params_list, source, batch=None):
+    """
+    Computes the trajectories of all parameter sets
+
+    :param params_list: List of parameter dictionaries, see PARAMETERS
+    :param source: (width, height) of the zoomed monitor source
+    :param batch: Vectorize the smoothing loop over the parameter sets;
+        by default when there are at least BATCH_MIN of them
+    :return: List of result dictionaries with the keyframes and stats
+    """
+    start = perf_counter()
+    states = [control(session, params, source) for params in params_list]
+    target_x, target_y, follows = targets(session, states, params_list, source)
+    if batch is None:
+        batch = len(params_list) >= BATCH_MIN
+    if batch:
+        smoothed = smooth_batch(session, states, params_list,
+                                target_x, target_y, follows)
+    results = []
+    for column, (params, state) in enumerate(zip(params_list, states)):
+        if batch:
+            zoom_x, zoom_y, crop_x, crop_y = (array[:, column]
+                                              for array in smoothed)
+        else:
+            zoom_x, zoom_y, crop_x, crop_y = smooth_scalar(
+                session, state, params, target_x[:, column],
+                target_y[:, column], follows[:, column])
+        positions, rect, keyframes = crops(session, state, params, source,
+                                           crop_x, crop_y)
+        zoomed = state["mode"] == MODE_STEADY
+        steps = np.hypot(np.diff(zoom_x[state["tick"]]),
+                         np.diff(zoom_y[state["tick"]]))
+        results.append({
+            "params": params,
+            "keyframes": keyframes,
+            "rect": rect,
+            "positions": positions,
+            "stats": {
+                "frames": session.frames,
+                "ticks": int(state["tick"].sum()),
+                "keyframes": int(len(keyframes)),
+                "zoomed_in_s": round(float(zoomed.sum()) / session.fps, 3),
+                "path_px": round(float(steps.sum()), 1),
+                "max_step_px": round(float(steps.max()), 2) if len(steps) else 0.0,
+            },
+        })
+    elapsed = perf_counter() - start
+    for result in results:
+        result["stats"]["compute_s"] = round(elapsed, 4)
+    return results
+
+
+def keyframe_rows(session, result, subpixel=False):
+    """
+    :return: List of [frame, time, left, top, width, height]; frames count
+        from 1 like Simulation.frame_index
+    """
+    rows = []
+    for i in result["keyframes"].tolist():
+        left, top, width, height = result["rect"][i].tolist()
+        if subpixel:
+            left, top = (round(value, 3) for value in result["positions"][i].tolist())
+        rows.append([i + 1, round(float(session.frame_times[i]), 6),
+                     left, top, width, height])
+    return rows
+
+
+def verify(trace_path, params, fps, canvas):
+    """
+    Replays the trace through the script in the harness and compares its
+    crop filter updates with the engine keyframes
+
+    :return: Tuple of (matching, number of harness updates, first mismatch)
+    """
+    from .simulation import Simulation
+    from .replay import replay
+
+    settings = {name: params[key] for name, (key, _) in PARAMETERS.items()}
+    settings["Idle Suspend"] = False
+    simulation = Simulation(fps=fps, canvas=canvas, settings=settings).load()
+    trace = simulation.script.CursorTrace(trace_path)
+    replay(simulation, trace)
+    trace.close()
+    simulation.unload()
+    expected = [list(crop) for crop in simulation.crops]
+
+    session = Session(trace_path, fps=fps)
+    result = run(session, [params], canvas)[0]
+    actual = [[row[0]] + row[2:] for row in keyframe_rows(session, result)]
+    for index, (a, b) in enumerate(zip(expected, actual)):
+        if a != b:
+            return False, len(expected), {"index": index, "harness": a,
+                                          "engine": b}
+    if len(expected) != len(actual):
+        return False, len(expected), {"harness": len(expected),
+                                      "engine": len(actual)}
+    return True, len(expected), None
+
+
+def size(value):
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.trajectory",
+        description="Compute the zoom/follow crop trajectory of a cursor "
+                    "trace offline")
+    parser.add_argument("trace", help="cursor trace recorded by the script")
+    parser.add_argument("--fps", type=float, default=60)
+    parser.add_argument("--canvas", type=size, default=(1920, 1080),
+                        help="size of the zoomed monitor source")
+    parser.add_argument("--set", action="append", default=[],
+                        metavar="NAME=JSON",
+                        help="setting, one of " + ", ".join(PARAMETERS))
+    parser.add_argument("--grid", action="append", default=[],
+                        metavar="NAME=V1,V2,...",
+                        help="try every combination of these setting values")
+    parser.add_argument("--keyframes", metavar="FILE",
+                        help="write the crop keyframes of the first parameter "
+                             "set as .csv or .json")
+    parser.add_argument("--subpixel", action="store_true",
+                        help="write fractional left/top positions")
+    parser.add_argument("--verify", action="store_true",
+                        help="compare with a harness replay of the trace")
+    parser.add_argument("--json", action="store_true",
+                        help="print the stats as JSON")
+    args = parser.parse_args(argv)
+    require_numpy()
+
+    base = {key: default for key, default in PARAMETERS.values()}
+    for item in args.set:
+        name, value = item.split("=", 1)
+        base[PARAMETERS[name][0]] = json.loads(value)
+    grid = []
+    for item in args.grid:
+        name, values = item.split("=", 1)
+        grid.append((PARAMETERS[name][0],
+                     [json.loads(value) for value in values.split(",")]))
+    params_list = [dict(base, **dict(zip([key for key, _ in grid], values)))
+                   for values in product(*[values for _, values in grid])]
+
+    start = perf_counter()
+    session = Session(args.trace, fps=args.fps)
+    load_s = perf_counter() - start
+    results = run(session, params_list, args.canvas)
+
+    if args.keyframes:
+        rows = keyframe_rows(session, results[0], args.subpixel)
+        with open(args.keyframes, "w", newline="") as f:
+            if args.keyframes.endswith(".json"):
+                json.dump(rows, f)
+            else:
+                writer = csv.writer(f)
+                writer.writerow(["frame", "time", "left", "top", "width",
+                                 "height"])
+                writer.writerows(rows)
+
+    report = {"records": session.records, "frames": session.frames,
+              "load_s": round(load_s, 4),
+              "sets": [dict(result["params"], **result["stats"])
+                       for result in results]}
+    if args.verify:
+        matching, updates, mismatch = verify(args.trace, params_list[0],
+                                             args.fps, args.canvas)
+        report["verify"] = {"matching": matching, "harness_updates": updates,
+                            "mismatch": mismatch}
+
+    if args.json:
+        print(json.dumps(report, indent=4))
+    else:
+        print(f"records {report['records']}  frames {report['frames']}  "
+              f"load {report['load_s']}s")
+        columns = [key for key, _ in PARAMETERS.values()] + \
+            ["ticks", "keyframes", "zoomed_in_s", "path_px", "max_step_px",
+             "compute_s"]
+        print("".join(f"{column:>14}" for column in columns))
+        for row in report["sets"]:
+            print("".join(f"{row[column]:>14}" for column in columns))
+        if "verify" in report:
+            print("verify " + json.dumps(report["verify"]))
+    return 0 if report.get("verify", {}).get("matching", True) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
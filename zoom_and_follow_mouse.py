@@ -1,12 +1,52 @@
-from inspect import ismethod, isfunction
 from math import sqrt
 from platform import system
-from os import makedirs, path
+from sys import byteorder
+from os import makedirs, path, replace
+from threading import Lock, Thread, current_thread
+from time import monotonic, perf_counter, sleep, strftime
+from array import array
+from collections import Counter, deque
+from contextlib import contextmanager
+from importlib import import_module
+from select import select
 import json
-import pywinctl as pwc
-import pymonctl as pmc
+import mmap
+import socket
+import struct
 import obspython as obs
 
+
+class LazyModule:
+    """
+    Stands in for a module that is imported on first attribute access.
+    PyWinCtl and PyMonCtl load their platform backends on import, which
+    would otherwise be paid on every OBS startup and script reload, even
+    when no zoom is ever used. Looked up attributes are cached on the
+    proxy, so later accesses cost the same as on the module.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.module = None
+        self.import_time = 0.0
+
+    def load(self):
+        if self.module is None:
+            start = perf_counter()
+            self.module = import_module(self.name)
+            self.import_time = perf_counter() - start
+            log("Imported %s in %.1f ms", self.name, self.import_time * 1000,
+                category="script")
+        return self.module
+
+    def __getattr__(self, name):
+        value = getattr(self.load(), name)
+        setattr(self, name, value)
+        return value
+
+
+pwc = LazyModule("pywinctl")
+pmc = LazyModule("pymonctl")
+
 version = "v.2023.09.14"
 debug = False
 sys= system()
@@ -15,9 +55,7 @@ cwd = path.dirname(path.realpath(__file__))
 file_name = path.basename(__file__).removesuffix(".py")
 settings_dir = "settings"
 settings_file_name = f"{file_name}.json"
-zoom_id_tog = None
-follow_id_tog = None
-new_source = True
+traces_dir = "traces"
 props = None
 
 ZOOM_NAME_TOG = f"{file_name}.zoom.toggle"
@@ -28,6 +66,15 @@ ZOOM_DESC_TOG = f"Enable/Disable Mouse Zoom ({file_name})"
 FOLLOW_DESC_TOG = f"Enable/Disable Mouse Follow ({file_name})"
 USE_MANUAL_MONITOR_SIZE = "Manual Monitor Size"
 CROP_FILTER_NAME = f"ZoomCrop_{file_name}"
+ZOOM_TARGETS_MAX = 4
+RENDER_FILTER = "filter"
+RENDER_SCENE_ITEM = "scene_item"
+SCHEDULE_TIMER = "timer"
+SCHEDULE_RENDER = "render"
+OBS_ALIGN_LEFT = 1
+OBS_ALIGN_RIGHT = 2
+OBS_ALIGN_TOP = 4
+OBS_ALIGN_BOTTOM = 8
 
 """
 This script is intended to be called from OBS Studio. Provides
@@ -41,88 +88,1280 @@ Set activation hotkey in Settings.\n
 Active Border enables lazy/smooth tracking; border size calculated as percent of smallest dimension. Border of 50% keeps mouse locked in the center of the zoom frame.\n
 Manual Monitor Dimensions constrain the zoom to just the area in the defined size; useful for restricting zooming to a small area in large format monitors.\n
 Manual Offset will move, relative to the top left of the monitor/source, the constrained zoom area. In the large format monitor example, this can be used to offset the constrained area to be on the right of the screen, preventing the zoom from following the cursor to the left side.\n
+Read Cursor With selects how the cursor position is read: PyMonCtl, or on Linux a persistent Xlib or XCB connection (python-xlib or xcffib installed) and on Windows GetCursorPos. The fastest available one is timed and picked on the first cursor read; the choice and its cost per call are logged and shown by Show tick profile.\n
+Sample cursor in background reads the cursor position on a separate thread at the given rate, so slow cursor queries do not delay frames.\n
+Receive cursor from network takes the cursor position from cursor_sender.py running on another computer, for streaming from a second PC; it listens for UDP packets on the given address and port and holds the last position when they stop arriving. The zoom source must still be a display, window or game capture; capture card and NDI sources are not supported.\n
+Record cursor trace stores cursor samples and hotkey presses in the settings/traces folder while enabled, for replaying sessions with the headless harness.\n
+Profile tick stages measures the time spent in each part of a frame update and the OBS calls it makes; Show tick profile prints the p50/p95/p99/max table to the script log.\n
+Debug logging is written by a background thread; Log Level and Log Categories (script, settings, zoom, window, monitor, sampler, trace, profile) filter it, and it can also be written to a rotating log file in the settings folder.\n
+Dead Band ignores zoom window movements smaller than the given number of pixels while zoomed in, so cursor jitter does not cause constant small crop updates.\n
+Suspend ticking while idle stops updating the zoom once it has settled and the cursor stands still, checking the cursor every frame with the background sampler or at the Idle Cursor Poll Interval without it, so without the sampler waking up can take up to that interval. It is off by default.\n
+Render Mode selects how the zoom is applied: a crop filter on the source, or the crop and transform of the source's item in the current scene. The scene item mode adds no filter render pass and positions the zoom with sub-pixel precision, but only affects the current scene.\n
+Window and game capture targets follow their window moving, resizing or being renamed while zoomed in; the window is watched in the background, so frames make no window queries.\n
+Update Zoom On selects what drives the zoom: a timer, or OBS's render tick, which runs exactly once per rendered frame with the real frame time.\n
+Predict cursor movement follows where the cursor is heading, Look Ahead ms ahead and at most Max Lead pixels past its position, to make up for the delay until the zoomed frame is shown; it falls back to the cursor position once the cursor stops.\n
+Zoom Targets sets how many sources this script zooms. Every target has its own source, settings, crop filter and hotkeys; all of them share one frame timer and cursor read.\n
 By tryptech
 {version}""")
 
-def get_cursor_position():
+def read_cursor_sample():
+    """
+    :return: Cursor (x, y, timestamp), with the monotonic time the position
+        was taken: when it was received or sampled in the background, or
+        now when it was read directly
+    """
     # macOS flips Y coordinate
     # return pmc._pymonctl_macos._getMousePos(darwin) if darwin else pmc.getMousePos()
 
-    return pmc.getMousePos()
+    # A cursor sent from another computer overrides the local one
+    if network_cursor.running:
+        sample = network_cursor.latest()
+        if sample is not None:
+            return sample[0], sample[1], sample[2]
+
+    # Prefer the freshest background sample, never wait on the OS for it.
+    # A stopped sampler may still hold its last sample.
+    if sampler.running:
+        sample = sampler.sample
+        if sample is not None:
+            return sample[0], sample[1], sample[2]
+    x, y = cursors.read()
+    return x, y, monotonic()
+
+
+def read_cursor_position():
+    x, y, _ = read_cursor_sample()
+    return x, y
+
+get_cursor_sample = read_cursor_sample
+get_cursor_position = read_cursor_position
+
+LOG_DEBUG, LOG_INFO, LOG_WARNING, LOG_ERROR = 10, 20, 30, 40
+LOG_LEVEL_NAMES = {LOG_DEBUG: "DEBUG", LOG_INFO: "INFO",
+                   LOG_WARNING: "WARNING", LOG_ERROR: "ERROR"}
+
+
+class LogSink:
+    """
+    Bounded in-memory ring buffer of log records, formatted and written by
+    a background thread so logging never formats or prints on the thread
+    that logged. When the buffer is full the oldest records are dropped
+    and counted.
+
+    Records are printed to the OBS script log and, if a file path is set,
+    appended to a log file rotated at max_bytes with `backups` old copies.
+    """
+    def __init__(self, capacity=4096, interval=0.25, max_bytes=1000000,
+                 backups=3):
+        self.records = deque(maxlen=capacity)
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.file_path = None
+        self.thread = None
+        self.dropped = 0
+
+    def append(self, record):
+        if len(self.records) == self.records.maxlen:
+            self.dropped += 1
+        self.records.append(record)
+        if self.thread is None:
+            self.start()
+
+    def start(self):
+        self.thread = Thread(target=self.run, name=f"{file_name}.log",
+                             daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops the writer and synchronously writes what is left
+        """
+        self.thread = None
+        self.flush()
+
+    def run(self):
+        while self.thread is current_thread():
+            sleep(self.interval)
+            self.flush()
+
+    @staticmethod
+    def format(record):
+        timestamp, level, category, message, args = record
+        if args:
+            try:
+                message = message % args
+            except Exception:
+                message = " ".join(str(arg) for arg in (message,) + args)
+        return (f"[{timestamp - log_start:10.3f}]"
+                f" {LOG_LEVEL_NAMES.get(level, level)} {category}: {message}")
+
+    def flush(self):
+        lines = []
+        records = self.records
+        while records:
+            try:
+                lines.append(self.format(records.popleft()))
+            except IndexError:
+                break
+        if self.dropped:
+            lines.append(f"{self.dropped} log records dropped")
+            self.dropped = 0
+        if not lines:
+            return
+        text = "\n".join(lines)
+        print(text)
+        if self.file_path:
+            try:
+                self.rotate()
+                with open(self.file_path, "a") as f:
+                    f.write(text + "\n")
+            except Exception as e:
+                print(f"{e}: Cannot write log file")
+
+    def rotate(self):
+        if not path.exists(self.file_path) \
+                or path.getsize(self.file_path) < self.max_bytes:
+            return
+        for i in range(self.backups - 1, 0, -1):
+            if path.exists(f"{self.file_path}.{i}"):
+                replace(f"{self.file_path}.{i}", f"{self.file_path}.{i + 1}")
+        replace(self.file_path, f"{self.file_path}.1")
+
+
+log_sink = LogSink()
+log_start = monotonic()
+log_level = LOG_DEBUG
+log_categories = set()
+
+
+def log(message, *args, level=LOG_DEBUG, category="script"):
+    """
+    Queues a log record when debug logging is enabled and the record passes
+    the level and category filters. The message is only %-formatted with
+    args by the log writer thread, so pass values as args instead of
+    building strings.
+
+    :param message: Message, optionally with %-style placeholders
+    :param args: Values for the placeholders
+    :param level: LOG_DEBUG, LOG_INFO, LOG_WARNING or LOG_ERROR
+    :param category: Subsystem the record belongs to
+    """
+    if not debug or level < log_level \
+            or (log_categories and category not in log_categories):
+        return
+    log_sink.append((monotonic(), level, category, message, args))
+
+
+# -------------------------------------------------------------------
+class ObsReferences:
+    """
+    Takes and releases OBS references, counting the live ones per kind, so
+    a leak shows up as a counter that does not return to zero. Scoped
+    references are taken with the context managers, which release them
+    however the block is left; references kept across frames are taken
+    with take() and given back with release().
+
+    Kinds are "source", "data", "data_array" and "scene_item".
+    """
+    RELEASE = {
+        "source": "obs_source_release",
+        "data": "obs_data_release",
+        "data_array": "obs_data_array_release",
+        "scene_item": "obs_sceneitem_release",
+    }
+
+    def __init__(self):
+        self.live = Counter()
+
+    def take(self, kind, handle):
+        """
+        :param handle: Newly referenced handle or None
+        :return: The handle
+        """
+        if handle is not None:
+            self.live[kind] += 1
+        return handle
+
+    def release(self, kind, handle):
+        if handle is not None:
+            getattr(obs, self.RELEASE[kind])(handle)
+            self.live[kind] -= 1
+
+    @contextmanager
+    def hold(self, kind, handle):
+        self.take(kind, handle)
+        try:
+            yield handle
+        finally:
+            self.release(kind, handle)
+
+    def source(self, name):
+        """
+        :return: Context manager for the source `name`, None if not found
+        """
+        return self.hold("source", obs.obs_get_source_by_name(name))
+
+    def settings(self, source):
+        """
+        :return: Context manager for the settings of `source`
+        """
+        return self.hold("data", obs.obs_source_get_settings(source)
+                         if source is not None else None)
+
+    @contextmanager
+    def sources(self):
+        """
+        :return: Context manager for the list of all sources
+        """
+        sources = obs.obs_enum_sources() or []
+        self.live["source"] += len(sources)
+        try:
+            yield sources
+        finally:
+            obs.source_list_release(sources)
+            self.live["source"] -= len(sources)
+
+    def leaks(self):
+        """
+        :return: Dictionary of the live references per kind
+        """
+        return {kind: count for kind, count in self.live.items() if count}
+
+
+refs = ObsReferences()
 
-def log(*args):
-    global debug
-    if debug:
-        string = ''
-        for arg in args:
-            string += str(arg)
-            if (len(args) > 1): string += " "
-        print(string)
 
 # -------------------------------------------------------------------
 class ZoomSettings:
-    log("Create ZoomSettings")
+    log("Create ZoomSettings", category="settings")
 
     file_dir = ""
     file_name = ""
     file_path = ""
 
-    def __init__(self, cwd, settings_dir, settings_file_name):
-        log("Run ZoomSettings init")
+    def __init__(self, cwd, settings_dir, settings_file_name, delay=0.5):
+        log("Run ZoomSettings init", category="settings")
+        self.delay = delay
+        self.lock = Lock()
+        self.write_lock = Lock()
+        self.thread = None
+        self.pending = None
+        self.due = 0.0
+        self.version = self.written = 0
         self.file_dir = path.join(cwd,settings_dir)
         self.file_name = settings_file_name
         self.file_path = path.join(self.file_dir,self.file_name)
 
         if settings_dir:
-            log(f"Checking settings directory: {path.join(cwd,settings_dir)}")
+            log("Checking settings directory: %s",
+                path.join(cwd, settings_dir),
+                category="settings")
             if not path.exists(self.file_dir):
-                log("Settings directory does not exist")
-                log("Creating settings directory")
+                log("Settings directory does not exist", category="settings")
+                log("Creating settings directory", category="settings")
                 makedirs(self.file_dir)
-            log("Settings directory found")
+            log("Settings directory found", category="settings")
 
     def save(self, settings, *args, **kwargs):
-        log(f"Saving to {self.file_path}")
-        try:
-            f = open(self.file_path,
-                     "w" if path.exists(self.file_path)
-                     else "a")
-            output = json.loads(obs.obs_data_get_json(settings))
-            if kwargs:
-                for key, value in kwargs.items():              
-                    skipped_values = ["windows", "monitors", "monitors_list"]
-                    new_keys = [i for i in dir(value)
-                                if not i.startswith("_")
-                                and i not in skipped_values
-                                and not ismethod(getattr(value, i))
-                                and not isfunction(getattr(value, i))]
-                    new_values = [getattr(value, i) for i in new_keys]
-                    new_dict = dict(zip(new_keys, new_values))
-                    output[key] = new_dict
-            log(output)
-            f.write(str(json.dumps(output,
-                sort_keys=True,
-                indent=4
-            )))
-            f.close()
-        except Exception as e:
-            log(f"{e}: Cannot write settings to file")
+        """
+        Snapshots the OBS settings and the PERSISTED attributes of the given
+        objects, and schedules writing them once no further change arrived
+        for `delay` seconds. Rapid changes, like dragging a slider, coalesce
+        into a single write on a background thread.
+
+        :param settings: OBS settings of the script
+        :param kwargs: Objects with a PERSISTED schema, stored under the
+            keyword name
+        """
+        output = json.loads(obs.obs_data_get_json(settings))
+        for key, value in kwargs.items():
+            output[key] = {name: getattr(value, name)
+                           for name in value.PERSISTED}
+        with self.lock:
+            self.version += 1
+            self.pending = (self.version, output)
+            self.due = perf_counter() + self.delay
+            if self.thread is None:
+                self.thread = Thread(target=self.run,
+                                     name=f"{file_name}.settings", daemon=True)
+                self.thread.start()
+
+    def run(self):
+        while True:
+            with self.lock:
+                wait = self.due - perf_counter()
+                if wait <= 0 or self.pending is None:
+                    pending, self.pending = self.pending, None
+                    self.thread = None
+                    break
+            sleep(wait)
+        if pending is not None:
+            self.write(*pending)
+
+    def flush(self):
+        """
+        Writes pending changes immediately
+        """
+        with self.lock:
+            pending, self.pending = self.pending, None
+        if pending is not None:
+            self.write(*pending)
+
+    def write(self, version, output):
+        """
+        Writes to a temporary file and renames it over the settings file, so
+        the file is never left half written. Snapshots older than the last
+        written one are skipped.
+        """
+        with self.write_lock:
+            if version <= self.written:
+                return
+            log("Saving to %s", self.file_path, category="settings")
+            temp_path = f"{self.file_path}.tmp"
+            try:
+                with open(temp_path, "w") as f:
+                    f.write(json.dumps(output, sort_keys=True, indent=4))
+                replace(temp_path, self.file_path)
+                self.written = version
+            except Exception as e:
+                log("%s: Cannot write settings to file", e, category="settings")
 
     def load(self):
-        log("Loading settings")
+        log("Loading settings", category="settings")
         try:
             if not path.exists(self.file_path):
-                self.create()
-            f = open(self.file_path)
-            if f:
-                log(f"Settings file found:",self.file_path)
-            d = json.load(f)
-            return d
+                log("No settings file", category="settings")
+                return None
+            with open(self.file_path) as f:
+                log("Settings file found: %s", self.file_path,
+                    category="settings")
+                return json.load(f)
         except Exception as e:
-            log(f"{e}: Cannot load settings from file")
+            log("%s: Cannot load settings from file", e, category="settings")
             return None
 
 
+# -------------------------------------------------------------------
+CURSOR_AUTO = "auto"
+
+
+class PyMonCtlCursor:
+    """
+    Reads the cursor with PyMonCtl, which works on every platform the
+    script supports. It is the reference the other backends are checked
+    against.
+    """
+    name = "pymonctl"
+    label = "PyMonCtl"
+
+    def open(self):
+        pmc.load()
+
+    @staticmethod
+    def read():
+        return pmc.getMousePos()
+
+    def close(self):
+        pass
+
+
+class XlibCursor:
+    """
+    Queries the X server pointer over one persistent python-xlib
+    connection, instead of a display round trip set up per call. Xlib
+    connections are not thread safe and the sampler thread may read at the
+    same time as OBS, so queries are serialized.
+    """
+    name = "xlib"
+    label = "Xlib"
+
+    def __init__(self):
+        self.display = self.root = None
+        self.lock = Lock()
+
+    def open(self):
+        if self.display is None:
+            self.display = import_module("Xlib.display").Display()
+            self.root = self.display.screen().root
+
+    def read(self):
+        with self.lock:
+            pointer = self.root.query_pointer()
+        return pointer.root_x, pointer.root_y
+
+    def close(self):
+        if self.display is not None:
+            self.display.close()
+            self.display = self.root = None
+
+
+class XcbCursor:
+    """
+    Queries the X server pointer over one persistent xcffib (XCB)
+    connection, serialized like the XlibCursor
+    """
+    name = "xcb"
+    label = "XCB"
+
+    def __init__(self):
+        self.connection = self.root = None
+        self.lock = Lock()
+
+    def open(self):
+        if self.connection is None:
+            xcffib = import_module("xcffib")
+            import_module("xcffib.xproto")
+            connection = xcffib.connect()
+            self.root = connection.get_setup().roots[connection.pref_screen].root
+            self.connection = connection
+
+    def read(self):
+        with self.lock:
+            reply = self.connection.core.QueryPointer(self.root).reply()
+        return reply.root_x, reply.root_y
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.disconnect()
+            self.connection = self.root = None
+
+
+class Win32Cursor:
+    """
+    Calls GetCursorPos directly through ctypes
+    """
+    name = "win32"
+    label = "Win32"
+
+    def __init__(self):
+        self.point_type = self.byref = self.get_cursor_pos = None
+
+    def open(self):
+        if self.get_cursor_pos is None:
+            ctypes = import_module("ctypes")
+            self.point_type = import_module("ctypes.wintypes").POINT
+            self.byref = ctypes.byref
+            self.get_cursor_pos = ctypes.windll.user32.GetCursorPos
+
+    def read(self):
+        # A POINT per call, the sampler thread may read at the same time
+        point = self.point_type()
+        if not self.get_cursor_pos(self.byref(point)):
+            raise OSError("GetCursorPos failed")
+        return point.x, point.y
+
+    def close(self):
+        pass
+
+
+class CursorBackends:
+    """
+    Chooses how the cursor position is read. On first use every candidate
+    backend is opened, checked against PyMonCtl and timed over `calls`
+    reads; the cheapest working one is used from then on, or the chosen
+    one if it works. Selecting on first use rather than at script load
+    keeps OBS startup free of the imports and connections.
+
+    `read` is the chosen backend's read method, so a read costs no more
+    than calling the backend directly.
+
+    Attributes
+
+    providers               |   Candidate backends, PyMonCtl last
+    choice                  |   Backend name, or CURSOR_AUTO for the fastest
+    provider                |   Selected backend, None until first use
+    costs                   |   Time per read (s) of every candidate, None if
+                            |   it did not work
+    """
+    calls = 32
+    # Distance from the PyMonCtl position still taken as the same cursor
+    tolerance = 2
+
+    def __init__(self, providers):
+        self.providers = providers
+        self.choice = CURSOR_AUTO
+        self.provider = None
+        self.costs = {}
+        self.lock = Lock()
+        self.read = self.select_and_read
+
+    def set_choice(self, choice):
+        if choice != self.choice:
+            self.choice = choice
+            self.close()
+
+    def select_and_read(self):
+        return self.select().read()
+
+    def select(self):
+        """
+        :return: The selected backend
+        """
+        with self.lock:
+            if self.provider is not None:
+                return self.provider
+            reference = self.providers[-1]
+            candidates = [provider for provider in self.providers
+                          if self.choice in (CURSOR_AUTO, provider.name)
+                          or provider is reference]
+            self.costs = {provider.name: self.measure(provider, reference)
+                          for provider in candidates}
+            working = [provider for provider in candidates
+                       if self.costs[provider.name] is not None]
+            chosen = [provider for provider in working
+                      if provider.name == self.choice]
+            provider = chosen[0] if chosen else min(
+                working, key=lambda provider: self.costs[provider.name],
+                default=reference)
+            for candidate in candidates:
+                if candidate is not provider:
+                    candidate.close()
+            self.provider = provider
+            self.read = provider.read
+        log("Cursor backend %s", self.report(), category="sampler")
+        return provider
+
+    def measure(self, provider, reference):
+        """
+        :return: Time per read (s), or None if the backend does not work
+        """
+        try:
+            provider.open()
+            if provider is not reference:
+                before = reference.read()
+                x, y = provider.read()
+                after = reference.read()
+                # The cursor may move between the reads
+                if not (min(before[0], after[0]) - self.tolerance <= x
+                        <= max(before[0], after[0]) + self.tolerance
+                        and min(before[1], after[1]) - self.tolerance <= y
+                        <= max(before[1], after[1]) + self.tolerance):
+                    raise ValueError(f"read {(x, y)}, PyMonCtl {before}")
+            read = provider.read
+            start = perf_counter()
+            for _ in range(self.calls):
+                read()
+            return (perf_counter() - start) / self.calls
+        except Exception as e:
+            log("%s: Cursor backend %s unavailable", e, provider.name,
+                category="sampler")
+            provider.close()
+            return None
+
+    def close(self):
+        with self.lock:
+            if self.provider is not None:
+                self.provider.close()
+            self.provider = None
+            self.read = self.select_and_read
+
+    def report(self):
+        """
+        :return: Selected backend and the cost per read of every candidate
+        """
+        if self.provider is None:
+            return "not selected yet"
+
+        def cost(name):
+            value = self.costs.get(name)
+            return "unavailable" if value is None \
+                else f"{value * 1000000:.1f} us/call"
+        others = ", ".join(f"{name} {cost(name)}" for name in self.costs
+                           if name != self.provider.name)
+        return f"{self.provider.name} {cost(self.provider.name)}" \
+            + (f" ({others})" if others else "")
+
+
+def cursor_backends():
+    """
+    :return: Candidate cursor backends of this platform, PyMonCtl last
+    """
+    if sys == "Windows":
+        return [Win32Cursor(), PyMonCtlCursor()]
+    if sys == "Linux":
+        return [XcbCursor(), XlibCursor(), PyMonCtlCursor()]
+    return [PyMonCtlCursor()]
+
+
+# -------------------------------------------------------------------
+class CursorSampler:
+    """
+    Polls the cursor position on its own thread at a fixed rate, so slow
+    OS queries never delay the OBS timer. The latest sample is an
+    (x, y, timestamp, sequence) tuple replaced with a single assignment,
+    which readers take without locking.
+
+    Timestamps come from time.monotonic(). Sampling cost is the time spent
+    in the OS query, jitter the deviation of the sampling interval from
+    the configured period.
+    """
+    def __init__(self, rate=500):
+        self.rate = rate
+        self.sample = None
+        self.thread = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.samples = 0
+        self.cost_total = self.cost_max = 0.0
+        self.jitter_total = self.jitter_max = 0.0
+        self.started = monotonic()
+
+    @property
+    def running(self):
+        return self.thread is not None
+
+    def start(self):
+        if self.running:
+            return
+        self.reset_stats()
+        self.sample = None
+        self.thread = Thread(target=self.run, name=f"{file_name}.cursor",
+                             daemon=True)
+        self.thread.start()
+        log("Cursor sampler started at %s Hz", self.rate, category="sampler")
+
+    def stop(self):
+        """
+        Stops sampling without waiting for the thread; it notices that it
+        is no longer the current sampler thread and exits on its own
+        """
+        if not self.running:
+            return
+        self.thread = None
+        self.sample = None
+        log("Cursor sampler stopped: %s", self.stats(), category="sampler")
+
+    def run(self):
+        sequence = 0
+        last_start = next_time = monotonic()
+        while self.thread is current_thread():
+            period = 1 / max(1, self.rate)
+            start = monotonic()
+            try:
+                x, y = cursors.read()
+            except Exception as e:
+                # Fall back to synchronous reads instead of a frozen sample
+                log("%s: Cursor sampler failed", e, category="sampler")
+                if self.thread is current_thread():
+                    self.thread = None
+                    self.sample = None
+                return
+            now = monotonic()
+            if self.thread is not current_thread():
+                # Stopped during the read, don't publish after stop()
+                return
+            sequence += 1
+            self.sample = (x, y, now, sequence)
+
+            cost = now - start
+            jitter = abs((start - last_start) - period) if sequence > 1 else 0.0
+            last_start = start
+            self.samples += 1
+            self.cost_total += cost
+            self.cost_max = max(self.cost_max, cost)
+            self.jitter_total += jitter
+            self.jitter_max = max(self.jitter_max, jitter)
+
+            next_time += period
+            delay = next_time - monotonic()
+            if delay > 0:
+                sleep(delay)
+            else:
+                # Fell behind, don't try to catch up with a burst of samples
+                next_time = monotonic()
+
+    def stats(self):
+        """
+        :return: Dictionary of sample count, achieved rate (Hz) and mean and
+            maximum sampling cost and jitter (ms)
+        """
+        samples = max(1, self.samples)
+        elapsed = max(1e-9, monotonic() - self.started)
+        return {
+            "samples": self.samples,
+            "rate": round(self.samples / elapsed, 1),
+            "cost_mean_ms": round(self.cost_total / samples * 1000, 4),
+            "cost_max_ms": round(self.cost_max * 1000, 4),
+            "jitter_mean_ms": round(self.jitter_total / samples * 1000, 4),
+            "jitter_max_ms": round(self.jitter_max * 1000, 4),
+        }
+
+
+# -------------------------------------------------------------------
+CURSOR_PACKET_MAGIC = b"ZFC1"
+# Magic, sender session, sequence, sender time (s), x, y; cursor_sender.py
+# packs the same layout
+CURSOR_PACKET = struct.Struct("<4sIIddd")
+CURSOR_PORT = 45654
+
+
+class NetworkCursor:
+    """
+    Receives cursor samples sent by cursor_sender.py from another computer,
+    for setups where OBS does not run on the computer whose cursor is
+    shown. A thread waits on a non-blocking UDP socket and drains every
+    datagram that arrived; the newest sample is an (x, y, timestamp,
+    sequence) tuple like the CursorSampler's, replaced with a single
+    assignment and read without locking.
+
+    Samples with a sequence number at or below the newest one arrived late
+    or twice and are dropped; gaps in the sequence count as lost. A sender
+    restart starts a new session with its own sequence. Without a sample
+    for `stale_after` seconds the position goes stale: the last one is
+    kept, and a warning is logged once.
+
+    The sender's clock is not the receiver's, so transit is measured as
+    the delay above the fastest packet of the session, which is the queuing
+    and network jitter; the fastest delay itself is only the latency when
+    both share a clock, i.e. run on the same computer. Age is the time from
+    receiving a sample to the script using it.
+    """
+    stale_after = 0.5
+
+    def __init__(self, host="0.0.0.0", port=CURSOR_PORT):
+        self.host = host
+        self.port = port
+        self.address = None
+        self.sample = None
+        self.thread = None
+        self.socket = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.session = None
+        self.last_sequence = 0
+        self.received = self.lost = self.late = self.invalid = 0
+        self.senders = 0
+        self.delay_min = None
+        self.transit_total = self.transit_max = 0.0
+        self.reads = 0
+        self.age_total = self.age_max = 0.0
+        self.stale = False
+        self.stale_periods = 0
+
+    @property
+    def running(self):
+        return self.thread is not None
+
+    def start(self):
+        if self.running:
+            return
+        self.reset_stats()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.setblocking(False)
+            sock.bind((self.host, self.port))
+        except OSError as e:
+            sock.close()
+            log("%s: Cannot receive the network cursor on %s:%s", e,
+                self.host, self.port, level=LOG_WARNING, category="sampler")
+            return
+        self.socket = sock
+        self.address = sock.getsockname()
+        self.thread = Thread(target=self.run, args=(sock,),
+                             name=f"{file_name}.network", daemon=True)
+        self.thread.start()
+        log("Network cursor listening on %s:%s", *self.address,
+            category="sampler")
+
+    def stop(self):
+        """
+        Closes the socket; the thread notices that it is no longer the
+        current receiver thread and exits on its own
+        """
+        if not self.running:
+            return
+        self.thread = None
+        self.socket.close()
+        self.socket = None
+        self.sample = None
+        log("Network cursor stopped: %s", self.stats(), category="sampler")
+
+    def run(self, sock):
+        try:
+            while self.thread is current_thread():
+                try:
+                    readable, _, _ = select([sock], [], [], 0.25)
+                    while readable and self.thread is current_thread():
+                        data = sock.recv(CURSOR_PACKET.size + 1)
+                        self.receive(data, monotonic())
+                except (BlockingIOError, InterruptedError,
+                        ConnectionResetError):
+                    continue
+        except (OSError, ValueError) as e:
+            # Expected once stop() closed the socket
+            if self.thread is current_thread():
+                log("%s: Network cursor receiver failed", e,
+                    level=LOG_WARNING, category="sampler")
+        finally:
+            # Failed on its own: stop, so start() can open a new socket
+            if self.thread is current_thread():
+                self.thread = None
+                self.socket = None
+                self.sample = None
+                sock.close()
+
+    def receive(self, data, now):
+        """
+        :param data: Datagram payload
+        :param now: Time it was received
+        """
+        if len(data) != CURSOR_PACKET.size:
+            self.invalid += 1
+            return
+        magic, session, sequence, sent, x, y = CURSOR_PACKET.unpack(data)
+        if magic != CURSOR_PACKET_MAGIC:
+            self.invalid += 1
+            return
+        if session != self.session:
+            self.session = session
+            self.senders += 1
+            self.delay_min = None
+            log("Network cursor sender %08x", session, category="sampler")
+        elif sequence <= self.last_sequence:
+            self.late += 1
+            return
+        else:
+            self.lost += sequence - self.last_sequence - 1
+        self.last_sequence = sequence
+        self.sample = (x, y, now, sequence)
+
+        delay = now - sent
+        if self.delay_min is None or delay < self.delay_min:
+            self.delay_min = delay
+        transit = delay - self.delay_min
+        self.received += 1
+        self.transit_total += transit
+        self.transit_max = max(self.transit_max, transit)
+
+    def latest(self):
+        """
+        :return: Newest (x, y, timestamp, sequence) sample, or None before
+            the first one
+        """
+        sample = self.sample
+        if sample is None:
+            return None
+        age = monotonic() - sample[2]
+        if age > self.stale_after:
+            if not self.stale:
+                self.stale = True
+                self.stale_periods += 1
+                log("No network cursor samples for %.0f ms, holding %s",
+                    age * 1000, sample[:2], level=LOG_WARNING,
+                    category="sampler")
+        else:
+            if self.stale:
+                self.stale = False
+                log("Network cursor samples resumed", category="sampler")
+            self.reads += 1
+            self.age_total += age
+            self.age_max = max(self.age_max, age)
+        return sample
+
+    def stats(self):
+        """
+        :return: Dictionary of received, lost, late and invalid packets,
+            loss (%), mean and maximum transit and age (ms), the fastest
+            delay (ms) and the stale periods
+        """
+        received = max(1, self.received)
+        reads = max(1, self.reads)
+        return {
+            "received": self.received,
+            "lost": self.lost,
+            "late": self.late,
+            "invalid": self.invalid,
+            "loss_pct": round(self.lost / max(1, self.received + self.lost)
+                              * 100, 2),
+            "transit_mean_ms": round(self.transit_total / received * 1000, 3),
+            "transit_max_ms": round(self.transit_max * 1000, 3),
+            "delay_min_ms": round(self.delay_min * 1000, 3)
+            if self.delay_min is not None else None,
+            "age_mean_ms": round(self.age_total / reads * 1000, 3),
+            "age_max_ms": round(self.age_max * 1000, 3),
+            "stale_periods": self.stale_periods,
+            "senders": self.senders,
+        }
+
+
+# -------------------------------------------------------------------
+class CursorPredictor:
+    """
+    Alpha-beta filter over timestamped cursor samples, extrapolating the
+    cursor `look_ahead` seconds ahead to hide the latency between reading
+    the cursor and the zoomed frame being rendered and encoded.
+
+    The lead is limited to `max_lead` pixels, so a flick cannot throw the
+    zoom window far past where the cursor stops. Once the cursor stands
+    still for `stop_frames` samples, the same sample is passed in again for
+    as many frames, or after a gap in the samples, the velocity is dropped
+    and the raw position is used again.
+    """
+    alpha = 0.6
+    beta = 0.15
+    stop_frames = 2
+    max_gap = 0.1
+
+    def __init__(self, look_ahead=0.033, max_lead=150):
+        self.look_ahead = look_ahead
+        self.max_lead = max_lead
+        self.reset()
+
+    def reset(self):
+        self.x = self.y = None
+        self.vx = self.vy = 0.0
+        self.last = None
+        self.last_time = None
+        self.still = 0
+
+    def update(self, x, y, timestamp):
+        """
+        :param x: Cursor x position
+        :param y: Cursor y position
+        :param timestamp: Monotonic time of the sample (s)
+        :return: Predicted (x, y)
+        """
+        if self.last_time is None or timestamp - self.last_time > self.max_gap:
+            self.reset()
+            self.x, self.y, self.last_time, self.last = x, y, timestamp, (x, y)
+            return x, y
+        dt = timestamp - self.last_time
+        if dt <= 0:
+            # The same sample again: no news is a cursor standing still
+            self.still += 1
+            if self.still >= self.stop_frames:
+                self.x, self.y = self.last
+                self.vx = self.vy = 0.0
+                return self.last
+            return self.predicted()
+        self.last_time = timestamp
+
+        if (x, y) == self.last:
+            self.still += 1
+        else:
+            self.still = 0
+        self.last = (x, y)
+        if self.still >= self.stop_frames:
+            # Stopped, no more extrapolation
+            self.x, self.y = x, y
+            self.vx = self.vy = 0.0
+            return x, y
+
+        # Predict, then correct with the residual
+        px = self.x + self.vx * dt
+        py = self.y + self.vy * dt
+        rx, ry = x - px, y - py
+        self.x = px + self.alpha * rx
+        self.y = py + self.alpha * ry
+        self.vx += self.beta * rx / dt
+        self.vy += self.beta * ry / dt
+        return self.predicted()
+
+    def predicted(self):
+        lead_x = self.vx * self.look_ahead
+        lead_y = self.vy * self.look_ahead
+        lead_squared = lead_x * lead_x + lead_y * lead_y
+        if lead_squared > self.max_lead * self.max_lead:
+            factor = self.max_lead / sqrt(lead_squared)
+            lead_x *= factor
+            lead_y *= factor
+        # Extrapolate from the measured position, the filtered one trails it
+        x, y = self.last
+        return x + lead_x, y + lead_y
+
+
+# -------------------------------------------------------------------
+TRACE_MAGIC = b"ZFT1"
+TRACE_VERSION = 1
+# Magic, version, ints per record, start time (us), start x, start y
+TRACE_HEADER = struct.Struct("<4sHHqii")
+TRACE_EVENT_ZOOM = 1
+TRACE_EVENT_FOLLOW = 2
+TRACE_EVENT_GAP = 3
+# Longest time delta of a record (us), about 35 minutes
+TRACE_DT_MAX = 2 ** 31 - 1
+
+
+class CursorTraceWriter:
+    """
+    Records timestamped cursor samples and hotkey events for replaying
+    sessions outside of OBS.
+
+    The trace file is a TRACE_HEADER followed by records of three little
+    endian int32. A sample stores time (us) and position as deltas to the
+    previous record: (dt, dx, dy). An event stores its code negated:
+    (-code, dt, value). Time passing beyond TRACE_DT_MAX is written ahead
+    as (-TRACE_EVENT_GAP, dt, 0) records.
+    """
+    def __init__(self):
+        self.records = None
+        self.start = self.last = None
+
+    @property
+    def recording(self):
+        return self.records is not None
+
+    def begin(self):
+        self.records = array("i")
+        self.start = self.last = None
+
+    def add_sample(self, x, y, timestamp):
+        """
+        :param x: Cursor x position
+        :param y: Cursor y position
+        :param timestamp: time.monotonic() of the sample
+        """
+        t = int(timestamp * 1000000)
+        x, y = int(x), int(y)
+        if self.last is None:
+            self.start = self.last = (t, x, y)
+        dt = self.delta(t)
+        self.records.extend((dt, x - self.last[1], y - self.last[2]))
+        self.last = (t, x, y)
+
+    def add_event(self, code, value, timestamp):
+        """
+        :param code: TRACE_EVENT_ZOOM or TRACE_EVENT_FOLLOW
+        :param value: Hotkey pressed state in bit 0, index of the zoom
+            target in the bits above
+        :param timestamp: time.monotonic() of the event
+        """
+        t = int(timestamp * 1000000)
+        if self.last is None:
+            x, y = get_cursor_position()
+            self.start = self.last = (t, int(x), int(y))
+        dt = self.delta(t)
+        self.records.extend((-code, dt, int(value)))
+        self.last = (t, self.last[1], self.last[2])
+
+    def delta(self, t):
+        """
+        :param t: Time of the next record (us)
+        :return: Time since the last record, after writing gap records for
+            what does not fit into one
+        """
+        dt = t - self.last[0]
+        while dt > TRACE_DT_MAX:
+            self.records.extend((-TRACE_EVENT_GAP, TRACE_DT_MAX, 0))
+            dt -= TRACE_DT_MAX
+        return dt
+
+    def end(self, file_path):
+        """
+        Stops recording and writes the trace, if anything was recorded
+
+        :param file_path: Trace file to write
+        :return: Path of the written file or None
+        """
+        records, start = self.records, self.start
+        self.records = None
+        if not records or start is None:
+            return None
+        if byteorder != "little":
+            records.byteswap()
+        try:
+            makedirs(path.dirname(file_path), exist_ok=True)
+            with open(file_path, "wb") as f:
+                f.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, 3, *start))
+                records.tofile(f)
+        except Exception as e:
+            log("%s: Cannot write cursor trace", e, category="trace")
+            return None
+        log("Cursor trace written to %s: %s records", file_path,
+            len(records) // 3, category="trace")
+        return file_path
+
+
+class CursorTrace:
+    """
+    Memory mapped cursor trace written by CursorTraceWriter. Records are
+    read straight from the mapping and decoded while iterating, so even
+    hour long traces open instantly.
+    """
+    def __init__(self, file_path):
+        with open(file_path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, width, self.start, self.x, self.y = \
+            TRACE_HEADER.unpack_from(self.map)
+        if magic != TRACE_MAGIC or version != TRACE_VERSION or width != 3:
+            self.map.close()
+            raise ValueError(f"{file_path} is not a cursor trace")
+        if byteorder != "little":
+            self.map.close()
+            raise ValueError("Cursor traces can only be read on little endian systems")
+        self.records = memoryview(self.map)[TRACE_HEADER.size:].cast("i")
+
+    def __len__(self):
+        return len(self.records) // 3
+
+    def __iter__(self):
+        """
+        :return: Iterator of (kind, time, a, b) where time is in seconds from
+            the trace start. Samples have kind 0 and the position as a, b;
+            events have their code as kind and the value as a. Gap
+            records only advance the time.
+        """
+        records = self.records
+        t = 0
+        x, y = self.x, self.y
+        for i in range(0, len(records) - 2, 3):
+            first = records[i]
+            if first >= 0:
+                t += first
+                x += records[i + 1]
+                y += records[i + 2]
+                yield 0, t / 1000000, x, y
+            else:
+                t += records[i + 1]
+                if first != -TRACE_EVENT_GAP:
+                    yield -first, t / 1000000, records[i + 2], 0
+
+    def close(self):
+        self.records.release()
+        self.map.close()
+
+
+# -------------------------------------------------------------------
+class CountingProxy:
+    """
+    Forwards attribute access to a module and counts the calls made to its
+    functions in the profiler
+    """
+    def __init__(self, module, profiler):
+        self.module = module
+        self.profiler = profiler
+        self.wrappers = {}
+
+    def __getattr__(self, name):
+        wrapper = self.wrappers.get(name)
+        if wrapper is None:
+            value = getattr(self.module, name)
+            if not callable(value) or isinstance(value, type):
+                return value
+            profiler = self.profiler
+
+            def wrapper(*args, **kwargs):
+                profiler.api_calls += 1
+                return value(*args, **kwargs)
+            self.wrappers[name] = wrapper
+        return wrapper
+
+
+class TickProfiler:
+    """
+    Times the stages of a tick and counts the OBS API calls made per tick,
+    keeping the last `window` measurements of each for percentiles.
+
+    Enabling wraps the stage methods on the CursorWindow instances, the
+    module's cursor read and its obs module reference. Disabling removes the
+    wrappers again, so a disabled profiler adds nothing to the tick.
+    """
+    STAGES = ("follow", "check_pos", "cubic_in_out", "obs_set_crop_settings",
+              "obs_set_scene_item_crop", "obs_set_initial_bounding_box_type")
+
+    def __init__(self, window=1000):
+        self.window = window
+        self.enabled = False
+        self.api_calls = 0
+        self.samples = {}
+        self.maximum = {}
+
+    def reset(self):
+        self.samples = {}
+        self.maximum = {}
+
+    def record(self, stage, value):
+        samples = self.samples.get(stage)
+        if samples is None:
+            samples = self.samples[stage] = deque(maxlen=self.window)
+        samples.append(value)
+        if value > self.maximum.get(stage, 0):
+            self.maximum[stage] = value
+
+    def timed(self, stage, function):
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(stage, perf_counter() - start)
+        return wrapper
+
+    def timed_tick(self, function):
+        def wrapper():
+            calls = self.api_calls
+            start = perf_counter()
+            try:
+                return function()
+            finally:
+                self.record("tick", perf_counter() - start)
+                self.record("obs calls", self.api_calls - calls)
+        return wrapper
+
+    def enable(self, windows):
+        global obs, get_cursor_position, get_cursor_sample
+        if self.enabled:
+            return
+        self.enabled = True
+        self.reset()
+        for window in windows:
+            self.wrap(window)
+        get_cursor_position = self.timed("cursor", get_cursor_position)
+        get_cursor_sample = self.timed("cursor", get_cursor_sample)
+        obs = CountingProxy(obs, self)
+        log("Tick profiler enabled", category="profile")
+
+    def disable(self, windows):
+        global obs, get_cursor_position, get_cursor_sample
+        if not self.enabled:
+            return
+        self.enabled = False
+        for window in windows:
+            self.unwrap(window)
+        get_cursor_position = read_cursor_position
+        get_cursor_sample = read_cursor_sample
+        obs = obs.module
+        log("Tick profiler disabled", category="profile")
+
+    def wrap(self, window):
+        # tick() calls tracking(), which runs every other stage
+        window.tracking = self.timed_tick(window.tracking)
+        for stage in self.STAGES:
+            setattr(window, stage, self.timed(stage, getattr(window, stage)))
+
+    @staticmethod
+    def unwrap(window):
+        for stage in ("tracking",) + TickProfiler.STAGES:
+            window.__dict__.pop(stage, None)
+
+    def report(self):
+        """
+        :return: Table of p50/p95/p99/max per stage in microseconds and of
+            OBS API calls per tick
+        """
+        lines = [f"{'stage':34}{'n':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"]
+        for stage, samples in self.samples.items():
+            values = sorted(samples)
+            scale = 1 if stage == "obs calls" else 1000000
+
+            def at(p):
+                return values[min(len(values) - 1, int(p * len(values)))] * scale
+            lines.append(f"{stage:34}{len(values):>6}{at(0.5):>9.1f}"
+                         f"{at(0.95):>9.1f}{at(0.99):>9.1f}"
+                         f"{self.maximum[stage] * scale:>9.1f}")
+        if len(lines) == 1:
+            lines.append("No ticks profiled yet")
+        lines.append(f"cursor backend {cursors.report()}")
+        if sampler.running:
+            lines.append(f"cursor sampler {sampler.stats()}")
+        if network_cursor.running:
+            lines.append(f"network cursor {network_cursor.stats()}")
+        return "\n".join(lines)
+
+
 # -------------------------------------------------------------------
 class WindowCaptureSources:
     def __init__(self, sources):
@@ -139,9 +1378,316 @@ class MonitorCaptureSources:
         return self.windows | self.macos | self.linux
 
 
-class AppleSiliconCaptureSources:
-    def __init__(self, sources):
-        self.sources = sources
+class AppleSiliconCaptureSources:
+    def __init__(self, sources):
+        self.sources = sources
+
+
+class WindowRegistry:
+    """
+    Index of the open windows reported by PyWinCtl, keyed by handle and by
+    title. Only handles and titles are stored, so enumerating hundreds of
+    windows does not keep their Window objects alive. The index is
+    refreshed when it was marked stale or when a lookup misses.
+    """
+    def __init__(self):
+        self.titles = {}
+        self.handles = {}
+        self.stale = True
+
+    def refresh(self):
+        titles = {}
+        handles = {}
+        for w in pwc.getAllWindows():
+            handle = w.getHandle()
+            titles[handle] = w.title
+            handles.setdefault(w.title, []).append(handle)
+        self.titles = titles
+        self.handles = handles
+        self.stale = False
+        log("Window registry refreshed: %s windows", len(titles),
+            category="window")
+
+    @staticmethod
+    def parse_obs_window(obs_window):
+        """
+        Splits an OBS window capture target into its parts
+
+        :param obs_window: OBS window string "Title:WindowClass:Executable",
+            with ':' and '#' inside the parts escaped as '#3A' and '#22'
+        :return: Tuple of title, window class and executable
+        """
+        parts = [part.replace("#3A", ":").replace("#22", "#")
+                 for part in obs_window.split(":")]
+        parts += [""] * (3 - len(parts))
+        return parts[0], parts[1], parts[2]
+
+    def find(self, obs_window):
+        """
+        Looks up the handle of the window OBS is capturing
+
+        :param obs_window: OBS window string "Title:WindowClass:Executable"
+        :return: Window handle or None if no window matches
+        """
+        title, _, executable = self.parse_obs_window(obs_window)
+        if self.stale or title not in self.handles:
+            self.refresh()
+        handles = self.handles.get(title)
+        if not handles:
+            return None
+        if len(handles) > 1 and executable:
+            # Only windows sharing the title need their process looked up
+            for handle in handles:
+                window = self.window(handle)
+                if window is not None \
+                        and window.getAppName().lower() == executable.lower():
+                    return handle
+        return handles[0]
+
+    def title(self, handle):
+        """
+        :param handle: Window handle
+        :return: Title of the window or None if the window no longer exists
+        """
+        if self.stale or handle not in self.titles:
+            self.refresh()
+        return self.titles.get(handle)
+
+    @staticmethod
+    def window(handle):
+        """
+        :param handle: Window handle
+        :return: PyWinCtl Window for the handle or None if it is gone
+        """
+        try:
+            return pwc.Window(handle)
+        except Exception as e:
+            log("%s: Window %s not available", e, handle, category="window")
+            return None
+
+
+class WindowGeometry:
+    """
+    Client area and title of a captured window, kept current off the OBS
+    thread by the PyWinCtl watchdog of the window, or by a poller thread
+    every `interval` seconds where the watchdog is not available. The
+    snapshot is a (rect, title, alive) tuple replaced with a single
+    assignment, so the tick takes it without locking and without OS calls,
+    and can tell a new snapshot by its identity.
+    """
+    def __init__(self, interval=0.25):
+        self.interval = interval
+        self.window = None
+        self.snapshot = None
+        self.watchdog = False
+        self.thread = None
+
+    @property
+    def watching(self):
+        return self.window is not None
+
+    def watch(self, window):
+        """
+        :param window: PyWinCtl Window to watch, replacing the watched one
+        """
+        if self.watching and window.getHandle() == self.window.getHandle():
+            self.read()
+            return
+        self.stop()
+        self.window = window
+        self.read()
+        try:
+            window.watchdog.start(isAliveCB=self.on_alive,
+                                  resizedCB=self.on_changed,
+                                  movedCB=self.on_changed,
+                                  changedTitleCB=self.on_changed,
+                                  interval=self.interval)
+            self.watchdog = True
+            log("Watching window %s", window.getHandle(), category="window")
+        except Exception as e:
+            log("%s: No window watchdog, polling window %s", e,
+                window.getHandle(), category="window")
+            self.thread = Thread(target=self.run, name=f"{file_name}.window",
+                                 daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """
+        Stops watching without waiting for the watchdog or poller thread
+        """
+        if not self.watching:
+            return
+        if self.watchdog:
+            try:
+                self.window.watchdog.stop()
+            except Exception as e:
+                log("%s: Cannot stop window watchdog", e, category="window")
+        log("Stopped watching window %s", self.window.getHandle(),
+            category="window")
+        self.window = None
+        self.watchdog = False
+        self.thread = None
+
+    def read(self):
+        window = self.window
+        if window is None:
+            return
+        try:
+            if not window.isAlive:
+                self.on_alive(False)
+                return
+            self.snapshot = (window.getClientFrame(), window.title, True)
+        except Exception as e:
+            # Reading a window fails once it is closed
+            log("%s: Cannot read window geometry", e, category="window")
+            self.on_alive(False)
+
+    def on_changed(self, *args):
+        """
+        PyWinCtl watchdog callback for a moved, resized or renamed window.
+        Runs on the watchdog thread.
+        """
+        self.read()
+
+    def on_alive(self, alive):
+        """
+        PyWinCtl watchdog callback for the window being closed. Runs on the
+        watchdog thread.
+        """
+        if not alive and self.snapshot is not None:
+            rect, title, _ = self.snapshot
+            self.snapshot = (rect, title, False)
+
+    def run(self):
+        thread = current_thread()
+        while self.thread is thread:
+            sleep(self.interval)
+            if self.thread is thread:
+                self.read()
+
+
+class MonitorIndex:
+    """
+    Monitors reported by PyMonCtl, indexed by name, OBS monitor id and
+    display index. Monitors are enumerated on first use rather than when
+    the script loads. Once listening, PyMonCtl's plug and change listeners
+    keep the index current, so lookups never enumerate monitors. Every
+    refresh bumps the generation so users of the geometry know to update.
+    """
+    def __init__(self):
+        # (by_name, by_id, names, generation), swapped in whole so readers
+        # on other threads see either the old or the new index
+        self.index = None
+        self.refreshes = 0
+        self.refresh_time = 0.0
+        self.listening = False
+        self.listen_requested = False
+
+    def current(self):
+        index = self.index
+        if index is None:
+            self.refresh()
+            index = self.index
+            if self.listen_requested:
+                self.start_listening()
+        return index
+
+    @property
+    def by_name(self):
+        return self.current()[0]
+
+    @property
+    def by_id(self):
+        return self.current()[1]
+
+    @property
+    def names(self):
+        return self.current()[2]
+
+    @property
+    def generation(self):
+        return self.current()[3]
+
+    def __len__(self):
+        return len(self.names)
+
+    def refresh(self, monitors=None):
+        """
+        Rebuilds the index
+
+        :param monitors: Monitors as returned from the PyMonCtl function
+            getAllMonitorsDict(), enumerated if not given
+        """
+        if monitors is None:
+            start = perf_counter()
+            monitors = pmc.getAllMonitorsDict()
+            self.refresh_time = perf_counter() - start
+        self.refreshes += 1
+        self.index = (dict(monitors),
+                      {monitor['id']: monitor for monitor in monitors.values()},
+                      list(monitors), self.refreshes)
+        log("Monitor index refreshed in %.2f ms: %s",
+            self.refresh_time * 1000, list(monitors), category="monitor")
+
+    def invalidate(self):
+        """
+        Enumerates the monitors again on next use, unless listening
+        """
+        if not self.listening:
+            self.index = None
+
+    def by_index(self, index):
+        """
+        :param index: Position of the monitor in the PyMonCtl order, as used
+            by the monitor override list and macOS display indices
+        :return: Monitor or None
+        """
+        by_name, _, names, _ = self.current()
+        if not isinstance(index, int) or not 0 <= index < len(names):
+            return None
+        return by_name.get(names[index])
+
+    def on_monitors_changed(self, names, monitors):
+        """
+        PyMonCtl listener for monitors being plugged, unplugged or changed.
+        Runs on the PyMonCtl watchdog thread.
+        """
+        log("Monitors changed: %s", names, category="monitor")
+        self.refresh(monitors if isinstance(monitors, dict) else None)
+
+    def listen(self):
+        """
+        Keeps the index current with PyMonCtl's listeners, starting with
+        the first use of the index so loading the script does not import
+        PyMonCtl
+        """
+        self.listen_requested = True
+        if self.index is not None:
+            self.start_listening()
+
+    def start_listening(self):
+        if self.listening:
+            return
+        try:
+            pmc.enableUpdateInfo()
+            pmc.plugListenerRegister(self.on_monitors_changed)
+            pmc.changeListenerRegister(self.on_monitors_changed)
+            self.listening = True
+        except Exception as e:
+            log("%s: Cannot listen for monitor changes", e, category="monitor")
+
+    def unlisten(self):
+        self.listen_requested = False
+        if not self.listening:
+            return
+        try:
+            pmc.plugListenerUnregister(self.on_monitors_changed)
+            pmc.changeListenerUnregister(self.on_monitors_changed)
+            pmc.disableUpdateInfo()
+        except Exception as e:
+            log("%s: Cannot stop listening for monitor changes", e,
+                category="monitor")
+        self.listening = False
 
 
 class CaptureSources:
@@ -171,6 +1717,130 @@ SOURCES = CaptureSources(
 )
 
 
+class SourceCatalog:
+    """
+    Capture sources that can be zoomed, by name, in OBS order. OBS's global
+    source_create, source_remove/source_destroy and source_rename signals
+    keep the catalog current, so the properties and script_update never
+    enumerate sources. The sources that already exist are enumerated once,
+    on first use.
+
+    The signals arrive on OBS threads while the UI thread iterates the
+    catalog, so it is never changed in place: handlers build a changed copy
+    and swap it in, one handler at a time. The first enumeration holds the
+    same lock, so a signal arriving during it is applied after it instead of
+    being skipped or overwritten.
+    """
+    SIGNALS = ("source_create", "source_remove", "source_destroy",
+               "source_rename")
+
+    def __init__(self, types):
+        """
+        :param types: Source ids of the capture sources to list
+        """
+        self.types = types
+        self.entries = None
+        self.lock = Lock()
+        self.listening = False
+        self.callbacks = {"source_create": self.on_create,
+                          "source_remove": self.on_remove,
+                          "source_destroy": self.on_destroy,
+                          "source_rename": self.on_rename}
+
+    @property
+    def sources(self):
+        """
+        :return: Dictionary of source names and source ids
+        """
+        if self.entries is None:
+            self.refresh()
+        return self.entries
+
+    def refresh(self):
+        with self.lock:
+            if self.entries is not None:
+                # Another thread enumerated first
+                return
+            entries = {}
+            with refs.sources() as sources:
+                for source in sources:
+                    self.add(entries, source)
+            self.entries = entries
+        log("Source catalog refreshed: %s capture sources", len(entries),
+            category="script")
+
+    def add(self, entries, source):
+        source_type = obs.obs_source_get_id(source)
+        if source_type in self.types:
+            entries[obs.obs_source_get_name(source)] = source_type
+        elif darwin:
+            # Print this value if a source isn't showing in the UI as
+            # expected and add it to SOURCES for either window or monitor
+            # capture
+            log("%s | %s | %s", obs.obs_source_get_name(source), source_type,
+                source, category="script")
+
+    def listen(self):
+        if self.listening:
+            return
+        handler = obs.obs_get_signal_handler()
+        for signal, callback in self.callbacks.items():
+            obs.signal_handler_connect(handler, signal, callback)
+        self.listening = True
+
+    def unlisten(self):
+        if not self.listening:
+            return
+        handler = obs.obs_get_signal_handler()
+        for signal, callback in self.callbacks.items():
+            obs.signal_handler_disconnect(handler, signal, callback)
+        self.listening = False
+        with self.lock:
+            self.entries = None
+
+    def on_create(self, calldata):
+        with self.lock:
+            if self.entries is not None:
+                entries = dict(self.entries)
+                self.add(entries, obs.calldata_source(calldata, "source"))
+                self.entries = entries
+
+    def on_remove(self, calldata):
+        with self.lock:
+            if not self.entries:
+                return
+            name = obs.obs_source_get_name(obs.calldata_source(calldata,
+                                                               "source"))
+            if name in self.entries:
+                self.entries = {other: source_type for other, source_type
+                                in self.entries.items() if other != name}
+
+    def on_destroy(self, calldata):
+        with self.lock:
+            if not self.entries:
+                return
+            name = obs.obs_source_get_name(obs.calldata_source(calldata,
+                                                               "source"))
+            if name not in self.entries:
+                return
+            # A removed source can outlive a new source taking over its name
+            with refs.source(name) as source:
+                if source is None:
+                    self.entries = {other: source_type for other, source_type
+                                    in self.entries.items() if other != name}
+
+    def on_rename(self, calldata):
+        with self.lock:
+            if not self.entries:
+                return
+            prev_name = obs.calldata_string(calldata, "prev_name")
+            new_name = obs.calldata_string(calldata, "new_name")
+            if prev_name in self.entries:
+                self.entries = {new_name if name == prev_name else name:
+                                source_type for name, source_type
+                                in self.entries.items()}
+
+
 class CursorWindow:
     """
     Attributes
@@ -178,7 +1848,7 @@ class CursorWindow:
     lock                    |   Toggles zoom
     track                   |   Toggles follow
     update                  |   Animation status
-    ticking                 |   Timer subscribe lock
+    ticking                 |   Target is ticked by the scheduler
     active_border           |   Ratio of smallest CaptureWindow dimension to track
     manual_offset           |   
     max_speed               |   Maximum CaptureWindow movement per frame (px)
@@ -187,9 +1857,9 @@ class CursorWindow:
     monitor_override_id     |   
     monitor_scale           |
     monitor_size_override   |   
-    monitors_dict           |   Cached list of monitor objects as reported by PyMonCtl
-    monitors_key            |   Cached list of monitors as reported by PyMonCtl
-    refresh_rate            |   OBS frame rate
+    monitors                |   Index of monitors as reported by PyMonCtl
+    monitor_generation      |   Monitor index generation the dimensions are from
+    refresh_rate            |   OBS frame interval (ms)
     smooth                  |   Smoothing factor for CaptureWindow movement (0.0 - 1.0)
     source_load             |   
     source_name             |   Name of source to be modified
@@ -206,13 +1876,24 @@ class CursorWindow:
     source_h                |   Final computed source height
     source_x                |   Final computed source x position
     source_y                |   Final computed source y position
-    source_refs             |   Array of source names referenced from OBS
-    window                  |   
-    window_handle           |   
-    window_name             |   
-    windows                 |   
-    zi_timer                |   Zoom in animation frame timer
-    zo_timer                |   Zoom out animation frame timer
+    crop_source             |   Cached OBS source the crop filter is attached to
+    crop_filter             |   Cached OBS crop filter used for zooming
+    crop_settings           |   Cached obs_data of the crop filter
+    crop_stale              |   Crop handles must be resolved again before use
+    crop_last               |   Last (left, top, cx, cy) pushed to the crop filter
+    crop_x                  |   CaptureWindow x position last applied to the crop
+    crop_y                  |   CaptureWindow y position last applied to the crop
+    dead_band               |   Movement (px) ignored while zoomed in, hides jitter
+    scene_item              |   Cached scene item of the source in the current scene
+    scene_item_stale        |   Scene item must be resolved again before use
+    window                  |   Target PyWinCtl window of a window/game capture
+    window_handle           |   Handle of the target window
+    window_name             |   Title of the target window
+    window_registry         |   Index of open windows by handle and title
+    geometry                |   Watched geometry of the target window
+    geometry_applied        |   Geometry snapshot the source dimensions are from
+    zoom_progress           |   Linear zoom animation progress, 0 out to 1 in
+    last_tick_time          |   Monotonic time of the previous animation step
     zoom_time               |   Zoom animation length (ms)
     zoom_h                  |   CaptureWindow Height
     zoom_w                  |   CaptureWindow Width
@@ -220,18 +1901,39 @@ class CursorWindow:
     zoom_y                  |   CaptureWindow y position (relative to source)
     zoom_x_target           |   CaptureWindow x interpolation target
     zoom_y_target           |   CaptureWindow y interpolation target
+    index                   |   Position of the target in the script, 0 first
+    crop_filter_name        |   Name of the crop filter of this target
+    new_source              |   Source changed, window must be looked up again
+    hotkeys                 |   Hotkey ids of this target by hotkey name
+    render_mode             |   Apply the zoom through a crop filter or the scene item
+    item_base               |   Scene item crop, position, bounds and alignment before zooming
+    item_last               |   Last crop and sub-pixel shift applied to the scene item
 
     """
-    log("Create CursorWindow")
+    log("Create CursorWindow", category="zoom")
+
+    # Attributes written to and restored from the settings file
+    PERSISTED = (
+        "source_name", "source_type", "track",
+        "monitor_override", "monitor_override_id", "monitor_size_override",
+        "monitor_scale", "manual_offset",
+        "source_w_raw", "source_h_raw", "source_x_raw", "source_y_raw",
+        "source_w_override", "source_h_override",
+        "source_x_offset", "source_y_offset",
+        "zoom_w", "zoom_h", "active_border", "max_speed", "smooth",
+        "zoom_time", "dead_band", "render_mode",
+    )
 
     lock = False
     track = True
     update = True
     ticking = False
-    zi_timer = zo_timer = 0
-    windows = monitor = window = window_handle = window_name = ''
-    monitors_dict = pmc.getAllMonitorsDict()
-    monitors_key = list(dict.keys(monitors_dict))
+    zoom_progress = 0.0
+    last_tick_time = None
+    monitor = window = window_handle = window_name = ''
+    window_registry = WindowRegistry()
+    monitors = MonitorIndex()
+    monitor_generation = 0
     monitor_override = manual_offset = monitor_size_override = False
     monitor_override_id = ''
     monitor_scale = 1
@@ -242,7 +1944,7 @@ class CursorWindow:
         = source_w_override = source_h_override = 0
     source_x = source_y = source_w = source_h = 0
     source_load = False
-    refresh_rate = 16
+    refresh_rate = 16.667
     source_name = source_type = ''
     zoom_w = 1280
     zoom_h = 720
@@ -251,12 +1953,44 @@ class CursorWindow:
     smooth = 1.0
     zoom_time = 300
 
-    source_refs = []
+    crop_source = crop_filter = crop_settings = None
+    crop_stale = False
+    crop_signal_cb = crop_filter_signal_cb = None
+    crop_last = None
+    crop_x = crop_y = 0
+    dead_band = 0.0
+    scene_item = None
+    scene_item_stale = True
+    render_mode = RENDER_FILTER
+    item_base = None
+    item_last = None
+
+    def __init__(self, index=0):
+        """
+        :param index: Position of the target in the script. The first target
+            keeps the setting keys, filter name and hotkeys of a single
+            target script, so existing setups load unchanged.
+        """
+        self.index = index
+        self.crop_filter_name = CROP_FILTER_NAME if index == 0 \
+            else f"{CROP_FILTER_NAME}_{index + 1}"
+        self.new_source = True
+        self.hotkeys = {}
+        self.geometry = WindowGeometry()
+        self.geometry_applied = None
+
+    def key(self, name):
+        """
+        :return: Settings key of the setting `name` for this target
+        """
+        return name if self.index == 0 else f"{name} ({self.index + 1})"
 
     def get_obs_source(self, source_name):
-        if source_name not in self.source_refs:
-            self.source_refs.append(source_name)
-        return obs.obs_get_source_by_name(source_name)
+        """
+        :return: New reference to the source, to be given back with
+            refs.release("source", source)
+        """
+        return refs.take("source", obs.obs_get_source_by_name(source_name))
 
     def update_sources(self, settings_update = False):
         """
@@ -265,42 +1999,47 @@ class CursorWindow:
         global darwin
         if not darwin or not settings_update:
             if (not darwin):
-                self.windows = pwc.getAllWindows()
-            self.monitors_dict = pmc.getAllMonitorsDict()
-            self.monitors_key = list(dict.keys(self.monitors_dict))
+                self.window_registry.stale = True
+            self.monitors.invalidate()
 
-    def update_window_dim(self, window):
+    def update_window_dim(self, window, window_dim=None):
         """
         Update the stored window dimensions to those of the selected
         window
 
         :param window: Window with new dimensions
+        :param window_dim: Client frame of the window, read from the window
+            if not given
         """
-        log("Updating stored dimensions to match current dimensions")
+        log("Updating stored dimensions to match current dimensions",
+            category="window")
         if window != None:
             # FIXME: on macos get window bounds results in an error and
             # does not work
             # NSInternalInconsistencyException - NSWindow drag regions
             # should only be invalidated on the Main Thread!
-            window_dim = window.getClientFrame()
+            if window_dim is None:
+                window_dim = window.getClientFrame()
             if (self.source_w_raw != window_dim.right - window_dim.left
                 or self.source_h_raw != window_dim.bottom - window_dim.top
                 or self.source_x_raw != window_dim.left
                     or self.source_y_raw != window_dim.top):
-                log("OLD")
-                log("Width, Height, X, Y")
-                log(f"{self.source_w_raw}, {self.source_h_raw}, {self.source_x_raw},"
-                      f" {self.source_y_raw}")
+                log("OLD", category="window")
+                log("Width, Height, X, Y", category="window")
+                log("%s, %s, %s, %s", self.source_w_raw, self.source_h_raw,
+                    self.source_x_raw, self.source_y_raw,
+                    category="window")
                 self.source_w_raw = window_dim.right - window_dim.left
                 self.source_h_raw = window_dim.bottom - window_dim.top
                 self.source_x_raw = window_dim.left
                 self.source_y_raw = window_dim.top
-                log("NEW")
-                log("Width, Height, X, Y")
-                log(f"{self.source_w_raw}, {self.source_h_raw}, {self.source_x_raw},"
-                      f" {self.source_y_raw}")
+                log("NEW", category="window")
+                log("Width, Height, X, Y", category="window")
+                log("%s, %s, %s, %s", self.source_w_raw, self.source_h_raw,
+                    self.source_x_raw, self.source_y_raw,
+                    category="window")
             else:
-                log("Dimensions did not change")
+                log("Dimensions did not change", category="window")
 
     def update_monitor_dim(self, monitor):
         """
@@ -311,96 +2050,91 @@ class CursorWindow:
         """
         global darwin
 
-        log("Updating stored dimensions to match monitor's dimensions")
+        log("Updating stored dimensions to match monitor's dimensions",
+            category="monitor")
+        self.monitor_generation = self.monitors.generation
         current_monitor_scale = monitor['dpi'][0]/72 if darwin else 1
         if (self.source_w_raw != monitor['size'].width * current_monitor_scale
             or self.source_h_raw != monitor['size'].height * current_monitor_scale
             or self.source_x_raw != monitor['position'].x * current_monitor_scale
             or self.source_y_raw != monitor['position'].y * current_monitor_scale
             or (darwin and (self.monitor_scale != current_monitor_scale))):
-            log("OLD")
-            log("Width, Height, X, Y")
-            log(f"{self.source_w_raw}, {self.source_h_raw}, {self.source_x_raw}, \
-{self.source_y_raw}")
+            log("OLD", category="monitor")
+            log("Width, Height, X, Y", category="monitor")
+            log("%s, %s, %s, %s", self.source_w_raw, self.source_h_raw,
+                self.source_x_raw, self.source_y_raw,
+                category="monitor")
             self.monitor_scale = current_monitor_scale if darwin else 1.0
-            log(f"Scale: {self.monitor_scale}")
+            log("Scale: %s", self.monitor_scale, category="monitor")
             self.source_w_raw = monitor['size'].width * current_monitor_scale
             self.source_h_raw = monitor['size'].height * current_monitor_scale
             self.source_x_raw = monitor['position'].x * current_monitor_scale
             self.source_y_raw = monitor['position'].y * current_monitor_scale
-            log("NEW")
-            log("Width, Height, X, Y")
-            log(f"{self.source_w_raw}, {self.source_h_raw}, {self.source_x_raw}, \
-{self.source_y_raw}")
+            log("NEW", category="monitor")
+            log("Width, Height, X, Y", category="monitor")
+            log("%s, %s, %s, %s", self.source_w_raw, self.source_h_raw,
+                self.source_x_raw, self.source_y_raw,
+                category="monitor")
             if darwin:
-                log(f"Scale: {self.monitor_scale}")
+                log("Scale: %s", self.monitor_scale, category="monitor")
         else:
-            log("Dimensions did not change")
-            log(f"{self.source_w_raw}, {self.source_h_raw}, {self.source_x_raw}, \
-{self.source_y_raw}")
+            log("Dimensions did not change", category="monitor")
+            log("%s, %s, %s, %s", self.source_w_raw, self.source_h_raw,
+                self.source_x_raw, self.source_y_raw,
+                category="monitor")
             if darwin:
-                log(f"Scale: {self.monitor_scale}")
+                log("Scale: %s", self.monitor_scale, category="monitor")
 
     def window_capture_gen(self, data):
         """
         TODO: More Linux testing, specifically with handles Windows
         capture for Windows and Linux. In Windows, application data is
         stored as "Title:WindowClass:Executable"
+
+        The window is looked up in the registry by title once per new
+        source and followed by handle afterwards, so a title change of the
+        target window is picked up without enumerating all windows.
         """
-        global new_source
+        registry = self.window_registry
+        if self.new_source:
+            # If new source selected / OBS initialize
+            # Build window, window_handle, and window_name
+            log("New Source", category="window")
+            log("Retrieving target window info from OBS", category="window")
+            self.window_handle = registry.find(data['window']) or ''
+            self.window = ''
+            self.new_source = False
+            log("Window Match Handle: %s", self.window_handle,
+                category="window")
+
+        if self.window_handle != '':
+            # If window handle is already stored
+            # Get window based on handle
+            # Check if name needs changing
+            log("Handle exists: %s", self.window_handle, category="window")
+            if self.window == '' or self.window.getHandle() != self.window_handle:
+                self.window = registry.window(self.window_handle) or ''
+            if self.window == '' or not self.window.isAlive:
+                # Window or App closed, look for a window matching the
+                # capture target again
+                log("Handle %s no longer exists", self.window_handle,
+                    category="window")
+                self.window_handle = registry.find(data['window']) or ''
+                self.window = ''
+                if self.window_handle != '':
+                    self.window = registry.window(self.window_handle) or ''
+
+        if self.window == '':
+            log("Source %s has changed. Select new source window",
+                self.source_name, category="window")
+            return None
 
-        try:
-            # Assuming the OBS data is formatted correctly, we should
-            # be able to identify the window
-            # If New Source/Init
-            # If Handle Exists
-            # Else
-            if new_source:
-                # If new source selected / OBS initialize
-                # Build window, window_handle, and
-                # window_name
-                log("New Source")
-                log("Retrieving target window info from OBS")
-                self.window_name = data['window'].split(":")[0]
-                log(f"Searching for: {self.window_name}")
-                for w in self.windows:
-                    if w.title == self.window_name:
-                        window_match = w
-                        self.window_handle = w.getHandle()
-                new_source = False
-                log(f"Window Match: {window_match.title}")
-                log("Window Match Handle:"
-                      f" {str(self.window_handle)}")
-            if self.window_handle != '':
-                # If window handle is already stored
-                # Get window based on handle
-                # Check if name needs changing
-                log(f"Handle exists: {str(self.window_handle)}")
-                handle_match = False
-                for w in self.windows:
-                    if w.getHandle() == self.window_handle:
-                        handle_match = True
-                        log(
-                            f"Found Handle: {str(w.getHandle())} | {self.window}")
-                        window_match = w
-                        if window_match.title != self.window:
-                            log("Changing target title")
-                            log(f"Old Title: {self.window_name}")
-                            self.window_name = w.title
-                            log(f"New Title: {self.window_name}")
-                if handle_match == False:
-                    # TODO: If the handle no longer exists,
-                    # eg. Window or App closed
-                    raise
-            else:
-                log("I don't know how it gets here.")
-                window_match = None
-                # TODO:
-        except:
-            log(f"Source {self.source_name} has changed."
-                  " Select new source window")
-            window_match = None
-        return window_match
+        if self.window.title != self.window_name:
+            log("Changing target title", category="window")
+            log("Old Title: %s", self.window_name, category="window")
+            self.window_name = self.window.title
+            log("New Title: %s", self.window_name, category="window")
+        return self.window
 
     def monitor_capture_gen(self, data):
         """
@@ -409,24 +2143,25 @@ class CursorWindow:
         Else search for the monitor and update
         """
         monitor_id = data.get('monitor', None)
-        if len(self.monitors_dict.items()) == 1:
-            log("Only one monitor detected. Forcing override.")
-            for monitor in self.monitors_dict.items():
-                self.update_monitor_dim(monitor[1])
+        if len(self.monitors) == 1:
+            log("Only one monitor detected. Forcing override.",
+                category="monitor")
+            self.update_monitor_dim(self.monitors.by_index(0))
         elif self.monitor_override is True:
-            log(f"Monitor Override: {self.monitor_override}")
-            for monitor in self.monitors_dict.items():
-                if monitor[0] == self.monitors_key[
-                        self.monitor_override_id]:
-                    self.update_monitor_dim(monitor[1])
+            log("Monitor Override: %s", self.monitor_override,
+                category="monitor")
+            monitor = self.monitors.by_index(self.monitor_override_id)
+            if monitor is not None:
+                self.update_monitor_dim(monitor)
         elif monitor_id == None:
-            log(f"Key 'monitor' does not exist in {data}")
+            log("Key 'monitor' does not exist in %s", data, category="monitor")
         else:
-            log(f"Searching for monitor {monitor_id}")
-            for monitor in self.monitors_dict.items():
-                if (monitor[1]['id'] == monitor_id):
-                    log(f"Found monitor {monitor[1]['id']} | {monitor}")
-                    self.update_monitor_dim(monitor[1])
+            log("Searching for monitor %s", monitor_id, category="monitor")
+            monitor = self.monitors.by_id.get(monitor_id)
+            if monitor is not None:
+                log("Found monitor %s | %s", monitor['id'], monitor,
+                    category="monitor")
+                self.update_monitor_dim(monitor)
 
     def window_capture_mac(self, data):
         """
@@ -460,8 +2195,8 @@ class CursorWindow:
         
         Use is expected to be for DISPLAY
         """
-        log("Apple Silicon")
-        log(f"data: {data}")
+        log("Apple Silicon", category="monitor")
+        log("data: %s", data, category="monitor")
         screen_capture_type = data.get('type')
 
         # When a new screen capture is created and then called in one session,
@@ -469,18 +2204,17 @@ class CursorWindow:
         # This auto check will fail on some versions of macOS (tested on 13.5.1)
         # Instead, all monitor related dimensions must be manually overridden
 
-        if len(self.monitors_dict) == 1:
-            log("Only one monitor cached")
-            for monitor in self.monitors_key:
-                self.update_monitor_dim(self.monitors_dict[monitor])
+        if len(self.monitors) == 1:
+            log("Only one monitor cached", category="monitor")
+            self.update_monitor_dim(self.monitors.by_index(0))
         elif self.monitor_override:
-            log("Monitor override")
+            log("Monitor override", category="monitor")
         else:
             monitor_id = data.get('display')
-            for monitor in self.monitors_dict.items():
-                if (monitor[1]['id'] == monitor_id):
-                    log(f"Found monitor {monitor[1]['id']} | {monitor[0]}")
-                    self.update_monitor_dim(monitor[1])
+            monitor = self.monitors.by_id.get(monitor_id)
+            if monitor is not None:
+                log("Found monitor %s", monitor['id'], category="monitor")
+                self.update_monitor_dim(monitor)
 
     def monitor_capture_mac(self, data):
         """
@@ -491,11 +2225,12 @@ class CursorWindow:
         is assigning the display index value.
         """
         monitor_index = data.get('display', 0)
-        log(f"Retrieving monitor {monitor_index}")
-        for monitor in self.monitors_dict.items():
-            if (monitor['id'] == monitor_index):
-                log(f"Found monitor {monitor['id']} | {monitor}")
-                self.update_monitor_dim(monitor)
+        log("Retrieving monitor %s", monitor_index, category="monitor")
+        monitor = self.monitors.by_index(monitor_index)
+        if monitor is not None:
+            log("Found monitor %s | %s", monitor['id'], monitor,
+                category="monitor")
+            self.update_monitor_dim(monitor)
 
     def update_computed_source_values(self):
         """
@@ -520,18 +2255,23 @@ class CursorWindow:
         Adjusts the source size variables based on the source given
         """
         global darwin
-        global new_source
-        log("Update source size")
+        log("Update source size", category="zoom")
+
+        log("self.source_name: %s", self.source_name, category="zoom")
+        with refs.source(self.source_name) as source:
+            self.update_source_size_from(source)
 
+    def update_source_size_from(self, source):
+        """
+        :param source: Zoom source, None if it does not exist
+        """
         try:
             # Try to pull the data for the source object
             # OBS stores the monitor index/window target in the
             # window/game/display sources settings
             # Info is stored in a JSON format
-            log("self.source_name:", self.source_name)
-            source = self.get_obs_source(self.source_name)
-            source_settings = obs.obs_source_get_settings(source)
-            data = obs.obs_data_get_json(source_settings)
+            with refs.settings(source) as source_settings:
+                data = obs.obs_data_get_json(source_settings)
             data_json = json.loads(data)
         except:
             # If it cannot be pulled, it is likely one of the following:
@@ -540,34 +2280,41 @@ class CursorWindow:
             #   OBS does not have the sources loaded yet when launching
             #       the script on start
 
-            log("Source '" + self.source_name + "' not found.")
-            log(self.get_obs_source(self.source_name))
+            log("Source '%s' not found.", self.source_name, category="zoom")
         else:
             # If the source data is pulled, it exists. Therefore other
             # information must also exists. Source Type is pulled to
             # determine if the source is a display, game, or window
 
-            log(f"Source loaded successfully: {self.source_type}")
+            log("Source loaded successfully: %s", self.source_type,
+                category="zoom")
             self.source_type = obs.obs_source_get_id(source)
-            log(f"Source Type: {self.source_type}")
+            log("Source Type: %s", self.source_type, category="zoom")
             if (self.source_type in SOURCES.window.sources):
                 window_match = ''
                 #if 'window_name' in data_json:
                 if darwin:
-                    log("No macOS window capture due to performance issues")
+                    log("No macOS window capture due to performance issues",
+                        category="zoom")
                     # self.window_capture_mac(data)
                 elif 'window' in data_json:
                     window_match = self.window_capture_gen(data_json)
-                if window_match is not None:
-                    log("Proceeding to resize")
-                    self.window = pwc.getWindowsWithTitle(self.window_name)[0]
-                    self.update_window_dim(self.window)
+                if window_match:
+                    log("Proceeding to resize", category="zoom")
+                    self.update_window_dim(window_match)
+                    # Follow moves and resizes while zoomed in
+                    self.geometry.watch(window_match)
+                    self.geometry_applied = self.geometry.snapshot
+                else:
+                    self.geometry.stop()
             elif (self.source_type in SOURCES.monitor.windows | SOURCES.monitor.linux):
                 self.monitor_capture_gen(data_json)
             elif (self.source_type in SOURCES.applesilicon.sources):
                 self.screen_capture_mac(data_json)
             elif (self.source_type in SOURCES.monitor.macos):
                 self.monitor_capture_mac(data_json)
+            if self.source_type not in SOURCES.window.sources:
+                self.geometry.stop()
 
             self.update_computed_source_values()
 
@@ -712,11 +2459,110 @@ class CursorWindow:
         self.check_pos()
 
         # Are we fully zoomed out?
-        if self.zi_timer == 0:
+        if self.zoom_progress == 0:
             # Synchronize the current crop zoom location
             self.zoom_x = self.zoom_x_target
             self.zoom_y = self.zoom_y_target
-            log("Skip to cursor location")
+            log("Skip to cursor location", category="zoom")
+
+    def obs_get_crop_handles(self):
+        """
+        Resolves the zoom source, its crop filter and the filter settings
+        once, creating the filter if necessary. The handles are kept until
+        OBS signals that the source was renamed or removed, or that the
+        filter was removed from it.
+
+        :return: Tuple of crop filter and its settings, or (None, None) if
+            the source does not exist
+        """
+        if self.crop_stale:
+            self.obs_release_crop_handles()
+
+        if self.crop_filter is None:
+            source = self.get_obs_source(self.source_name)
+            if source is None:
+                return None, None
+            crop = obs.obs_source_get_filter_by_name(source,
+                                                     self.crop_filter_name)
+
+            if crop is None:  # create filter
+                with refs.hold("data", obs.obs_data_create()) as obs_data:
+                    obs.obs_data_set_bool(obs_data, "relative", False)
+                    crop = obs.obs_source_create_private(
+                        "crop_filter",
+                        self.crop_filter_name,
+                        obs_data)
+                obs.obs_source_filter_add(source, crop)
+
+            self.crop_source = source
+            self.crop_filter = refs.take("source", crop)
+            self.crop_settings = refs.take("data",
+                                           obs.obs_source_get_settings(crop))
+            self.crop_last = None
+
+            # Signal callbacks are matched by identity on disconnect, so the
+            # bound methods are created only once
+            if self.crop_signal_cb is None:
+                self.crop_signal_cb = self.on_crop_source_signal
+                self.crop_filter_signal_cb = self.on_crop_filter_signal
+            handler = obs.obs_source_get_signal_handler(source)
+            obs.signal_handler_connect(handler, "rename", self.crop_signal_cb)
+            obs.signal_handler_connect(handler, "remove", self.crop_signal_cb)
+            obs.signal_handler_connect(handler, "destroy", self.crop_signal_cb)
+            obs.signal_handler_connect(handler, "filter_remove",
+                                       self.crop_filter_signal_cb)
+            log("Cached crop filter handles for %s", self.source_name,
+                category="zoom")
+
+        return self.crop_filter, self.crop_settings
+
+    def obs_remove_crop_filter(self):
+        """
+        Releases the cached handles and removes the crop filter from the
+        source
+        """
+        self.obs_release_crop_handles()
+        with refs.source(self.source_name) as source:
+            if source is not None:
+                with refs.hold("source", obs.obs_source_get_filter_by_name(
+                        source, self.crop_filter_name)) as crop:
+                    if crop is not None:
+                        obs.obs_source_filter_remove(source, crop)
+        self.crop_last = None
+
+    def obs_release_crop_handles(self):
+        """
+        Disconnects the source signals and releases the cached source, crop
+        filter and filter settings
+        """
+        if self.crop_source is not None:
+            handler = obs.obs_source_get_signal_handler(self.crop_source)
+            obs.signal_handler_disconnect(handler, "rename", self.crop_signal_cb)
+            obs.signal_handler_disconnect(handler, "remove", self.crop_signal_cb)
+            obs.signal_handler_disconnect(handler, "destroy", self.crop_signal_cb)
+            obs.signal_handler_disconnect(handler, "filter_remove",
+                                          self.crop_filter_signal_cb)
+        refs.release("data", self.crop_settings)
+        refs.release("source", self.crop_filter)
+        refs.release("source", self.crop_source)
+        self.crop_source = self.crop_filter = self.crop_settings = None
+        self.crop_stale = False
+
+    def on_crop_source_signal(self, calldata):
+        """
+        Source was renamed or removed. Signals may arrive from any thread, so
+        the handles are only marked and get released on their next use.
+        """
+        self.crop_stale = True
+
+    def on_crop_filter_signal(self, calldata):
+        """
+        A filter was removed from the source; drop the cache if it was ours
+        """
+        removed = obs.calldata_source(calldata, "filter")
+        if removed is not None \
+                and obs.obs_source_get_name(removed) == self.crop_filter_name:
+            self.crop_stale = True
 
     def obs_set_crop_settings(self, left, top, width, height):
         """
@@ -728,75 +2574,212 @@ class CursorWindow:
         :param width: crop filter new width in pixels
         :param height: crop filter new height in pixels
         """
-        source = self.get_obs_source(self.source_name)
-        crop = obs.obs_source_get_filter_by_name(source, CROP_FILTER_NAME)
-
-        if crop is None:  # create filter
-            obs_data = obs.obs_data_create()
-            obs.obs_data_set_bool(obs_data, "relative", False)
-            obs_crop_filter = obs.obs_source_create_private(
-                "crop_filter",
-                CROP_FILTER_NAME,
-                obs_data)
-            obs.obs_source_filter_add(source, obs_crop_filter)
-            obs.obs_source_release(obs_crop_filter)
-            obs.obs_data_release(obs_data)
-
-        crop_settings = obs.obs_source_get_settings(crop)
+        crop_rect = (int(left), int(top), int(width), int(height))
+        if crop_rect == self.crop_last and not self.crop_stale:
+            # Nothing changed, don't make the filter re-render
+            return
 
-        def set_crop_setting(name, value):
-            obs.obs_data_set_int(crop_settings, name, int(value))
+        crop, crop_settings = self.obs_get_crop_handles()
+        if crop is None:
+            return
 
-        set_crop_setting("left", left)
-        set_crop_setting("top", top)
-        set_crop_setting("cx", width)
-        set_crop_setting("cy", height)
+        obs.obs_data_set_int(crop_settings, "left", crop_rect[0])
+        obs.obs_data_set_int(crop_settings, "top", crop_rect[1])
+        obs.obs_data_set_int(crop_settings, "cx", crop_rect[2])
+        obs.obs_data_set_int(crop_settings, "cy", crop_rect[3])
 
         obs.obs_source_update(crop, crop_settings)
-
-        obs.obs_data_release(crop_settings)
-        obs.obs_source_release(source)
-        obs.obs_source_release(crop)
+        self.crop_last = crop_rect
 
     def obs_set_initial_bounding_box_type(self):
         """
         Sets the bounding box type and size if not previously set
         Defaults to "Scale to inner bounds" and canvas size
+
+        The scene item is only looked up again after it was marked stale by
+        a scene, scene collection or profile change, or a new source. It
+        stays stale until the item is found, so a source that is not in the
+        current scene yet is looked up again on the next call.
         """
-        source = self.get_obs_source(self.source_name)
-        scene = obs.obs_scene_from_source(obs.obs_frontend_get_current_scene())
-        if scene and source:
-            sceneitems = [obs.obs_scene_sceneitem_from_source(scene,source)]
-            for sceneitem in sceneitems:
-                if obs.obs_sceneitem_get_bounds_type(sceneitem) == 0:
-                    obs.obs_sceneitem_set_bounds_type(sceneitem, 2)
-                    obs.obs_sceneitem_set_bounds_alignment(sceneitem, 0)
-                    video = obs.obs_video_info()
-                    obs.obs_get_video_info(video)
-                    bounds = obs.vec2()
-                    setattr(bounds, "x", getattr(video, "base_width"))
-                    setattr(bounds, "y", getattr(video, "base_height"))
-                    obs.obs_sceneitem_set_bounds(sceneitem,bounds)
-            obs.sceneitem_list_release(sceneitems)
-            obs.obs_scene_release(scene)
+        if not self.scene_item_stale:
+            return
+        self.obs_release_scene_item()
+
+        with refs.source(self.source_name) as source, \
+                refs.hold("source", obs.obs_frontend_get_current_scene()) \
+                as current_scene:
+            scene = obs.obs_scene_from_source(current_scene)
+            if scene and source:
+                sceneitem = refs.take("scene_item",
+                                      obs.obs_scene_sceneitem_from_source(
+                                          scene, source))
+                if sceneitem:
+                    if obs.obs_sceneitem_get_bounds_type(sceneitem) == 0:
+                        obs.obs_sceneitem_set_bounds_type(sceneitem, 2)
+                        obs.obs_sceneitem_set_bounds_alignment(sceneitem, 0)
+                        video = obs.obs_video_info()
+                        obs.obs_get_video_info(video)
+                        bounds = obs.vec2()
+                        setattr(bounds, "x", getattr(video, "base_width"))
+                        setattr(bounds, "y", getattr(video, "base_height"))
+                        obs.obs_sceneitem_set_bounds(sceneitem,bounds)
+                    self.scene_item = sceneitem
+                    self.scene_item_stale = False
+        log("Cached scene item for %s: %s", self.source_name, self.scene_item,
+            category="zoom")
+
+    def obs_set_scene_item_crop(self, left, top, width, height):
+        """
+        Interfaces with OBS to zoom through the crop and transform of the
+        scene item, without a filter. The crop is in whole source pixels;
+        the fractional part of the position is applied by moving the item,
+        with one more source pixel left uncropped on the right and bottom
+        and the bounds grown by the same amount, so the shifted item still
+        fills its bounds at an unchanged scale. The state of the item before
+        zooming is restored when zoomed out.
+
+        :param left: zoom window left edge in source pixels
+        :param top: zoom window top edge in source pixels
+        :param width: zoom window width in pixels
+        :param height: zoom window height in pixels
+        """
+        if self.scene_item_stale:
+            self.obs_set_initial_bounding_box_type()
+        item = self.scene_item
+        if item is None:
+            return
+
+        source_w, source_h = int(self.source_w_raw), int(self.source_h_raw)
+        x, y, width, height = int(left), int(top), int(width), int(height)
+        if x <= 0 and y <= 0 and width >= source_w and height >= source_h:
+            self.obs_restore_scene_item()
+            return
+        if width <= 0 or height <= 0:
+            return
+
+        fraction_x, fraction_y = round(left - x, 2), round(top - y, 2)
+        extra = 1 if (fraction_x or fraction_y) \
+            and x + width < source_w and y + height < source_h else 0
+        if not extra:
+            fraction_x = fraction_y = 0.0
+        item_rect = (x, y, width, height, fraction_x, fraction_y)
+        if item_rect == self.item_last:
+            return
+
+        if self.item_base is None:
+            crop = obs.obs_sceneitem_crop()
+            obs.obs_sceneitem_get_crop(item, crop)
+            pos = obs.vec2()
+            obs.obs_sceneitem_get_pos(item, pos)
+            bounds = obs.vec2()
+            obs.obs_sceneitem_get_bounds(item, bounds)
+            self.item_base = ((crop.left, crop.top, crop.right, crop.bottom),
+                              (pos.x, pos.y), (bounds.x, bounds.y),
+                              obs.obs_sceneitem_get_alignment(item))
+        _, (pos_x, pos_y), (bounds_w, bounds_h), alignment = self.item_base
+
+        scale_x, scale_y = bounds_w / width, bounds_h / height
+        grow_x, grow_y = extra * scale_x, extra * scale_y
+        # The item is placed by its alignment point, keep the top left
+        # corner in place while the bounds grow
+        shift_x = grow_x if alignment & OBS_ALIGN_RIGHT \
+            else 0 if alignment & OBS_ALIGN_LEFT else grow_x / 2
+        shift_y = grow_y if alignment & OBS_ALIGN_BOTTOM \
+            else 0 if alignment & OBS_ALIGN_TOP else grow_y / 2
+
+        crop = obs.obs_sceneitem_crop()
+        crop.left, crop.top = x, y
+        crop.right = source_w - x - width - extra
+        crop.bottom = source_h - y - height - extra
+        bounds = obs.vec2()
+        bounds.x, bounds.y = bounds_w + grow_x, bounds_h + grow_y
+        pos = obs.vec2()
+        pos.x = pos_x - fraction_x * scale_x + shift_x
+        pos.y = pos_y - fraction_y * scale_y + shift_y
+
+        obs.obs_sceneitem_defer_update_begin(item)
+        obs.obs_sceneitem_set_crop(item, crop)
+        obs.obs_sceneitem_set_bounds(item, bounds)
+        obs.obs_sceneitem_set_pos(item, pos)
+        obs.obs_sceneitem_defer_update_end(item)
+        self.item_last = item_rect
+
+    def obs_restore_scene_item(self):
+        """
+        Puts back the crop, position and bounds the scene item had before
+        zooming
+        """
+        if self.item_base is not None and self.scene_item is not None:
+            (left, top, right, bottom), (pos_x, pos_y), (bounds_w, bounds_h), \
+                _ = self.item_base
+            crop = obs.obs_sceneitem_crop()
+            crop.left, crop.top, crop.right, crop.bottom = \
+                left, top, right, bottom
+            pos = obs.vec2()
+            pos.x, pos.y = pos_x, pos_y
+            bounds = obs.vec2()
+            bounds.x, bounds.y = bounds_w, bounds_h
+            obs.obs_sceneitem_defer_update_begin(self.scene_item)
+            obs.obs_sceneitem_set_crop(self.scene_item, crop)
+            obs.obs_sceneitem_set_bounds(self.scene_item, bounds)
+            obs.obs_sceneitem_set_pos(self.scene_item, pos)
+            obs.obs_sceneitem_defer_update_end(self.scene_item)
+        self.item_base = self.item_last = None
+
+    def set_render_mode(self, render_mode):
+        """
+        Switches between the crop filter and the scene item render mode,
+        undoing the zoom applied the other way
+        """
+        if render_mode == self.render_mode:
+            return
+        if self.render_mode == RENDER_SCENE_ITEM:
+            self.obs_restore_scene_item()
+        else:
+            self.obs_remove_crop_filter()
+        self.render_mode = render_mode
+        log("Render mode %s: %s", self.index + 1, render_mode,
+            category="zoom")
+        if self.lock or self.zoom_progress > 0:
+            # Apply the current zoom the new way
+            self.tick_enable()
+
+    def obs_release_scene_item(self):
+        """
+        Restores and releases the cached scene item
+        """
+        if self.scene_item is not None:
+            self.obs_restore_scene_item()
+            refs.release("scene_item", self.scene_item)
+            self.scene_item = None
 
     def set_crop(self):
         """
         Compute rectangle of the zoom window, interpolating for zoom in and out
         transitions and update the crop filter used for zooming in the source.
         """
-        totalFrames = int(self.zoom_time / self.refresh_rate)
+        # Advance the animation by the real time since the previous step,
+        # so its length does not depend on the frame rate or late callbacks
+        now = monotonic()
+        if self.last_tick_time is None:
+            elapsed = self.refresh_rate
+        elif scheduler.frame_delta is not None:
+            elapsed = scheduler.frame_delta
+        else:
+            elapsed = (now - self.last_tick_time) * 1000
+        self.last_tick_time = now
+        step = elapsed / self.zoom_time if self.zoom_time > 0 else 1.0
         crop_left = crop_top = crop_width = crop_height = 0
 
         if not self.lock:
             # Zooming out
-            if self.zo_timer < totalFrames:
-                self.zo_timer += 1
+            if self.zoom_progress > 0:
                 # Zoom in will start from same animation position
-                self.zi_timer = totalFrames - self.zo_timer
-                time = self.cubic_in_out(self.zo_timer / totalFrames)
-                crop_left = int(((1 - time) * self.zoom_x))
-                crop_top = int(((1 - time) * self.zoom_y))
+                self.zoom_progress = max(0.0, self.zoom_progress - step)
+                time = self.cubic_in_out(1 - self.zoom_progress)
+                self.crop_x, self.crop_y = self.zoom_x, self.zoom_y
+                crop_left = (1 - time) * self.zoom_x
+                crop_top = (1 - time) * self.zoom_y
                 crop_width = (self.zoom_w * self.monitor_scale) + int(time * (self.source_w_raw - (self.zoom_w * self.monitor_scale)))
                 crop_height = (self.zoom_h * self.monitor_scale) + int(time * (self.source_h_raw - (self.zoom_h * self.monitor_scale)))
                 self.update = True
@@ -807,49 +2790,79 @@ class CursorWindow:
                 self.update = False
         else:
             # Zooming in
-            if self.zi_timer < totalFrames:
-                self.zi_timer += 1
+            if self.zoom_progress < 1:
                 # Zoom out will start from same animation position
-                self.zo_timer = totalFrames - self.zi_timer
-                time = self.cubic_in_out(self.zi_timer / totalFrames)
-                crop_left = int(time * self.zoom_x)
-                crop_top = int(time * self.zoom_y)
+                self.zoom_progress = min(1.0, self.zoom_progress + step)
+                time = self.cubic_in_out(self.zoom_progress)
+                self.crop_x, self.crop_y = self.zoom_x, self.zoom_y
+                crop_left = time * self.zoom_x
+                crop_top = time * self.zoom_y
                 crop_width = self.source_w_raw - int(time * (self.source_w_raw - (self.zoom_w * self.monitor_scale)))
                 crop_height = self.source_h_raw - int(time * (self.source_h_raw - (self.zoom_h * self.monitor_scale)))
                 self.update = True if time < 0.8 else False
             else:
-                crop_left = int(self.zoom_x)
-                crop_top = int(self.zoom_y)
+                # Hold the applied position while the zoom window only moves
+                # within the dead band, so cursor jitter causes no updates
+                if abs(self.zoom_x - self.crop_x) > self.dead_band:
+                    self.crop_x = self.zoom_x
+                if abs(self.zoom_y - self.crop_y) > self.dead_band:
+                    self.crop_y = self.zoom_y
+                crop_left = self.crop_x
+                crop_top = self.crop_y
                 crop_width = int(self.zoom_w * self.monitor_scale)
                 crop_height = int(self.zoom_h * self.monitor_scale)
                 self.update = False
 
-        self.obs_set_crop_settings(crop_left, crop_top, crop_width, crop_height)
-        self.obs_set_initial_bounding_box_type()
+        if self.render_mode == RENDER_SCENE_ITEM:
+            self.obs_set_scene_item_crop(crop_left, crop_top,
+                                         crop_width, crop_height)
+        else:
+            self.obs_set_crop_settings(crop_left, crop_top,
+                                       crop_width, crop_height)
+            if self.scene_item_stale:
+                self.obs_set_initial_bounding_box_type()
 
 
         # Stop ticking when zoom out is complete or
         # when zoomed in and not following the cursor
-        if ((not self.lock) and (self.zo_timer >= totalFrames)) \
-                or (self.lock and (not self.track) and (self.zi_timer >= totalFrames)):
+        if ((not self.lock) and (self.zoom_progress <= 0)) \
+                or (self.lock and (not self.track) and (self.zoom_progress >= 1)):
             self.tick_disable()
 
+    def settled(self):
+        """
+        :return: If the zoom is fully in and the zoom window is within half
+            a pixel of its target, so that further ticks with an unchanged
+            cursor cannot move the crop
+        """
+        return self.lock and self.zoom_progress >= 1 and not self.update \
+            and abs(self.zoom_x_target - self.zoom_x) < 0.5 \
+            and abs(self.zoom_y_target - self.zoom_y) < 0.5
+
+    def settle(self):
+        """
+        Moves the zoom window the remaining fraction of a pixel to its
+        target and applies the crop, before the scheduler parks
+        """
+        self.zoom_x = self.zoom_x_target
+        self.zoom_y = self.zoom_y_target
+        self.set_crop()
+
     def tick_enable(self):
         if self.ticking:
+            # Already active, but the scheduler may be parked
+            scheduler.wake()
             return
 
-        # Update refresh rate in case user has changed settings. Otherwise
-        # animations will feel slower/faster
-        self.refresh_rate = int(obs.obs_get_frame_interval_ns() / 1000000)
-
-        obs.timer_add(self.tick, self.refresh_rate)
+        self.last_tick_time = None
         self.ticking = True
-        log(f"Ticking: {self.ticking}")
+        scheduler.add(self)
+        log("Ticking %s: %s", self.index, self.ticking, category="zoom")
 
     def tick_disable(self):
-        obs.remove_current_callback()
+        scheduler.discard(self)
         self.ticking = False
-        log(f"Ticking: {self.ticking}")
+        log("Ticking %s: %s", self.index, self.ticking, category="zoom")
 
     def tracking(self):
         """
@@ -857,69 +2870,407 @@ class CursorWindow:
         """
         if self.lock:
             if self.track or self.update:
-                self.follow(get_cursor_position())
+                self.follow(scheduler.cursor())
         self.set_crop()
 
+    def geometry_changed(self):
+        return self.geometry.snapshot is not self.geometry_applied
+
+    def apply_geometry(self):
+        """
+        Takes over the latest geometry of the watched window, so the zoom
+        window follows it moving or resizing while zoomed in. A closed
+        window is looked up again on the next zoom.
+        """
+        snapshot = self.geometry_applied = self.geometry.snapshot
+        if snapshot is None:
+            return
+        rect, title, alive = snapshot
+        if not alive:
+            log("Window %s closed", self.window_name, category="window")
+            self.geometry.stop()
+            self.new_source = True
+            return
+        if title != self.window_name:
+            log("Window title changed to %s", title, category="window")
+            self.window_name = title
+        self.update_window_dim(self.window, rect)
+        self.update_computed_source_values()
+        if self.active_border < 0.5:
+            self.check_pos()
+
     def tick(self):
         """
         Containing function that is run every frame
         """
+        if self.geometry_changed():
+            self.apply_geometry()
         self.tracking()
 
 
+class ZoomScheduler:
+    """
+    Drives every active zoom target from a single OBS timer. The cursor is
+    read at most once per frame, on the first target that follows it, and
+    shared by the others; inactive targets are not visited, so the cost of
+    a frame grows with the active targets only.
+
+    In the render schedule, script_tick() drives the targets instead of the
+    timer: exactly once per rendered frame, with the real frame delta as
+    the animation step. The timer has a whole millisecond period that
+    runs apart from the video clock.
+
+    With idle suspend, the scheduler parks once every active target has
+    settled and the cursor stayed put for `idle_frames` frames. A parked
+    tick only compares the cursor with the parked position: every frame
+    when the background sampler or the network cursor provides it for
+    free, otherwise from a
+    timer slowed down to `idle_poll` ms. Cursor movement, hotkeys and
+    setting changes wake it up again.
+
+    Attributes
+
+    active                  |   Targets ticked every frame, in order
+    ticking                 |   Timer subscribe lock
+    mode                    |   Driven by a timer or by the render tick
+    frame_delta             |   Render tick frame delta (ms), None with the timer
+    parked_time             |   Time parked since the last idle poll (ms)
+    refresh_rate            |   OBS frame interval (ms)
+    use_sampler             |   Read the cursor from the background sampler
+    mouse                   |   Cursor position of the current frame
+    last_mouse              |   Cursor position of the previous frame
+    idle_suspend            |   Park while nothing can change
+    idle_frames             |   Settled frames with a still cursor before parking
+    idle_poll               |   Timer interval while parked without sampler (ms)
+    idle                    |   Settled frames with a still cursor so far
+    parked                  |   Targets are not ticked until the cursor moves
+    interval                |   Interval of the registered timer (ms)
+    predict                 |   Follow the cursor position predicted ahead
+    predictor               |   Extrapolates the cursor from its recent samples
+    lead                    |   Cursor position the targets follow this frame
+    """
+    def __init__(self):
+        self.active = []
+        self.ticking = False
+        self.refresh_rate = 16.667
+        self.use_sampler = False
+        self.mouse = self.last_mouse = None
+        self.idle_suspend = False
+        self.idle_frames = 3
+        self.idle_poll = 50
+        self.idle = 0
+        self.parked = False
+        self.interval = 0
+        self.mode = SCHEDULE_TIMER
+        self.frame_delta = None
+        self.parked_time = 0.0
+        self.predict = False
+        self.predictor = CursorPredictor()
+        self.lead = None
+        # timer_remove matches the callback by identity
+        self.callback = self.tick
+
+    def add(self, target):
+        if target not in self.active:
+            self.active.append(target)
+        if not self.ticking:
+            self.start()
+        else:
+            self.wake()
+        target.refresh_rate = self.refresh_rate
+
+    def discard(self, target):
+        if target in self.active:
+            self.active.remove(target)
+            self.wake()
+
+    def start(self):
+        # Update refresh rate in case user has changed settings. Otherwise
+        # animations will feel slower/faster
+        self.refresh_rate = obs.obs_get_frame_interval_ns() / 1000000
+        for target in self.active:
+            target.refresh_rate = self.refresh_rate
+        if self.use_sampler:
+            sampler.start()
+        self.interval = int(self.refresh_rate)
+        if self.mode == SCHEDULE_TIMER:
+            obs.timer_add(self.callback, self.interval)
+        self.ticking = True
+        self.parked = False
+        self.idle = 0
+        self.last_mouse = None
+        self.predictor.reset()
+        log("Scheduler ticking: %s", self.ticking, category="zoom")
+
+    def stop(self):
+        """
+        Removes the timer; only valid from within the timer callback
+        """
+        if self.mode == SCHEDULE_TIMER:
+            obs.remove_current_callback()
+        sampler.stop()
+        self.ticking = False
+        log("Scheduler ticking: %s", self.ticking, category="zoom")
+
+    def set_interval(self, interval):
+        if interval != self.interval:
+            if self.mode == SCHEDULE_TIMER:
+                obs.timer_remove(self.callback)
+                obs.timer_add(self.callback, interval)
+            self.interval = interval
+
+    def set_mode(self, mode):
+        """
+        Switches between the timer and the render tick, moving a running
+        schedule over
+        """
+        if mode == self.mode:
+            return
+        if self.ticking:
+            if mode == SCHEDULE_TIMER:
+                obs.timer_add(self.callback, self.interval)
+            else:
+                obs.timer_remove(self.callback)
+        self.mode = mode
+        self.frame_delta = None
+        log("Scheduler mode: %s", mode, category="zoom")
+
+    def render_tick(self, seconds):
+        """
+        :param seconds: Time since the previous rendered frame
+        """
+        if not self.ticking or self.mode != SCHEDULE_RENDER:
+            return
+        self.frame_delta = seconds * 1000
+        if self.parked and not self.cursor_in_background():
+            # Poll the cursor at the idle interval like the slowed timer
+            self.parked_time += self.frame_delta
+            if self.parked_time < self.interval:
+                return
+            self.parked_time = 0.0
+        self.tick()
+
+    @staticmethod
+    def cursor_in_background():
+        """
+        :return: Whether a thread keeps the cursor position current, so
+            reading it costs nothing
+        """
+        return sampler.running or network_cursor.running
+
+    def park(self):
+        for target in self.active:
+            target.settle()
+        self.parked = True
+        self.parked_time = 0.0
+        if not self.cursor_in_background():
+            self.set_interval(self.idle_poll)
+        log("Scheduler parked at %s", self.mouse, category="zoom")
+
+    def wake(self):
+        """
+        Resumes ticking every frame. The animation clocks restart, so the
+        time spent parked does not count as one long frame.
+        """
+        if not self.parked:
+            return
+        self.parked = False
+        self.idle = 0
+        for target in self.active:
+            target.last_tick_time = None
+        self.set_interval(int(self.refresh_rate))
+        log("Scheduler woken", category="zoom")
+
+    def cursor(self):
+        """
+        :return: Cursor position of the current frame, read on first use,
+            or its prediction
+        """
+        if self.mouse is None:
+            x, y, timestamp = get_cursor_sample()
+            self.mouse = (x, y)
+            if trace_writer.recording:
+                trace_writer.add_sample(x, y, monotonic())
+            # The predictor needs the time the position was taken, a
+            # background sample can be older than this frame
+            self.lead = self.predictor.update(x, y, timestamp) \
+                if self.predict else self.mouse
+        return self.lead
+
+    def tick(self):
+        if self.parked:
+            if get_cursor_position() == self.mouse \
+                    and not any(target.geometry_changed()
+                                for target in self.active):
+                return
+            self.wake()
+        self.mouse = None
+        for target in tuple(self.active):
+            target.tick()
+        if not self.active:
+            self.stop()
+            return
+
+        if self.idle_suspend and self.mouse is not None \
+                and self.mouse == self.last_mouse \
+                and all(target.settled() for target in self.active):
+            self.idle += 1
+            if self.idle >= self.idle_frames:
+                self.park()
+        else:
+            self.idle = 0
+        self.last_mouse = self.mouse
+
+
 # -------------------------------------------------------------------
 zs = ZoomSettings(cwd, settings_dir, settings_file_name)
-zoom = CursorWindow()
+cursors = CursorBackends(cursor_backends())
+sampler = CursorSampler()
+network_cursor = NetworkCursor()
+trace_writer = CursorTraceWriter()
+profiler = TickProfiler()
+scheduler = ZoomScheduler()
+catalog = SourceCatalog(SOURCES.mac_sources() if darwin
+                        else SOURCES.all_sources())
+zooms = [CursorWindow()]
+zoom = zooms[0]
 
 
 # -------------------------------------------------------------------
-def populate_list_property_with_source_names(list_property):
+def on_frontend_event(event):
+    """
+    Marks the cached scene items stale whenever the scene they were looked
+    up in, the scene collection or the profile (and with it the canvas size)
+    changes
+    """
+    if event in (obs.OBS_FRONTEND_EVENT_SCENE_CHANGED,
+                 obs.OBS_FRONTEND_EVENT_SCENE_COLLECTION_CHANGED,
+                 obs.OBS_FRONTEND_EVENT_PROFILE_CHANGED):
+        log("Frontend event %s, scene item stale", event, category="script")
+        for target in zooms:
+            target.scene_item_stale = True
+        scheduler.wake()
+
+
+def target_from_key(key):
+    """
+    :param key: Settings key or property name, possibly of a target other
+        than the first one
+    :return: Tuple of the unsuffixed name and the target it belongs to, or
+        None if that target does not exist
+    """
+    name, _, suffix = key.rpartition(" (")
+    if name and suffix.endswith(")") and suffix[:-1].isdigit():
+        index = int(suffix[:-1]) - 1
+        return name, zooms[index] if 0 < index < len(zooms) else None
+    return key, zooms[0]
+
+
+def hotkey_names(target):
+    """
+    :return: Tuple of (name, description) of the zoom and of the follow
+        hotkey of a target
+    """
+    if target.index == 0:
+        return ((ZOOM_NAME_TOG, ZOOM_DESC_TOG),
+                (FOLLOW_NAME_TOG, FOLLOW_DESC_TOG))
+    number = target.index + 1
+    return ((f"{file_name}.zoom.{number}.toggle",
+             f"Enable/Disable Mouse Zoom ({file_name} #{number})"),
+            (f"{file_name}.follow.{number}.toggle",
+             f"Enable/Disable Mouse Follow ({file_name} #{number})"))
+
+
+def register_hotkeys(target, settings):
+    (zoom_name, zoom_desc), (follow_name, follow_desc) = hotkey_names(target)
+    for name, description, callback in (
+            (zoom_name, zoom_desc,
+             lambda pressed: toggle_zoom(pressed, target)),
+            (follow_name, follow_desc,
+             lambda pressed: toggle_follow(pressed, target))):
+        hotkey_id = obs.obs_hotkey_register_frontend(name, description,
+                                                     callback)
+        with refs.hold("data_array",
+                       obs.obs_data_get_array(settings, name)) as hotkey_save_array:
+            obs.obs_hotkey_load(hotkey_id, hotkey_save_array)
+        target.hotkeys[name] = (hotkey_id, callback)
+
+
+def unregister_hotkeys(target):
+    for hotkey_id, callback in target.hotkeys.values():
+        obs.obs_hotkey_unregister(callback)
+    target.hotkeys = {}
+
+
+def release_target(target):
+    """
+    Stops ticking a target, releases its handles and removes its crop
+    filter from the source
+    """
+    target.tick_disable()
+    target.geometry.stop()
+    target.obs_release_scene_item()
+    target.obs_remove_crop_filter()
+
+
+def set_target_count(count, settings):
+    """
+    Adds or removes zoom targets until there are `count` of them. Settings
+    of removed targets stay in the script settings, so a target comes back
+    unchanged when the count is raised again.
+    """
+    count = max(1, min(ZOOM_TARGETS_MAX, count))
+    while len(zooms) < count:
+        target = CursorWindow(len(zooms))
+        register_hotkeys(target, settings)
+        if profiler.enabled:
+            profiler.wrap(target)
+        zooms.append(target)
+        log("Added zoom target %s", target.index + 1, category="script")
+    while len(zooms) > count:
+        target = zooms.pop()
+        unregister_hotkeys(target)
+        release_target(target)
+        log("Removed zoom target %s", target.index + 1, category="script")
+
+
+def populate_list_property_with_source_names(list_property, target=None):
     """
     Updates Zoom Source's available options.
 
     Checks a source against SOURCES to determine availability.
     """
     global darwin
-    global new_source
+    target = target or zoom
 
-    log("Updating Source List")
-    zoom.update_sources()
-    sources = obs.obs_enum_sources()
-    if sources is not None:
-        obs.obs_property_list_clear(list_property)
-        obs.obs_property_list_add_string(list_property, "", "")
-        for source in sources:
-            source_type = obs.obs_source_get_id(source)
-            if darwin and source_type not in SOURCES.all_sources():
-                log(f"{obs.obs_source_get_name(source)} | {source_type} | {source}")
-            # Print this value if a source isn't showing in the UI as expected
-            # and add it to SOURCES above for either window or monitor capture.
-            filter = SOURCES.all_sources() if not darwin else SOURCES.mac_sources()
-            if source_type in filter:
-                name_val = name = obs.obs_source_get_name(source)
-                name = name + "||" + source_type
-                obs.obs_property_list_add_string(list_property, name_val, name)
-        zoom.source_load = True
-    obs.source_list_release(sources)
-    new_source = True
-    log(f"New source: {str(new_source)}")
+    log("Updating Source List", category="script")
+    target.update_sources()
+    obs.obs_property_list_clear(list_property)
+    obs.obs_property_list_add_string(list_property, "", "")
+    for name, source_type in catalog.sources.items():
+        obs.obs_property_list_add_string(list_property, name,
+                                         name + "||" + source_type)
+    target.source_load = True
+    target.new_source = True
+    log("New source %s: %s", target.index + 1, target.new_source,
+        category="script")
 
 
 def populate_list_property_with_monitors(list_property):
-    log("Updating Monitor List")
-    if zoom.monitors_dict is not None:
+    log("Updating Monitor List", category="monitor")
+    if zoom.monitors is not None:
         obs.obs_property_list_clear(list_property)
         obs.obs_property_list_add_int(list_property, "", -1)
         monitor_index = 0
-        for monitor in zoom.monitors_key:
-            monitor_obj = zoom.monitors_dict.get(monitor, None)
+        for monitor in zoom.monitors.names:
+            monitor_obj = zoom.monitors.by_name.get(monitor, None)
             if monitor_obj:
                 screen_size = monitor_obj['size']
                 obs.obs_property_list_add_int(list_property,
                                               f"{monitor}: {screen_size.width} x {screen_size.height}",
                                               monitor_index)
                 monitor_index += 1
-    log("Monitor override list updated")
+    log("Monitor override list updated", category="monitor")
 
 
 # -------------------------------------------------------------------
@@ -928,90 +3279,169 @@ def script_description():
 
 
 def script_defaults(settings):
-    log("Run script_defaults")
-
-    obs.obs_data_set_default_string(settings, "source", "")
-    obs.obs_data_set_default_bool(settings,
-                                  "Manual Monitor Override", False)
-    obs.obs_data_set_default_bool(settings, "Manual Offset", False)
-    obs.obs_data_set_default_int(settings, "Width", 1280)
-    obs.obs_data_set_default_int(settings, "Height", 720)
-    obs.obs_data_set_default_double(settings, "Border", 0.15)
-    obs.obs_data_set_default_int(settings, "Speed", 160)
-    obs.obs_data_set_default_double(settings, "Smooth", 1.0)
-    obs.obs_data_set_default_int(settings, "Zoom", 300)
-    obs.obs_data_set_default_int(settings, "Manual X Offset", 0)
-    obs.obs_data_set_default_int(settings, "Manual Y Offset", 0)
+    log("Run script_defaults", category="script")
+
+    for target in (CursorWindow(index) for index in range(ZOOM_TARGETS_MAX)):
+        key = target.key
+        obs.obs_data_set_default_string(settings, key("source"), "")
+        obs.obs_data_set_default_bool(settings,
+                                      key("Manual Monitor Override"), False)
+        obs.obs_data_set_default_bool(settings, key("Manual Offset"), False)
+        obs.obs_data_set_default_int(settings, key("Width"), 1280)
+        obs.obs_data_set_default_int(settings, key("Height"), 720)
+        obs.obs_data_set_default_double(settings, key("Border"), 0.15)
+        obs.obs_data_set_default_int(settings, key("Speed"), 160)
+        obs.obs_data_set_default_double(settings, key("Smooth"), 1.0)
+        obs.obs_data_set_default_int(settings, key("Zoom"), 300)
+        obs.obs_data_set_default_double(settings, key("Dead Band"), 0.0)
+        obs.obs_data_set_default_string(settings, key("Render Mode"),
+                                        RENDER_FILTER)
+        obs.obs_data_set_default_int(settings, key("Manual X Offset"), 0)
+        obs.obs_data_set_default_int(settings, key("Manual Y Offset"), 0)
+    obs.obs_data_set_default_int(settings, "Zoom Targets", 1)
+    obs.obs_data_set_default_string(settings, "Cursor Backend", CURSOR_AUTO)
+    obs.obs_data_set_default_bool(settings, "Cursor Sampler", False)
+    obs.obs_data_set_default_int(settings, "Sampler Rate", 500)
+    obs.obs_data_set_default_bool(settings, "Network Cursor", False)
+    obs.obs_data_set_default_string(settings, "Network Cursor Host", "0.0.0.0")
+    obs.obs_data_set_default_int(settings, "Network Cursor Port", CURSOR_PORT)
+    obs.obs_data_set_default_bool(settings, "Idle Suspend", False)
+    obs.obs_data_set_default_int(settings, "Idle Poll", 50)
+    obs.obs_data_set_default_string(settings, "Scheduler", SCHEDULE_TIMER)
+    obs.obs_data_set_default_bool(settings, "Predict Cursor", False)
+    obs.obs_data_set_default_int(settings, "Look Ahead", 33)
+    obs.obs_data_set_default_int(settings, "Max Lead", 150)
+    obs.obs_data_set_default_bool(settings, "Record Trace", False)
+    obs.obs_data_set_default_bool(settings, "Profile Ticks", False)
     obs.obs_data_set_default_bool(settings, "debug", False)
+    obs.obs_data_set_default_int(settings, "Log Level", LOG_DEBUG)
+    obs.obs_data_set_default_string(settings, "Log Categories", "")
+    obs.obs_data_set_default_bool(settings, "Log to File", False)
 
 
-def script_update(settings):
-    log("Run script_update")
-
-    if zoom.source_load:
+def update_target(target, settings):
+    """
+    Applies the settings of one zoom target
+    """
+    key = target.key
+    source_string = obs.obs_data_get_string(settings, key("source"))
+
+    if source_string == "":
+        target.source_name = target.source_type = ""
+        return
+
+    # Update overrides before source, so the updated overrides are used
+    # in update_source_size
+    target.monitor_override = obs.obs_data_get_bool(
+        settings, key("Manual Monitor Override"))
+    target.monitor_override_id = obs.obs_data_get_int(settings, key("monitor"))
+    target.monitor_size_override = obs.obs_data_get_bool(
+        settings, key("Manual Monitor Dim"))
+    if target.monitor_size_override:
+        target.source_w_override = obs.obs_data_get_int(
+            settings, key("Monitor Width"))
+        target.source_h_override = obs.obs_data_get_int(
+            settings, key("Monitor Height"))
+    target.manual_offset = obs.obs_data_get_bool(settings, key("Manual Offset"))
+    if target.manual_offset:
+        target.source_x_offset = obs.obs_data_get_int(
+            settings, key("Manual X Offset"))
+        target.source_y_offset = obs.obs_data_get_int(
+            settings, key("Manual Y Offset"))
+
+    if source_string.index("|"):
+        [source, source_type] = source_string.split("||")
+    if target.source_name != source:
+        target.source_name = source
+        target.source_type = source_type
+        target.crop_stale = True
+        target.scene_item_stale = True
+        target.new_source = True
+
+    if target.new_source:
+        log("Source update", category="script")
+        target.update_sources(True)
+    else:
+        log("Non-initial update", category="script")
+        target.update_source_size()
+
+    target.zoom_w = obs.obs_data_get_int(settings, key("Width"))
+    target.zoom_h = obs.obs_data_get_int(settings, key("Height"))
+    target.active_border = obs.obs_data_get_double(settings, key("Border"))
+    target.max_speed = obs.obs_data_get_int(settings, key("Speed"))
+    target.smooth = obs.obs_data_get_double(settings, key("Smooth"))
+    target.zoom_time = obs.obs_data_get_double(settings, key("Zoom"))
+    target.dead_band = obs.obs_data_get_double(settings, key("Dead Band"))
+    target.set_render_mode(obs.obs_data_get_string(settings, key("Render Mode"))
+                           or RENDER_FILTER)
 
-        sources = obs.obs_enum_sources()
-        if len(sources) == 0:
-            log("No sources, likely OBS startup.")
-            return
 
-        global new_source
+def script_update(settings):
+    log("Run script_update", category="script")
 
-        source_string = obs.obs_data_get_string(settings, "source")
+    set_target_count(obs.obs_data_get_int(settings, "Zoom Targets"), settings)
 
-        if source_string == "":
-            zoom.source_name = zoom.source_type = ""
-            return
+    if any(target.source_load for target in zooms):
 
-        # Update overrides before source, so the updated overrides are used
-        # in update_source_size
-        zoom.monitor_override = obs.obs_data_get_bool(settings,
-                                                      "Manual Monitor Override")
-        zoom.monitor_override_id = obs.obs_data_get_int(settings, "monitor")
-        zoom.monitor_size_override = obs.obs_data_get_bool(settings,
-                                                           "Manual Monitor Dim")
-        if zoom.monitor_size_override:
-            zoom.source_w_override = obs.obs_data_get_int(settings,
-                                                          "Monitor Width")
-            zoom.source_h_override = obs.obs_data_get_int(settings,
-                                                          "Monitor Height")
-        zoom.manual_offset = obs.obs_data_get_bool(settings, "Manual Offset")
-        if zoom.manual_offset:
-            zoom.source_x_offset = obs.obs_data_get_int(settings,
-                                                        "Manual X Offset")
-            zoom.source_y_offset = obs.obs_data_get_int(settings,
-                                                        "Manual Y Offset")
-
-        source_string = obs.obs_data_get_string(settings, "source")
-        if source_string == "":
-            zoom.source_name = zoom.source_type = ""
+        if not catalog.sources:
+            log("No capture sources, likely OBS startup.", category="script")
             return
 
-        if source_string.index("|"):
-            [source, source_type] = source_string.split("||")
-        if zoom.source_name != source:
-            zoom.source_name = source
-            zoom.source_type = source_type
-            new_source = True
-
-        if new_source:
-            log("Source update")
-            zoom.update_sources(True)
+        for target in zooms:
+            if target.source_load:
+                update_target(target, settings)
+
+    cursors.set_choice(obs.obs_data_get_string(settings, "Cursor Backend")
+                       or CURSOR_AUTO)
+    scheduler.use_sampler = obs.obs_data_get_bool(settings, "Cursor Sampler")
+    sampler.rate = obs.obs_data_get_int(settings, "Sampler Rate")
+    if scheduler.ticking:
+        if scheduler.use_sampler:
+            sampler.start()
         else:
-            log("Non-initial update")
-            zoom.update_source_size()
-
-        zoom.zoom_w = obs.obs_data_get_int(settings, "Width")
-        zoom.zoom_h = obs.obs_data_get_int(settings, "Height")
-        zoom.active_border = obs.obs_data_get_double(settings, "Border")
-        zoom.max_speed = obs.obs_data_get_int(settings, "Speed")
-        zoom.smooth = obs.obs_data_get_double(settings, "Smooth")
-        zoom.zoom_time = obs.obs_data_get_double(settings, "Zoom")
-
-    global debug
+            sampler.stop()
+    host = obs.obs_data_get_string(settings, "Network Cursor Host") or "0.0.0.0"
+    port = obs.obs_data_get_int(settings, "Network Cursor Port")
+    if (host, port) != (network_cursor.host, network_cursor.port):
+        network_cursor.stop()
+        network_cursor.host, network_cursor.port = host, port
+    if obs.obs_data_get_bool(settings, "Network Cursor"):
+        network_cursor.start()
+    else:
+        network_cursor.stop()
+    scheduler.idle_suspend = obs.obs_data_get_bool(settings, "Idle Suspend")
+    scheduler.idle_poll = obs.obs_data_get_int(settings, "Idle Poll")
+    scheduler.set_mode(obs.obs_data_get_string(settings, "Scheduler")
+                       or SCHEDULE_TIMER)
+    scheduler.predict = obs.obs_data_get_bool(settings, "Predict Cursor")
+    scheduler.predictor.look_ahead = \
+        obs.obs_data_get_int(settings, "Look Ahead") / 1000
+    scheduler.predictor.max_lead = obs.obs_data_get_int(settings, "Max Lead")
+    # Changed settings may move the crop of a parked target
+    scheduler.wake()
+
+    if obs.obs_data_get_bool(settings, "Profile Ticks"):
+        profiler.enable(zooms)
+    else:
+        profiler.disable(zooms)
+
+    record_trace = obs.obs_data_get_bool(settings, "Record Trace")
+    if record_trace and not trace_writer.recording:
+        trace_writer.begin()
+    elif not record_trace and trace_writer.recording:
+        end_trace_recording()
+
+    global debug, log_level, log_categories
     debug = obs.obs_data_get_bool(settings, "debug")
+    log_level = obs.obs_data_get_int(settings, "Log Level")
+    log_categories = {category.strip() for category in
+                      obs.obs_data_get_string(settings, "Log Categories").split(",")
+                      if category.strip()}
+    log_sink.file_path = path.join(cwd, settings_dir, f"{file_name}.log") \
+        if obs.obs_data_get_bool(settings, "Log to File") else None
 
-    ZoomSettings.save(zs, settings, CursorWindow=zoom)
+    zs.save(settings, **{target.key("CursorWindow"): target
+                         for target in zooms})
 
 
 def callback(props, prop, *args):
@@ -1019,25 +3449,29 @@ def callback(props, prop, *args):
 
     prop_name = obs.obs_property_name(prop)
 
-    log(f"Triggered callback: {prop_name}")
-    
-    monitor = obs.obs_properties_get(props, "monitor")
-    monitor_override = obs.obs_properties_get(props, "Manual Monitor Override")
-    monitor_size_override = obs.obs_properties_get(props, "Manual Monitor Dim")
-    refresh_monitor = obs.obs_properties_get(props, "Refresh monitors")
-    source_type = zoom.source_type
-
-    global debug
-    debug = obs.obs_properties_get(props, "debug")
-    
-    match(prop_name):
+    log("Triggered callback: %s", prop_name, category="script")
+
+    name, target = target_from_key(prop_name)
+    if target is None:
+        return True
+    key = target.key
+
+    monitor = obs.obs_properties_get(props, key("monitor"))
+    monitor_override = obs.obs_properties_get(props,
+                                              key("Manual Monitor Override"))
+    monitor_size_override = obs.obs_properties_get(props,
+                                                   key("Manual Monitor Dim"))
+    refresh_monitor = obs.obs_properties_get(props, key("Refresh monitors"))
+    source_type = target.source_type
+
+    match(name):
         case "source":
-            populate_list_property_with_source_names(prop)
+            populate_list_property_with_source_names(prop, target)
             if source_type in SOURCES.monitor.all_sources() or darwin:
                 obs.obs_property_set_visible(monitor_override, True)
                 obs.obs_property_set_visible(refresh_monitor, True)
                 obs.obs_property_set_visible(monitor_size_override, True)
-                zoom.update_source_size()
+                target.update_source_size()
             else:
                 obs.obs_property_set_visible(monitor_override, False)
                 obs.obs_property_set_visible(refresh_monitor, False)
@@ -1046,51 +3480,76 @@ def callback(props, prop, *args):
             populate_list_property_with_monitors(prop)
 
     obs.obs_property_set_visible(
-        obs.obs_properties_get(props, "Monitor Width"),
-        zoom.monitor_size_override)
+        obs.obs_properties_get(props, key("Monitor Width")),
+        target.monitor_size_override)
     obs.obs_property_set_visible(
-        obs.obs_properties_get(props, "Monitor Height"),
-        zoom.monitor_size_override)
+        obs.obs_properties_get(props, key("Monitor Height")),
+        target.monitor_size_override)
     obs.obs_property_set_visible(
-        obs.obs_properties_get(props, "Manual X Offset"),
-        zoom.manual_offset)
+        obs.obs_properties_get(props, key("Manual X Offset")),
+        target.manual_offset)
     obs.obs_property_set_visible(
-        obs.obs_properties_get(props, "Manual Y Offset"),
-        zoom.manual_offset)
-    obs.obs_property_set_visible(monitor, zoom.monitor_override
+        obs.obs_properties_get(props, key("Manual Y Offset")),
+        target.manual_offset)
+    obs.obs_property_set_visible(monitor, target.monitor_override
                                  and obs.obs_property_visible(monitor_override))
-    
+
     return True
 
 
-def script_properties():
-    log("Run script_properties")
+def target_count_changed(props, prop, settings):
+    """
+    Adds the targets and rebuilds the property groups of all but the first
+    target after the number of targets changed
+    """
+    set_target_count(obs.obs_data_get_int(settings, "Zoom Targets"), settings)
+    for index in range(1, ZOOM_TARGETS_MAX):
+        obs.obs_properties_remove_by_name(props, f"Zoom Target {index + 1}")
+    for target in zooms[1:]:
+        add_target_group(props, target)
+    return True
 
-    global props
-    props = obs.obs_properties_create()
+
+def show_tick_profile(props, prop):
+    """
+    Shows the tick profile in the properties and writes it to the debug log
+    """
+    report = profiler.report()
+    log("Tick profile:\n%s", report, level=LOG_INFO, category="profile")
+    profile_text = obs.obs_properties_get(props, "Tick Profile")
+    obs.obs_property_set_description(profile_text, report)
+    obs.obs_property_set_visible(profile_text, True)
+    return True
+
+
+def add_target_properties(props, target):
+    """
+    Adds the properties of one zoom target to `props`
+    """
+    key = target.key
 
     sources = obs.obs_properties_add_list(
         props,
-        "source",
+        key("source"),
         "Zoom Source",
         obs.OBS_COMBO_TYPE_LIST,
         obs.OBS_COMBO_FORMAT_STRING,
     )
 
-    populate_list_property_with_source_names(sources)
+    populate_list_property_with_source_names(sources, target)
 
     ls = obs.obs_properties_add_button(props,
-                                       "Reload sources",
+                                       key("Reload sources"),
                                        "Reload list of sources",
                                        lambda props, prop: True if callback(props, sources) else True)
 
     monitor_override = obs.obs_properties_add_bool(props,
-                                                   "Manual Monitor Override",
+                                                   key("Manual Monitor Override"),
                                                    "Enable Monitor Override")
 
     m = obs.obs_properties_add_list(
         props,
-        "monitor",
+        key("monitor"),
         "Monitor Override",
         obs.OBS_COMBO_TYPE_LIST,
         obs.OBS_COMBO_FORMAT_INT,
@@ -1099,76 +3558,213 @@ def script_properties():
     populate_list_property_with_monitors(m)
 
     rm = obs.obs_properties_add_button(props,
-                                       "Refresh monitors",
+                                       key("Refresh monitors"),
                                        "Refresh list of monitors",
                                        lambda props, prop: True if callback(props, m) else True)
 
     mon_size = obs.obs_properties_add_bool(props,
-                                           "Manual Monitor Dim", "Enable Manual Monitor Dimensions")
+                                           key("Manual Monitor Dim"),
+                                           "Enable Manual Monitor Dimensions")
 
     mon_w = obs.obs_properties_add_int(props,
-                                       "Monitor Width", "Manual Monitor Width", -8000, 8000, 1)
+                                       key("Monitor Width"), "Manual Monitor Width", -8000, 8000, 1)
     mon_h = obs.obs_properties_add_int(props,
-                                       "Monitor Height", "Manual Monitor Height", -8000, 8000, 1)
+                                       key("Monitor Height"), "Manual Monitor Height", -8000, 8000, 1)
 
     offset = obs.obs_properties_add_bool(props,
-                                         "Manual Offset", "Enable Manual Offset")
+                                         key("Manual Offset"), "Enable Manual Offset")
 
     mx = obs.obs_properties_add_int(props,
-                                    "Manual X Offset", "Manual X Offset", -8000, 8000, 1)
+                                    key("Manual X Offset"), "Manual X Offset", -8000, 8000, 1)
     my = obs.obs_properties_add_int(props,
-                                    "Manual Y Offset", "Manual Y Offset", -8000, 8000, 1)
+                                    key("Manual Y Offset"), "Manual Y Offset", -8000, 8000, 1)
 
     obs.obs_properties_add_int(props,
-                               "Width", "Zoom Window Width", 320, 3840, 1)
+                               key("Width"), "Zoom Window Width", 320, 3840, 1)
     obs.obs_properties_add_int(props,
-                               "Height", "Zoom Window Height", 240, 3840, 1)
+                               key("Height"), "Zoom Window Height", 240, 3840, 1)
     obs.obs_properties_add_float_slider(props,
-                                        "Border", "Active Border", 0, 0.5, 0.01)
+                                        key("Border"), "Active Border", 0, 0.5, 0.01)
     obs.obs_properties_add_int(props,
-                               "Speed", "Max Scroll Speed", 0, 540, 10)
+                               key("Speed"), "Max Scroll Speed", 0, 540, 10)
     obs.obs_properties_add_float_slider(props,
-                                        "Smooth", "Smooth", 0, 10, 0.1)
+                                        key("Smooth"), "Smooth", 0, 10, 0.1)
     obs.obs_properties_add_int_slider(props,
-                                      "Zoom", "Zoom Duration (ms)", 0, 1000, 1)
-
-    debug_tog = obs.obs_properties_add_bool(props,
-                                           "debug",
-                                           "Enable debug logging")
+                                      key("Zoom"), "Zoom Duration (ms)", 0, 1000, 1)
+    obs.obs_properties_add_float_slider(props,
+                                        key("Dead Band"), "Dead Band (px)", 0, 10, 0.1)
+    render_mode = obs.obs_properties_add_list(
+        props,
+        key("Render Mode"),
+        "Render Mode",
+        obs.OBS_COMBO_TYPE_LIST,
+        obs.OBS_COMBO_FORMAT_STRING,
+    )
+    obs.obs_property_list_add_string(render_mode, "Crop filter", RENDER_FILTER)
+    obs.obs_property_list_add_string(render_mode, "Scene item crop",
+                                     RENDER_SCENE_ITEM)
 
     mon_show = (
-        True if zoom.source_type in SOURCES.monitor.all_sources() else False)
-    
+        True if target.source_type in SOURCES.monitor.all_sources() else False)
+
     obs.obs_property_set_visible(monitor_override, mon_show)
-    obs.obs_property_set_visible(m, zoom.monitor_override)
-    obs.obs_property_set_visible(rm, zoom.monitor_override)
-    obs.obs_property_set_visible(mon_h, zoom.monitor_size_override)
-    obs.obs_property_set_visible(mon_w, zoom.monitor_size_override)
-    obs.obs_property_set_visible(mx, zoom.manual_offset)
-    obs.obs_property_set_visible(my, zoom.manual_offset)
+    obs.obs_property_set_visible(m, target.monitor_override)
+    obs.obs_property_set_visible(rm, target.monitor_override)
+    obs.obs_property_set_visible(mon_h, target.monitor_size_override)
+    obs.obs_property_set_visible(mon_w, target.monitor_size_override)
+    obs.obs_property_set_visible(mx, target.manual_offset)
+    obs.obs_property_set_visible(my, target.manual_offset)
 
     obs.obs_property_set_modified_callback(sources, callback)
     obs.obs_property_set_modified_callback(monitor_override, callback)
     obs.obs_property_set_modified_callback(mon_size, callback)
     obs.obs_property_set_modified_callback(offset, callback)
+
+
+def add_target_group(props, target):
+    """
+    Adds the properties of a target other than the first one as a group
+    """
+    group = obs.obs_properties_create()
+    add_target_properties(group, target)
+    name = f"Zoom Target {target.index + 1}"
+    obs.obs_properties_add_group(props, name, name, obs.OBS_GROUP_NORMAL,
+                                 group)
+
+
+# OBS looks for script_tick once, when it loads the script, and then calls
+# it on every rendered frame whatever the schedule: with the timer, or while
+# parked or zoomed out, every frame still enters Python and takes the GIL
+# for a call that returns at once
+def script_tick(seconds):
+    scheduler.render_tick(seconds)
+
+
+def script_properties():
+    log("Run script_properties", category="script")
+
+    global props
+    props = obs.obs_properties_create()
+
+    add_target_properties(props, zoom)
+
+    targets = obs.obs_properties_add_int_slider(props,
+                                                "Zoom Targets", "Zoom Targets",
+                                                1, ZOOM_TARGETS_MAX, 1)
+
+    backend_list = obs.obs_properties_add_list(
+        props,
+        "Cursor Backend",
+        "Read Cursor With",
+        obs.OBS_COMBO_TYPE_LIST,
+        obs.OBS_COMBO_FORMAT_STRING,
+    )
+    obs.obs_property_list_add_string(backend_list, "Fastest available",
+                                     CURSOR_AUTO)
+    for provider in cursors.providers:
+        obs.obs_property_list_add_string(backend_list, provider.label,
+                                         provider.name)
+
+    obs.obs_properties_add_bool(props,
+                                "Cursor Sampler", "Sample cursor in background")
+    obs.obs_properties_add_int(props,
+                               "Sampler Rate", "Cursor Sample Rate (Hz)", 60, 1000, 10)
+
+    obs.obs_properties_add_bool(props,
+                                "Network Cursor", "Receive cursor from network")
+    obs.obs_properties_add_text(props,
+                                "Network Cursor Host", "Network Cursor Listen Address",
+                                obs.OBS_TEXT_DEFAULT)
+    obs.obs_properties_add_int(props,
+                               "Network Cursor Port", "Network Cursor Port", 0, 65535, 1)
+
+    obs.obs_properties_add_bool(props,
+                                "Idle Suspend", "Suspend ticking while idle")
+    obs.obs_properties_add_int(props,
+                               "Idle Poll", "Idle Cursor Poll Interval (ms)", 16, 500, 1)
+
+    schedule_list = obs.obs_properties_add_list(
+        props,
+        "Scheduler",
+        "Update Zoom On",
+        obs.OBS_COMBO_TYPE_LIST,
+        obs.OBS_COMBO_FORMAT_STRING,
+    )
+    obs.obs_property_list_add_string(schedule_list, "Timer", SCHEDULE_TIMER)
+    obs.obs_property_list_add_string(schedule_list, "Every rendered frame",
+                                     SCHEDULE_RENDER)
+
+    obs.obs_properties_add_bool(props,
+                                "Predict Cursor", "Predict cursor movement")
+    obs.obs_properties_add_int(props,
+                               "Look Ahead", "Prediction Look Ahead (ms)", 0, 200, 1)
+    obs.obs_properties_add_int(props,
+                               "Max Lead", "Maximum Prediction Lead (px)", 0, 1000, 1)
+
+    obs.obs_properties_add_bool(props,
+                                "Record Trace", "Record cursor trace")
+
+    obs.obs_properties_add_bool(props,
+                                "Profile Ticks", "Profile tick stages")
+    profile_text = obs.obs_properties_add_text(props,
+                                               "Tick Profile", "",
+                                               obs.OBS_TEXT_INFO)
+    obs.obs_property_set_visible(profile_text, False)
+    obs.obs_properties_add_button(props,
+                                  "Show Tick Profile",
+                                  "Show tick profile",
+                                  show_tick_profile)
+
+    debug_tog = obs.obs_properties_add_bool(props,
+                                           "debug",
+                                           "Enable debug logging")
+    log_level_list = obs.obs_properties_add_list(
+        props,
+        "Log Level",
+        "Log Level",
+        obs.OBS_COMBO_TYPE_LIST,
+        obs.OBS_COMBO_FORMAT_INT,
+    )
+    for level, name in LOG_LEVEL_NAMES.items():
+        obs.obs_property_list_add_int(log_level_list, name.capitalize(), level)
+    obs.obs_properties_add_text(props,
+                                "Log Categories",
+                                "Log Categories (comma separated, empty for all)",
+                                obs.OBS_TEXT_DEFAULT)
+    obs.obs_properties_add_bool(props,
+                                "Log to File", "Write debug log to file")
+
+    for target in zooms[1:]:
+        add_target_group(props, target)
+
     obs.obs_property_set_modified_callback(debug_tog, callback)
+    obs.obs_property_set_modified_callback(targets, target_count_changed)
     return props
 
 
 def script_load(settings):
-    log("Run script_load")
+    log("Run script_load", category="script")
 
     settings_updated = []
 
+    register_hotkeys(zoom, settings)
+    set_target_count(obs.obs_data_get_int(settings, "Zoom Targets"), settings)
+
     settings_import = zs.load()
 
     if settings_import:
         for setting in settings_import.keys():
-            match setting:
+            name, target = target_from_key(setting)
+            match name:
                 case "CursorWindow":
+                    if target is None:
+                        continue
                     for value in settings_import[setting]:
-                        setattr(zoom, value, settings_import[setting][value])
-                        settings_updated.append(f"zoom.{value}")
+                        if value not in target.PERSISTED:
+                            continue
+                        setattr(target, value, settings_import[setting][value])
+                        settings_updated.append(
+                            f"{target.key('zoom')}.{value}")
                     continue
                 case _:
                     if setting not in dir(zoom):
@@ -1180,88 +3776,118 @@ def script_load(settings):
                         value = settings_import[setting]
                     setattr(zoom, setting, value)
                     settings_updated.append(setting)
-    
-    
-    global zoom_id_tog
-    zoom_id_tog = obs.obs_hotkey_register_frontend(
-        ZOOM_NAME_TOG, ZOOM_DESC_TOG, toggle_zoom
-    )
-    hotkey_save_array = obs.obs_data_get_array(settings, ZOOM_NAME_TOG)
-    obs.obs_hotkey_load(zoom_id_tog, hotkey_save_array)
-    obs.obs_data_array_release(hotkey_save_array)
 
-    global follow_id_tog
-    follow_id_tog = obs.obs_hotkey_register_frontend(
-        FOLLOW_NAME_TOG, FOLLOW_DESC_TOG, toggle_follow
-    )
-    hotkey_save_array = obs.obs_data_get_array(settings, FOLLOW_NAME_TOG)
-    obs.obs_hotkey_load(follow_id_tog, hotkey_save_array)
-    obs.obs_data_array_release(hotkey_save_array)
+    obs.obs_frontend_add_event_callback(on_frontend_event)
+    catalog.listen()
+    zoom.monitors.listen()
 
-    log(f"Loaded settings: {settings_updated}")
+    log("Loaded settings: %s", settings_updated, category="script")
     
 
 def script_unload():
-    log("Run script_unload")
+    log("Run script_unload", category="script")
 
-    source = zoom.get_obs_source(zoom.source_name)
-    crop = obs.obs_source_get_filter_by_name(source, CROP_FILTER_NAME)
+    obs.obs_frontend_remove_event_callback(on_frontend_event)
+    catalog.unlisten()
+    profiler.disable(zooms)
+    sampler.stop()
+    network_cursor.stop()
+    cursors.close()
+    if trace_writer.recording:
+        end_trace_recording()
+    zoom.monitors.unlisten()
+    for target in zooms:
+        release_target(target)
 
-    if crop is not None:
-        obs.obs_source_filter_remove(source, crop)
+    for target in zooms:
+        unregister_hotkeys(target)
 
-    obs.source_list_release(zoom.source_refs)
+    # Every reference the script took must have been given back by now
+    leaks = refs.leaks()
+    if leaks:
+        log("OBS references leaked at unload: %s", leaks, level=LOG_WARNING,
+            category="script")
 
-    obs.obs_hotkey_unregister(toggle_zoom)
-    obs.obs_hotkey_unregister(toggle_follow)
+    zs.flush()
+    log_sink.stop()
 
 
 def script_save(settings):
-    log("Run script_save")
+    log("Run script_save", category="script")
 
-    hotkey_save_array = obs.obs_hotkey_save(zoom_id_tog)
-    obs.obs_data_set_array(settings, ZOOM_NAME_TOG, hotkey_save_array)
-    obs.obs_data_array_release(hotkey_save_array)
+    zs.flush()
 
-    hotkey_save_array = obs.obs_hotkey_save(follow_id_tog)
-    obs.obs_data_set_array(settings, FOLLOW_NAME_TOG, hotkey_save_array)
-    obs.obs_data_array_release(hotkey_save_array)
+    for target in zooms:
+        for name, (hotkey_id, callback) in target.hotkeys.items():
+            with refs.hold("data_array",
+                           obs.obs_hotkey_save(hotkey_id)) as hotkey_save_array:
+                obs.obs_data_set_array(settings, name, hotkey_save_array)
 
 
 # -------------------------------------------------------------------
-def toggle_zoom(pressed):
+def record_trace_event(code, pressed, target):
+    if trace_writer.recording:
+        try:
+            x, y = get_cursor_position()
+            now = monotonic()
+            trace_writer.add_sample(x, y, now)
+            trace_writer.add_event(code, bool(pressed) | target.index << 1,
+                                   now)
+        except Exception as e:
+            # A broken trace must not take the hotkey down with it
+            log("%s: Cursor trace recording failed and was stopped", e,
+                level=LOG_WARNING, category="trace")
+            end_trace_recording()
+
+
+def end_trace_recording():
+    trace_writer.end(path.join(cwd, settings_dir, traces_dir,
+                               f"{file_name}_{strftime('%Y%m%d_%H%M%S')}.zft"))
+
+
+def toggle_zoom(pressed, target=None):
+    target = target or zoom
+    record_trace_event(TRACE_EVENT_ZOOM, pressed, target)
     if pressed:
-        if new_source:
-            zoom.update_sources()
-        if zoom.source_name != "" and not zoom.lock:
+        if target.new_source:
+            target.update_sources()
+        if target.source_name != "" and not target.lock:
             for attr in ['source_w_raw', 'source_h_raw','source_x_raw','source_y_raw']:
                 try:
-                    getattr(zoom,attr)
+                    getattr(target,attr)
                 except:
-                    log("reinit source params")
-                    log(zoom.__dict__)
-                    zoom.update_source_size()
-                    log(zoom.__dict__)
+                    log("reinit source params", category="script")
+                    if debug:
+                        log("%s", dict(target.__dict__), category="script")
+                    target.update_source_size()
+                    if debug:
+                        log("%s", dict(target.__dict__), category="script")
                     break
-            if zoom.source_type not in SOURCES.monitor.all_sources():
-                zoom.update_source_size()
-            zoom.center_on_cursor()
-            zoom.lock = True
-            zoom.tick_enable()
-            log(f"Mouse position: {get_cursor_position()}")
-        elif zoom.lock:
-            zoom.lock = False
-            zoom.tick_enable()  # For the zoom out transition
-        log(f"Zoom: {zoom.lock}")
-
-
-def toggle_follow(pressed):
+            if target.source_type not in SOURCES.monitor.all_sources() \
+                    or target.monitor_generation != target.monitors.generation:
+                target.update_source_size()
+            target.center_on_cursor()
+            target.lock = True
+            target.tick_enable()
+            if debug:
+                log("Mouse position: %s", get_cursor_position(),
+                    category="script")
+        elif target.lock:
+            target.lock = False
+            target.tick_enable()  # For the zoom out transition
+        log("Zoom %s: %s", target.index + 1, target.lock, category="script")
+
+
+def toggle_follow(pressed, target=None):
+    target = target or zoom
+    record_trace_event(TRACE_EVENT_FOLLOW, pressed, target)
     if pressed:
-        if zoom.track:
-            zoom.track = False
-        elif not zoom.track:
-            zoom.track = True
+        if target.track:
+            target.track = False
+        elif not target.track:
+            target.track = True
             # Tick if zoomed in, to enable follow updates
-            if zoom.lock:
-                zoom.tick_enable()
-        log(f"Tracking: {zoom.track}")
\ No newline at end of file
+            if target.lock:
+                target.tick_enable()
+        log("Tracking %s: %s", target.index + 1, target.track,
+            category="script")